@@ -0,0 +1,291 @@
+"""
+Candidatures groupées: plusieurs navigateurs headless en parallèle
+
+Chaque offre est traitée dans un processus avec son propre navigateur. Chaque
+étape est consignée dans un journal JSONL sur disque: une exécution
+interrompue reprend là où elle s'était arrêtée, et une URL dont le formulaire
+a pu être soumis n'est jamais soumise une seconde fois. Une capture d'écran
+n'est conservée qu'en cas d'échec.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import util
+
+from config import BATCH_WORKERS, BATCH_JOURNAL_FILE, SCREENSHOT_DIR, PREFLIGHT_ENABLED
+from driver_pool import DriverPool
+from instrumentation import log
+from preflight import OfferPreflight, EXPIRED, EXTERNAL
+
+
+class ApplicationJournal:
+    """Journal des candidatures (une ligne JSON par événement)"""
+
+    def __init__(self, path, lock=None):
+        """
+        Initialise le journal
+
+        Args:
+            path (str): Fichier JSONL
+            lock (multiprocessing.Lock): Verrou partagé entre les processus qui écrivent
+        """
+        self.path = path
+        self._lock = lock or multiprocessing.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def record(self, url, status, **details):
+        """
+        Ajoute un événement au journal
+
+        Args:
+            url (str): URL de l'offre
+            status (str): 'started', 'success', 'failed', 'error' ou 'expired'
+            **details: Informations complémentaires (submitted, elapsed, error, screenshot...)
+
+        Returns:
+            dict: Événement enregistré
+        """
+        entry = {'url': url, 'status': status, 'time': time.time()}
+        entry.update(details)
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        return entry
+
+    def load(self):
+        """
+        Dernier événement connu pour chaque URL
+
+        Returns:
+            dict: URL -> événement
+        """
+        latest = {}
+        if not os.path.exists(self.path):
+            return latest
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Ligne tronquée par une interruption
+                latest[entry['url']] = entry
+        return latest
+
+    @staticmethod
+    def skip_reason(entry, retry_failed=False):
+        """
+        Raison de ne pas (re)lancer une candidature, d'après son dernier événement
+
+        Args:
+            entry (dict): Dernier événement de l'URL (None si jamais traitée)
+            retry_failed (bool): Relancer les échecs survenus avant toute soumission,
+                et revérifier les offres écartées par la pré-vérification
+
+        Returns:
+            str: Raison, ou None si la candidature peut être lancée
+        """
+        if entry is None:
+            return None
+        if entry['status'] == 'success':
+            return 'déjà envoyée'
+        if entry['status'] == 'expired':
+            # Verdict de la pré-vérification: revérifié lors d'une relance
+            return None if retry_failed else 'offre expirée'
+        if entry['status'] == 'external':
+            # Ancien verdict « site externe »: la candidature y est désormais tentée
+            return None
+        if entry['status'] == 'started':
+            # Interrompue en cours de route: le formulaire a peut-être été soumis
+            return 'interrompue, issue inconnue'
+        if entry.get('submitted'):
+            return 'formulaire déjà soumis'
+        if not retry_failed:
+            return 'échec précédent'
+        return None
+
+    def pending(self, jobs, retry_failed=False):
+        """
+        Sépare les offres à traiter de celles à ignorer
+
+        Args:
+            jobs (list): Offres sélectionnées
+            retry_failed (bool): Relancer les échecs survenus avant toute soumission
+
+        Returns:
+            tuple: (offres à traiter, liste de (offre, raison) ignorées)
+        """
+        latest = self.load()
+        to_run, skipped, seen = [], [], set()
+        for job in jobs:
+            url = job['url']
+            reason = 'doublon dans la sélection' if url in seen else self.skip_reason(latest.get(url), retry_failed)
+            seen.add(url)
+            if reason:
+                skipped.append((job, reason))
+            else:
+                to_run.append(job)
+        return to_run, skipped
+
+
+# État propre à chaque processus de candidature
+_worker = {}
+
+
+def _init_worker(lock, journal_path, personal_info, cv_path, cover_letter_path, headless, screenshot_dir):
+    """Prépare le journal et le navigateur d'un processus de candidature"""
+    _worker['journal'] = ApplicationJournal(journal_path, lock)
+    # Profil temporaire: les processus ne peuvent pas partager un même profil Chrome
+    _worker['pool'] = DriverPool(size=1, headless=headless, profile_dir=None)
+    _worker['personal_info'] = personal_info
+    _worker['cv_path'] = cv_path
+    _worker['cover_letter_path'] = cover_letter_path
+    _worker['screenshot_dir'] = screenshot_dir
+    # Fermer le navigateur à la sortie du processus
+    util.Finalize(None, _worker['pool'].close, exitpriority=10)
+
+
+def _screenshot(handler, job):
+    """Capture d'écran d'une candidature en échec (chemin, ou None)"""
+    name = job.get('offer_id') or hashlib.sha1(job['url'].encode('utf-8')).hexdigest()[:16]
+    path = os.path.join(_worker['screenshot_dir'], f"{name}-{int(time.time())}.png")
+    try:
+        os.makedirs(_worker['screenshot_dir'], exist_ok=True)
+        if handler.driver.save_screenshot(path):
+            return path
+    except Exception:
+        pass
+    return None
+
+
+def _apply_one(job):
+    """Postule à une offre dans le processus courant et consigne le résultat"""
+    journal = _worker['journal']
+    url = job['url']
+    journal.record(url, 'started', offer_id=job.get('offer_id'), pid=os.getpid())
+
+    start = time.perf_counter()
+    status, submitted, error, screenshot = 'failed', False, None, None
+    try:
+        with _worker['pool'].handler() as handler:
+            try:
+                handler.set_documents(_worker['cv_path'], _worker['cover_letter_path'])
+                success = handler.apply_to_job(job.get('start_url', url), _worker['personal_info'])
+                status = 'success' if success else 'failed'
+            except Exception as e:
+                status, error = 'error', str(e)
+            submitted = handler.submitted
+            if status != 'success':
+                screenshot = _screenshot(handler, job)
+    except Exception as e:
+        # Navigateur indisponible: rien n'a pu être soumis
+        status, error = 'error', str(e)
+
+    return journal.record(
+        url, status, offer_id=job.get('offer_id'), submitted=submitted,
+        elapsed=time.perf_counter() - start, error=error, screenshot=screenshot
+    )
+
+
+def run_batch(jobs, personal_info=None, cv_path=None, cover_letter_path=None, workers=BATCH_WORKERS,
+              journal_path=BATCH_JOURNAL_FILE, headless=True, retry_failed=False,
+              screenshot_dir=SCREENSHOT_DIR, preflight=PREFLIGHT_ENABLED):
+    """
+    Postule à une liste d'offres avec plusieurs navigateurs en parallèle
+
+    Args:
+        jobs (list): Offres sélectionnées (dictionnaires avec au moins 'url')
+        personal_info (dict): Informations personnelles à saisir
+        cv_path (str): Chemin du CV
+        cover_letter_path (str): Chemin de la lettre de motivation
+        workers (int): Nombre de processus (un navigateur chacun)
+        journal_path (str): Journal JSONL des candidatures
+        headless (bool): Navigateurs sans fenêtre
+        retry_failed (bool): Relancer les échecs survenus avant toute soumission
+        screenshot_dir (str): Dossier des captures d'écran des échecs
+        preflight (bool|OfferPreflight): Vérifier par HTTP que les offres sont
+            en ligne avant d'ouvrir les navigateurs
+
+    Returns:
+        dict: Compteurs par statut ('success', 'failed', 'error', 'expired',
+            'skipped'), candidatures lancées sur un site externe ('external')
+            et durée totale
+    """
+    start = time.perf_counter()
+    journal = ApplicationJournal(journal_path)
+    to_run, skipped = journal.pending(jobs, retry_failed)
+    summary = {'success': 0, 'failed': 0, 'error': 0, 'expired': 0, 'external': 0, 'skipped': len(skipped),
+               'elapsed': 0.0}
+
+    for job, reason in skipped:
+        log('WARNING', f"⏭️ Ignorée ({reason}): {job['url']}")
+
+    if preflight and to_run:
+        # Écarter les offres mortes avant de lancer le moindre navigateur
+        checker = preflight if isinstance(preflight, OfferPreflight) else OfferPreflight()
+        results = checker.check_all(to_run)
+        live = []
+        for job in to_run:
+            result = results[job['url']]
+            if result['status'] == EXPIRED:
+                journal.record(job['url'], 'expired', offer_id=job.get('offer_id'),
+                               http_status=result['http_status'], error=result['reason'])
+                summary['expired'] += 1
+                log('WARNING', f"⏭️ Expirée ({result['reason']}): {job['url']}")
+                continue
+            if result['status'] == EXTERNAL and result['apply_url']:
+                # Portail de recrutement tiers: le navigateur part directement de la cible de candidature
+                job = dict(job, start_url=result['apply_url'])
+                summary['external'] += 1
+                log('INFO', f"↗️ Candidature sur un site externe: {result['apply_url']}")
+            live.append(job)
+        to_run = live
+
+    if not to_run:
+        log('INFO', "Aucune candidature à lancer")
+        return summary
+
+    workers = max(1, min(workers, len(to_run)))
+    log('INFO', f"🚀 {len(to_run)} candidature(s) sur {workers} navigateur(s) en parallèle...")
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker,
+        initargs=(journal._lock, journal_path, personal_info, cv_path, cover_letter_path, headless, screenshot_dir)
+    )
+    try:
+        futures = {executor.submit(_apply_one, job): job for job in to_run}
+        for done, future in enumerate(as_completed(futures), 1):
+            job = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                # Processus perdu: l'événement 'started' éventuel bloque toute nouvelle soumission
+                entry = {'status': 'error', 'error': str(e), 'elapsed': 0.0}
+            summary[entry['status']] += 1
+
+            level = 'SUCCESS' if entry['status'] == 'success' else 'ERROR'
+            detail = f" - {entry['error']}" if entry.get('error') else ''
+            log(level, f"[{done}/{len(to_run)}] {entry['status']} en {entry['elapsed']:.1f}s: "
+                f"{job.get('title', job['url'])}{detail}")
+            if entry.get('screenshot'):
+                log('INFO', f"   📸 {entry['screenshot']}")
+    except KeyboardInterrupt:
+        log('WARNING', "Interruption: les candidatures restantes reprendront au prochain lancement")
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    finally:
+        executor.shutdown(wait=True)
+
+    summary['elapsed'] = time.perf_counter() - start
+    log('INFO', f"📊 {summary['success']} envoyée(s), {summary['failed']} échec(s), "
+        f"{summary['error']} erreur(s), {summary['expired']} expirée(s), {summary['external']} externe(s), "
+        f"{summary['skipped']} ignorée(s) en {summary['elapsed']:.1f}s")
+    return summary
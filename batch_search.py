@@ -0,0 +1,264 @@
+"""
+Recherches groupées en ligne de commande: plusieurs requêtes, un seul budget
+
+Le fichier de requêtes (JSON) croise des listes de mots-clés, de localisations
+et de types de contrat. Toutes les recherches sont lancées en parallèle avec un
+même scraper: un seul budget de requêtes par seconde (RateLimiter), un seul
+cache HTTP et une seule session. Une offre renvoyée par plusieurs recherches
+n'est gardée qu'une fois (identifiant canonique offer_id), avec la liste des
+recherches qui l'ont trouvée; le résultat fusionné est écrit en JSON.
+
+Fichier de requêtes (un objet, ou une liste d'objets dont les combinaisons
+s'additionnent):
+    {
+        "keywords": ["développeur python", "data engineer"],
+        "locations": ["Paris", "Lyon"],
+        "contract_types": ["CDI", "CDD"],
+        "max_results": 100
+    }
+
+Usage:
+    python batch_search.py recherches.json
+    python batch_search.py recherches.json -o data/nuit.json --incremental --details
+"""
+
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import (  # noqa: E402
+    CONTRACT_TYPES, SEARCH_QUERY_WORKERS, BATCH_SEARCH_OUTPUT_FILE, REQUESTS_PER_SECOND,
+    JOB_STORE_ENABLED, JOB_STORE_FILE, DETAIL_WORKERS
+)
+from file_store import write_json  # noqa: E402
+from pole_emploi_scraper import PoleEmploiScraper  # noqa: E402
+from rate_limiter import RateLimiter  # noqa: E402
+from instrumentation import span, log, close_instrumentation  # noqa: E402
+
+
+def _as_list(value, default):
+    """Liste de chaînes d'un champ du fichier de requêtes (valeur seule acceptée)"""
+    if value is None:
+        return [default]
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"liste de textes attendue, reçu: {value!r}")
+    return value or [default]
+
+
+def load_queries(path):
+    """
+    Lit un fichier de requêtes et en développe toutes les combinaisons
+
+    Args:
+        path (str): Fichier JSON (un objet ou une liste d'objets avec les clés
+            keywords, locations, contract_types et, optionnellement, max_results)
+
+    Returns:
+        list: Requêtes (dict keywords, location, contract_type, max_results ou
+            None), sans doublons, dans l'ordre du fichier
+
+    Raises:
+        ValueError: Fichier mal formé ou type de contrat inconnu
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON invalide: {e}")
+
+    groups = data if isinstance(data, list) else [data]
+    queries = []
+    seen = set()
+    for group in groups:
+        if not isinstance(group, dict):
+            raise ValueError(f"objet attendu, reçu: {group!r}")
+        max_results = group.get('max_results')
+        if max_results is not None and (not isinstance(max_results, int) or max_results <= 0):
+            raise ValueError(f"max_results doit être un entier positif, reçu: {max_results!r}")
+
+        contract_types = [contract.upper() for contract in _as_list(group.get('contract_types'), 'TOUS')]
+        unknown = [contract for contract in contract_types if contract not in CONTRACT_TYPES]
+        if unknown:
+            raise ValueError(f"type(s) de contrat inconnu(s): {', '.join(unknown)} "
+                             f"(parmi {', '.join(CONTRACT_TYPES)})")
+
+        for keywords, location, contract_type in itertools.product(
+            _as_list(group.get('keywords'), ''), _as_list(group.get('locations'), ''), contract_types
+        ):
+            key = (keywords.strip(), location.strip(), contract_type)
+            if key in seen:
+                continue
+            seen.add(key)
+            queries.append({'keywords': key[0], 'location': key[1], 'contract_type': contract_type,
+                            'max_results': max_results})
+    return queries
+
+
+def _run_query(scraper, query, max_results, store, incremental):
+    """Exécute une recherche: (offres, rapport de la recherche)"""
+    report = {'keywords': query['keywords'], 'location': query['location'],
+              'contract_type': query['contract_type'], 'found': 0, 'error': None}
+    jobs = []
+    start = time.perf_counter()
+    with span('query', keywords=query['keywords'], location=query['location'],
+              contract_type=query['contract_type']) as query_span:
+        try:
+            for job in scraper.iter_jobs(query['keywords'], query['location'], query['contract_type'],
+                                         query['max_results'] or max_results, store=store,
+                                         incremental=incremental, raise_errors=True):
+                jobs.append(job)
+        except Exception as e:
+            # Une recherche en échec n'interrompt pas les autres; ses offres déjà reçues sont gardées
+            report['error'] = str(e)
+            query_span.status = 'error'
+        query_span.set(found=len(jobs))
+    report['found'] = len(jobs)
+    report['seconds'] = time.perf_counter() - start
+    return jobs, report
+
+
+def merge_results(results):
+    """
+    Fusionne les offres de plusieurs recherches, sans doublons
+
+    Args:
+        results (list): (offres, rapport) de chaque recherche, dans l'ordre des requêtes
+
+    Returns:
+        list: Offres uniques (clé 'queries': index des recherches qui les ont
+            trouvées); le rapport de chaque recherche est complété avec 'unique',
+            le nombre d'offres qu'elle est la première à apporter
+    """
+    merged = {}
+    for index, (jobs, report) in enumerate(results):
+        report['unique'] = 0
+        for job in jobs:
+            existing = merged.get(job['offer_id'])
+            if existing is None:
+                merged[job['offer_id']] = dict(job, queries=[index])
+                report['unique'] += 1
+            elif index not in existing['queries']:
+                existing['queries'].append(index)
+    return list(merged.values())
+
+
+def run_searches(queries, scraper=None, workers=SEARCH_QUERY_WORKERS, max_results=50, store=None,
+                 incremental=False):
+    """
+    Lance toutes les recherches en parallèle et fusionne leurs offres
+
+    Args:
+        queries (list): Requêtes (voir load_queries)
+        scraper (PoleEmploiScraper): Scraper partagé (son RateLimiter borne le
+            débit de toutes les recherches réunies)
+        workers (int): Recherches simultanées
+        max_results (int): Offres par recherche (si la requête n'en précise pas)
+        store (JobStore): Base où enregistrer les offres trouvées
+        incremental (bool): Ne garder que les offres jamais vues par chaque recherche
+
+    Returns:
+        tuple: (offres uniques, rapports des recherches dans l'ordre des requêtes)
+    """
+    scraper = scraper or PoleEmploiScraper()
+    workers = max(1, min(workers, len(queries)))
+    log('INFO', f"🔀 {len(queries)} recherche(s), {workers} en parallèle...")
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [executor.submit(_run_query, scraper, query, max_results, store, incremental)
+                   for query in queries]
+        results = [future.result() for future in futures]
+    except KeyboardInterrupt:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        executor.shutdown(wait=True)
+
+    jobs = merge_results(results)
+    return jobs, [report for _, report in results]
+
+
+def write_results(path, jobs, reports, elapsed):
+    """
+    Écrit le résultat fusionné en JSON (remplacé en une fois)
+
+    Args:
+        path (str): Fichier de sortie
+        jobs (list): Offres uniques
+        reports (list): Rapports des recherches
+        elapsed (float): Durée totale en secondes
+    """
+    write_json(path, {'generated': time.time(), 'elapsed': elapsed, 'queries': reports, 'jobs': jobs})
+
+
+@click.command()
+@click.argument('queries_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('-o', '--output', default=BATCH_SEARCH_OUTPUT_FILE, show_default=True,
+              type=click.Path(dir_okay=False), help="Fichier JSON des offres fusionnées")
+@click.option('--max-results', default=50, show_default=True, type=click.IntRange(min=1),
+              help="Offres par recherche (si le fichier n'en précise pas)")
+@click.option('--workers', default=SEARCH_QUERY_WORKERS, show_default=True, type=click.IntRange(min=1),
+              help="Recherches simultanées")
+@click.option('--rps', default=REQUESTS_PER_SECOND, show_default=True, type=float,
+              help="Budget de requêtes par seconde, partagé par toutes les recherches (0: illimité)")
+@click.option('--store/--no-store', default=JOB_STORE_ENABLED, show_default=True,
+              help="Enregistrer les offres dans la base des offres")
+@click.option('--incremental', is_flag=True, help="Ne garder que les offres jamais vues par chaque recherche")
+@click.option('--details', is_flag=True, help="Récupérer les détails de chaque offre unique")
+def main(queries_file, output, max_results, workers, rps, store, incremental, details):
+    """Lance les recherches de QUERIES_FILE en parallèle et fusionne leurs offres."""
+    try:
+        queries = load_queries(queries_file)
+    except (OSError, ValueError) as e:
+        raise click.BadParameter(str(e), param_hint='QUERIES_FILE')
+    if not queries:
+        raise click.BadParameter("aucune requête", param_hint='QUERIES_FILE')
+    if incremental and not store:
+        raise click.UsageError("--incremental nécessite la base des offres (--store)")
+
+    job_store = None
+    if store:
+        from job_store import JobStore
+        job_store = JobStore(JOB_STORE_FILE)
+
+    start = time.perf_counter()
+    try:
+        scraper = PoleEmploiScraper(rate_limiter=RateLimiter(rps))
+        jobs, reports = run_searches(queries, scraper, workers, max_results, job_store, incremental)
+        if details and jobs:
+            # Après la fusion: une seule requête de détails par offre, quel que soit le nombre de recherches
+            scraper.enrich_jobs(jobs, DETAIL_WORKERS, store=job_store)
+
+        elapsed = time.perf_counter() - start
+        write_results(output, jobs, reports, elapsed)
+    finally:
+        if job_store is not None:
+            job_store.close()
+
+    for report in reports:
+        label = f"{report['keywords'] or '*'} | {report['location'] or '*'} | {report['contract_type']}"
+        if report['error']:
+            log('ERROR', f"❌ {label}: {report['error']}")
+        else:
+            log('SUCCESS', f"✅ {label}: {report['found']} offre(s), {report['unique']} nouvelle(s) dans le lot")
+    found = sum(report['found'] for report in reports)
+    log('INFO', f"📊 {len(jobs)} offre(s) unique(s) sur {found} trouvée(s) ({found - len(jobs)} doublon(s)) "
+        f"en {elapsed:.1f}s -> {output}")
+    close_instrumentation()
+
+    failed = sum(1 for report in reports if report['error'])
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
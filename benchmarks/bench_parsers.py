@@ -0,0 +1,430 @@
+"""
+Vérification et mesure du parseur sur le corpus HTML hors ligne
+
+Chaque page de benchmarks/fixtures est analysée comme le ferait le scraper
+(_parse_job_listings pour les résultats, _parse_job_details pour les offres),
+pour chaque mode de HTML_PARSER_MODE:
+
+- check: les sorties sont comparées aux sorties de référence (golden/), et les
+  deux modes doivent donner le même résultat;
+- update-golden: réécrit les sorties de référence après une modification voulue;
+- run: mesure cartes/s, pages/s et pic mémoire par mode, chaque mode dans des
+  processus neufs, puis consigne les chiffres (avec le commit) dans
+  PARSER_BENCHMARK_FILE et les compare à la dernière mesure d'un autre commit;
+  échoue si lxml-strained n'est pas plus rapide que html.parser;
+- compare: affiche la comparaison des deux dernières mesures.
+
+Usage:
+    python benchmarks/bench_parsers.py check
+    python benchmarks/bench_parsers.py run --rounds 10 --processes 3
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+import pole_emploi_scraper  # noqa: E402
+from pole_emploi_scraper import PoleEmploiScraper  # noqa: E402
+from rate_limiter import RateLimiter  # noqa: E402
+from selector_stats import SelectorStats  # noqa: E402
+import instrumentation  # noqa: E402
+from config import PARSER_BENCHMARK_FILE, COLORS  # noqa: E402
+
+# Pas de journal JSONL pendant les mesures: son écriture fausserait les durées
+instrumentation.TELEMETRY_JSONL_FILE = None
+
+try:
+    import resource
+except ImportError:  # Windows: pas de pic RSS, seul le tas Python est mesuré
+    resource = None
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+GOLDEN_DIR = os.path.join(BENCH_DIR, 'golden')
+PARSER_MODES = ('lxml-strained', 'html.parser')
+PAGE_TYPES = ('listing', 'detail')
+
+
+def load_corpus():
+    """
+    Pages du corpus
+
+    Returns:
+        list: (type de page, nom, contenu HTML), triés
+    """
+    pages = []
+    for page_type in PAGE_TYPES:
+        directory = os.path.join(FIXTURES_DIR, page_type)
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith('.html'):
+                with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                    pages.append((page_type, filename[:-5], f.read()))
+    return pages
+
+
+def corpus_hash(pages):
+    """Empreinte du corpus: seules les mesures d'un même corpus sont comparables"""
+    digest = hashlib.sha1()
+    for page_type, name, html_content in pages:
+        digest.update(f"{page_type}/{name}\0".encode('utf-8'))
+        digest.update(html_content.encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def make_scraper():
+    """Scraper hors ligne: sans cache, cookies ni statistiques persistées"""
+    return PoleEmploiScraper(rate_limiter=RateLimiter(0), selector_stats=SelectorStats(None),
+                             http_cache=False, session_bridge=False)
+
+
+def set_parser_mode(mode):
+    """Sélectionne le mode d'analyse du scraper (HTML_PARSER_MODE)"""
+    pole_emploi_scraper.HTML_PARSER_MODE = mode
+
+
+def parse_page(scraper, page_type, html_content):
+    """Analyse une page comme le scraper: liste d'offres ou détails d'une offre"""
+    if page_type == 'listing':
+        return scraper._parse_job_listings(html_content)
+    return scraper._parse_job_details(html_content)
+
+
+def parse_with_rules(page_type, html_content):
+    """
+    Analyse une page avec un scraper neuf
+
+    Returns:
+        dict: Sortie du parseur et sélecteurs gagnants par champ
+    """
+    scraper = make_scraper()
+    output = parse_page(scraper, page_type, html_content)
+    rules = {}
+    for row in scraper.selector_stats.report():
+        if row['page_type'] in ('listing', 'card', 'detail'):
+            rules[f"{row['page_type']}.{row['field']}"] = {
+                'hits': dict(row['hits']), 'misses': row['misses']
+            }
+    return {'output': output, 'rules': rules}
+
+
+def golden_path(page_type, name):
+    return os.path.join(GOLDEN_DIR, page_type, f"{name}.json")
+
+
+def update_golden(pages, mode=PARSER_MODES[0]):
+    """Réécrit les sorties de référence avec le mode donné"""
+    set_parser_mode(mode)
+    for page_type, name, html_content in pages:
+        path = golden_path(page_type, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            json.dump(parse_with_rules(page_type, html_content), f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write('\n')
+    print(f"{COLORS['SUCCESS']}✅ {len(pages)} sorties de référence écrites ({mode}){COLORS['END']}")
+
+
+def _diff(expected, actual, path=''):
+    """Premières différences entre deux sorties (chemin: attendu != obtenu)"""
+    if type(expected) is not type(actual):
+        return [f"{path or '/'}: {expected!r} != {actual!r}"]
+    if isinstance(expected, dict):
+        diffs = []
+        for key in sorted(set(expected) | set(actual)):
+            diffs.extend(_diff(expected.get(key), actual.get(key), f"{path}/{key}"))
+        return diffs
+    if isinstance(expected, list):
+        if len(expected) != len(actual):
+            return [f"{path or '/'}: {len(expected)} éléments != {len(actual)}"]
+        diffs = []
+        for index, (left, right) in enumerate(zip(expected, actual)):
+            diffs.extend(_diff(left, right, f"{path}[{index}]"))
+        return diffs
+    return [] if expected == actual else [f"{path or '/'}: {expected!r} != {actual!r}"]
+
+
+def check(pages, modes=PARSER_MODES):
+    """
+    Compare les sorties de chaque mode aux sorties de référence
+
+    Returns:
+        int: Nombre de pages en écart (tous modes confondus)
+    """
+    failures = 0
+    for mode in modes:
+        set_parser_mode(mode)
+        for page_type, name, html_content in pages:
+            path = golden_path(page_type, name)
+            if not os.path.exists(path):
+                print(f"{COLORS['WARNING']}⚠️ {mode} {page_type}/{name}: pas de sortie de référence{COLORS['END']}")
+                failures += 1
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                expected = json.load(f)
+            diffs = _diff(expected, json.loads(json.dumps(parse_with_rules(page_type, html_content))))
+            if diffs:
+                failures += 1
+                print(f"{COLORS['ERROR']}❌ {mode} {page_type}/{name}: {len(diffs)} écart(s){COLORS['END']}")
+                for diff in diffs[:5]:
+                    print(f"   {diff}")
+    if not failures:
+        print(f"{COLORS['SUCCESS']}✅ {len(pages)} pages conformes aux sorties de référence "
+              f"({', '.join(modes)}){COLORS['END']}")
+    return failures
+
+
+def _bench_mode(mode, pages, rounds):
+    """
+    Mesure un mode d'analyse (exécuté dans un processus neuf)
+
+    Returns:
+        dict: Mesures par type de page
+    """
+    set_parser_mode(mode)
+    scraper = make_scraper()
+    results = {}
+    for page_type in PAGE_TYPES:
+        subset = [html_content for kind, _, html_content in pages if kind == page_type]
+        if not subset:
+            continue
+        # Tour de chauffe: imports, compilation des sélecteurs, caches de soupsieve
+        cards = sum(len(parse_page(scraper, page_type, html_content)) for html_content in subset) \
+            if page_type == 'listing' else 0
+
+        durations = []
+        for _ in range(rounds):
+            # Chaque tour part d'un tas propre: le ramasse-miettes d'un tour ne déborde pas sur le suivant
+            gc.collect()
+            start = time.perf_counter()
+            for html_content in subset:
+                parse_page(scraper, page_type, html_content)
+            durations.append(time.perf_counter() - start)
+
+        # Pic du tas Python pendant un tour (arbres BeautifulSoup compris)
+        tracemalloc.start()
+        for html_content in subset:
+            parse_page(scraper, page_type, html_content)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        median = statistics.median(durations)
+        results[page_type] = {
+            'pages': len(subset),
+            'cards': cards,
+            'rounds': rounds,
+            'median_ms': median * 1000,
+            'min_ms': min(durations) * 1000,
+            'pages_per_sec': len(subset) / median if median else 0.0,
+            'cards_per_sec': cards / median if median else 0.0,
+            'peak_kb': peak / 1024,
+        }
+    if resource is not None:
+        # Pic RSS du processus (inclut les allocations C de lxml); en Ko sous Linux, en octets sous macOS
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        results['rss_peak_kb'] = rss / 1024 if sys.platform == 'darwin' else rss
+    return results
+
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], cwd=ROOT_DIR, capture_output=True, text=True,
+                              timeout=30).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def git_revision():
+    """
+    Commit mesuré
+
+    Returns:
+        tuple: (commit abrégé ou None, True si des fichiers suivis sont modifiés)
+    """
+    return _git('rev-parse', '--short', 'HEAD') or None, bool(_git('status', '--porcelain', '--untracked-files=no'))
+
+
+def run_benchmark(pages, modes=PARSER_MODES, rounds=10, processes=3):
+    """
+    Mesure chaque mode dans des processus neufs
+
+    Les écarts entre deux processus (graine de hachage, charge de la machine)
+    dépassent ceux entre deux tours: chaque mode est mesuré dans plusieurs
+    processus, en alternant les modes, et le meilleur processus est retenu.
+
+    Args:
+        pages (list): Corpus
+        modes (tuple): Modes de HTML_PARSER_MODE à mesurer
+        rounds (int): Tours mesurés par processus
+        processes (int): Processus par mode
+
+    Returns:
+        dict: Mesure complète (commit, environnement, corpus, résultats par mode)
+    """
+    runs = {mode: [] for mode in modes}
+    # 'spawn': même point de départ mémoire pour chaque mode, sur toutes les plateformes
+    context = multiprocessing.get_context('spawn')
+    for _ in range(max(1, processes)):
+        for mode in modes:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                runs[mode].append(executor.submit(_bench_mode, mode, pages, rounds).result())
+
+    results = {}
+    for mode, mode_runs in runs.items():
+        best = {page_type: min((run[page_type] for run in mode_runs), key=lambda row: row['median_ms'])
+                for page_type in PAGE_TYPES if page_type in mode_runs[0]}
+        if 'rss_peak_kb' in mode_runs[0]:
+            best['rss_peak_kb'] = min(run['rss_peak_kb'] for run in mode_runs)
+        best['processes'] = len(mode_runs)
+        results[mode] = best
+    commit, dirty = git_revision()
+    return {
+        'time': time.time(),
+        'commit': commit,
+        'dirty': dirty,
+        'host': platform.node(),
+        'python': platform.python_version(),
+        'corpus': corpus_hash(pages),
+        'results': results,
+    }
+
+
+def load_results(path=PARSER_BENCHMARK_FILE):
+    """Mesures consignées, de la plus ancienne à la plus récente"""
+    entries = []
+    if not os.path.exists(path):
+        return entries
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+def save_result(entry, path=PARSER_BENCHMARK_FILE):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def find_baseline(entry, entries):
+    """Dernière mesure d'un autre commit, sur la même machine et le même corpus"""
+    for previous in reversed(entries):
+        if previous is entry:
+            continue
+        if previous['corpus'] == entry['corpus'] and previous['host'] == entry['host'] \
+                and (previous['commit'], previous['dirty']) != (entry['commit'], entry['dirty']):
+            return previous
+    return None
+
+
+def slower_page_types(entry, fast=PARSER_MODES[0], reference=PARSER_MODES[1]):
+    """
+    Types de page où le mode rapide ne devance pas le mode de référence
+
+    Sans lxml, 'lxml-strained' retombe sur html.parser: rien n'est comparé.
+
+    Returns:
+        list: Types de page en écart (vide si les deux modes n'ont pas été mesurés)
+    """
+    results = entry['results']
+    if pole_emploi_scraper.lxml_html is None or fast not in results or reference not in results:
+        return []
+    return [page_type for page_type in PAGE_TYPES
+            if page_type in results[fast] and page_type in results[reference]
+            and results[fast][page_type]['median_ms'] >= results[reference][page_type]['median_ms']]
+
+
+def _label(entry):
+    return f"{entry['commit'] or '?'}{'+' if entry['dirty'] else ''}"
+
+
+def format_report(entry, baseline=None):
+    """Tableau des mesures, avec l'écart par rapport à la référence si fournie"""
+    title = f"Parseur @ {_label(entry)} (corpus {entry['corpus']}, Python {entry['python']})"
+    if baseline:
+        title += f" - comparé à {_label(baseline)}"
+    lines = [title, f"{'Mode':<14} {'Pages':<8} {'Pages/s':>9} {'Cartes/s':>10} {'Méd. ms':>9} "
+                    f"{'Pic Ko':>9} {'RSS Ko':>9}"]
+    for mode, results in entry['results'].items():
+        for page_type in PAGE_TYPES:
+            row = results.get(page_type)
+            if not row:
+                continue
+            rss = results.get('rss_peak_kb')
+            cards = f"{row['cards_per_sec']:.0f}" if page_type == 'listing' else '-'
+            line = (f"{mode:<14} {page_type:<8} {row['pages_per_sec']:>9.1f} {cards:>10} "
+                    f"{row['median_ms']:>9.2f} {row['peak_kb']:>9.0f} {rss if rss is not None else '-':>9}")
+            base = (baseline or {}).get('results', {}).get(mode, {}).get(page_type)
+            if base and base['pages_per_sec']:
+                speed = (row['pages_per_sec'] / base['pages_per_sec'] - 1) * 100
+                memory = (row['peak_kb'] / base['peak_kb'] - 1) * 100 if base['peak_kb'] else 0.0
+                color = COLORS['ERROR'] if speed < -10 or memory > 10 else COLORS['SUCCESS']
+                line += f"  {color}{speed:+.1f}% débit, {memory:+.1f}% mémoire{COLORS['END']}"
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vérification et benchmark du parseur hors ligne")
+    parser.add_argument('command', nargs='?', default='run', choices=['run', 'check', 'update-golden', 'compare'])
+    parser.add_argument('--rounds', type=int, default=10, help="Tours mesurés par processus (défaut: 10)")
+    parser.add_argument('--processes', type=int, default=3, help="Processus par mode (défaut: 3)")
+    parser.add_argument('--mode', action='append', choices=PARSER_MODES, help="Mode(s) à mesurer (défaut: tous)")
+    parser.add_argument('--no-save', action='store_true', help="Ne pas consigner la mesure")
+    args = parser.parse_args()
+
+    pages = load_corpus()
+    if not pages:
+        print(f"{COLORS['ERROR']}❌ Corpus vide: lancez benchmarks/make_fixtures.py{COLORS['END']}")
+        return 1
+    modes = tuple(args.mode or PARSER_MODES)
+
+    if args.command == 'update-golden':
+        update_golden(pages)
+        return 0
+    if args.command == 'check':
+        return 1 if check(pages, modes) else 0
+    if args.command == 'compare':
+        entries = load_results()
+        if not entries:
+            print(f"{COLORS['WARNING']}Aucune mesure dans {PARSER_BENCHMARK_FILE}{COLORS['END']}")
+            return 1
+        print(format_report(entries[-1], find_baseline(entries[-1], entries)))
+        return 0
+
+    # Un parseur incorrect n'a pas de débit qui vaille
+    if check(pages, modes):
+        return 1
+    entry = run_benchmark(pages, modes, args.rounds, args.processes)
+    entries = load_results()
+    if not args.no_save:
+        save_result(entry)
+    print(format_report(entry, find_baseline(entry, entries)))
+    slower = slower_page_types(entry)
+    if slower:
+        print(f"{COLORS['ERROR']}❌ {PARSER_MODES[0]} n'est pas plus rapide que {PARSER_MODES[1]} "
+              f"({', '.join(slower)}){COLORS['END']}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""
+Mesure de bout en bout, de la recherche à la candidature, sur le serveur local
+
+Le serveur de remplacement (standin_server.py) est démarré dans le processus,
+puis le parcours réel est exécuté contre lui:
+
+1. recherche: PoleEmploiScraper.iter_jobs sur les pages de résultats;
+2. détails: iter_job_details sur les offres trouvées;
+3. pré-vérification: OfferPreflight.check_all;
+4. candidature: SeleniumHandler headless sur les premières offres en ligne
+   (lancement du navigateur, puis chaque étape d'attente de apply_to_job).
+
+Chaque étape est chronométrée; les compteurs du serveur (requêtes, 429, 503,
+formulaires reçus) sont relevés. La mesure est consignée avec le commit dans
+PIPELINE_BENCHMARK_FILE.
+
+Usage:
+    python benchmarks/bench_pipeline.py --latency 50 --throttle-rate 0.05 --applications 6
+    python benchmarks/bench_pipeline.py --no-browser
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_server import StandInServer, FORM_VARIANTS, ROUTES  # noqa: E402
+from bench_parsers import git_revision, save_result  # noqa: E402
+from pole_emploi_scraper import PoleEmploiScraper  # noqa: E402
+from preflight import OfferPreflight, LIVE  # noqa: E402
+from rate_limiter import RateLimiter  # noqa: E402
+from selector_stats import SelectorStats  # noqa: E402
+from form_templates import FormTemplates  # noqa: E402
+from resource_policy import PageLoadStats  # noqa: E402
+import instrumentation  # noqa: E402
+from config import PIPELINE_BENCHMARK_FILE, DETAIL_WORKERS, COLORS  # noqa: E402
+
+# Pas de journal JSONL pendant les mesures: son écriture fausserait les durées
+instrumentation.TELEMETRY_JSONL_FILE = None
+
+# Identité fictive saisie dans les formulaires du serveur local
+BENCH_PERSONAL_INFO = {
+    'nom': 'Testeur', 'prenom': 'Alex', 'email': 'alex.testeur@exemple.fr',
+    'telephone': '01 00 00 00 00', 'ville': 'Paris', 'code_postal': '75011',
+}
+
+
+def _stage(name, items, seconds, errors=0, **extra):
+    entry = {
+        'stage': name,
+        'items': items,
+        'errors': errors,
+        'ms': seconds * 1000,
+        'per_item_ms': seconds * 1000 / items if items else 0.0,
+        'per_second': items / seconds if seconds > 0 else 0.0,
+    }
+    entry.update(extra)
+    return entry
+
+
+def _documents(directory):
+    """CV et lettre fictifs pour les champs fichier"""
+    paths = []
+    for name in ('cv.pdf', 'lettre_motivation.pdf'):
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as f:
+            f.write(b'%PDF-1.4\n% document fictif\n%%EOF\n')
+        paths.append(path)
+    return paths
+
+
+def run_scraper_stages(server, keywords, max_results, rps, detail_workers):
+    """
+    Recherche, détails et pré-vérification sur le serveur local
+
+    Returns:
+        tuple: (liste des étapes mesurées, offres trouvées, résultats de pré-vérification)
+    """
+    scraper = PoleEmploiScraper(rate_limiter=RateLimiter(rps), selector_stats=SelectorStats(None),
+                                http_cache=False, session_bridge=False)
+    scraper.base_url = server.url
+    scraper.search_url = server.search_url
+    stages = []
+
+    start = time.perf_counter()
+    first_ms = None
+    jobs = []
+    for job in scraper.iter_jobs(keywords, max_results=max_results):
+        if first_ms is None:
+            first_ms = (time.perf_counter() - start) * 1000
+        jobs.append(job)
+    search = server.stats()['search']
+    stages.append(_stage('recherche', len(jobs), time.perf_counter() - start,
+                         errors=search['requests'] - search['status'].get('200', 0),
+                         pages=search['requests'], first_ms=first_ms or 0.0))
+
+    details = {}
+    for _ in scraper.iter_job_details(jobs, detail_workers, stats=details):
+        pass
+    stages.append(_stage('détails', details.get('count', 0), details.get('seconds', 0.0),
+                         errors=details.get('errors', 0), p50_ms=details.get('p50_ms', 0.0),
+                         p90_ms=details.get('p90_ms', 0.0), p99_ms=details.get('p99_ms', 0.0)))
+
+    start = time.perf_counter()
+    checks = OfferPreflight(scraper).check_all(jobs)
+    statuses = {}
+    for result in checks.values():
+        statuses[result['status']] = statuses.get(result['status'], 0) + 1
+    stages.append(_stage('pré-vérif.', len(checks), time.perf_counter() - start,
+                         errors=statuses.get('unknown', 0), statuses=statuses))
+    return stages, jobs, checks
+
+
+def run_browser_stage(server, jobs, checks, applications):
+    """
+    Candidatures headless sur les premières offres en ligne
+
+    Returns:
+        tuple: (étapes mesurées, durées cumulées par étape d'attente de apply_to_job)
+    """
+    from selenium_handler import SeleniumHandler
+
+    targets = [job for job in jobs if checks.get(job['url'], {}).get('status') == LIVE][:applications]
+    if not targets:
+        return [], {}
+
+    handler = SeleniumHandler(headless=True, form_templates=FormTemplates(None), session_bridge=False)
+    handler.load_stats = PageLoadStats(None)
+    stages = []
+    start = time.perf_counter()
+    if not handler.setup_driver():
+        return [_stage('navigateur', 0, time.perf_counter() - start, errors=1)], {}
+    stages.append(_stage('navigateur', 1, time.perf_counter() - start, **handler.startup_timings))
+
+    documents_dir = tempfile.mkdtemp(prefix='boost-bench-')
+    steps = {}
+    successes = 0
+    try:
+        handler.set_documents(*_documents(documents_dir))
+        start = time.perf_counter()
+        for job in targets:
+            if handler.apply_to_job(job['url'], BENCH_PERSONAL_INFO):
+                successes += 1
+            for timing in handler.waits.timings + [{'step': t['check'], 'ms': t['ms']} for t in handler.check_timings]:
+                step = steps.setdefault(timing['step'], {'count': 0, 'ms': 0.0})
+                step['count'] += 1
+                step['ms'] += timing['ms']
+        stages.append(_stage('candidature', len(targets), time.perf_counter() - start,
+                             errors=len(targets) - successes,
+                             templates=dict(handler.form_templates.stats)))
+    finally:
+        handler.close()
+        shutil.rmtree(documents_dir, ignore_errors=True)
+    return stages, steps
+
+
+def format_report(entry):
+    """Tableau des étapes, des attentes du navigateur et des compteurs du serveur"""
+    config = entry['server']
+    lines = [
+        f"Parcours @ {entry['commit'] or '?'}{'+' if entry['dirty'] else ''} - {config['offers']} offres, "
+        f"latence {config['latency_ms']:.0f}+{config['jitter_ms']:.0f} ms, 429 {config['throttle_rate']:.0%}, "
+        f"503 {config['error_rate']:.0%}, expirées {config['expired_rate']:.0%}",
+        f"{'Étape':<13} {'Éléments':>9} {'Erreurs':>8} {'Total ms':>10} {'ms/élém.':>9} {'Élém./s':>8}",
+    ]
+    for stage in entry['stages']:
+        lines.append(f"{stage['stage']:<13} {stage['items']:>9} {stage['errors']:>8} {stage['ms']:>10.0f} "
+                     f"{stage['per_item_ms']:>9.1f} {stage['per_second']:>8.1f}")
+    if entry['browser_steps']:
+        lines.append(f"\n{'Attente / vérification':<34} {'Nombre':>7} {'Total ms':>10} {'Moy. ms':>8}")
+        for step, values in sorted(entry['browser_steps'].items(), key=lambda item: -item[1]['ms']):
+            lines.append(f"{step:<34} {values['count']:>7} {values['ms']:>10.0f} "
+                         f"{values['ms'] / values['count']:>8.1f}")
+    lines.append(f"\n{'Route':<13} {'Requêtes':>9} {'Ko':>8}  Codes HTTP")
+    for route in ROUTES:
+        counters = entry['server_stats'][route]
+        if counters['requests']:
+            codes = ', '.join(f"{code}: {count}" for code, count in sorted(counters['status'].items()))
+            lines.append(f"{route:<13} {counters['requests']:>9} {counters['bytes'] / 1024:>8.0f}  {codes}")
+    lines.append(f"Formulaires reçus: {len(entry['server_stats']['submissions'])}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure de bout en bout sur le serveur local")
+    parser.add_argument('--offers', type=int, default=120)
+    parser.add_argument('--max-results', type=int, default=100, help="Offres demandées à la recherche")
+    parser.add_argument('--latency', type=float, default=20, help="Latence ajoutée par le serveur (ms)")
+    parser.add_argument('--jitter', type=float, default=10, help="Variation de latence (ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Part de réponses 503")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Part de réponses 429")
+    parser.add_argument('--expired-rate', type=float, default=0.1, help="Part d'offres expirées")
+    parser.add_argument('--variants', default='inline,page,ajax', help=f"Parmi {', '.join(FORM_VARIANTS)}")
+    parser.add_argument('--fault-routes', default='search,detail', help=f"Parmi {', '.join(ROUTES)}")
+    parser.add_argument('--rps', type=float, default=0, help="Budget de requêtes par seconde (0: illimité)")
+    parser.add_argument('--detail-workers', type=int, default=DETAIL_WORKERS)
+    parser.add_argument('--applications', type=int, default=3, help="Candidatures headless")
+    parser.add_argument('--no-browser', action='store_true', help="Sans l'étape Selenium")
+    parser.add_argument('--no-save', action='store_true', help="Ne pas consigner la mesure")
+    parser.add_argument('--seed', type=int, default=2024)
+    args = parser.parse_args()
+
+    server = StandInServer(
+        offers=args.offers, latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, expired_rate=args.expired_rate,
+        variants=tuple(args.variants.split(',')), fault_routes=tuple(args.fault_routes.split(',')),
+        seed=args.seed
+    )
+    with server:
+        stages, jobs, checks = run_scraper_stages(server, 'développeur', args.max_results, args.rps,
+                                                  args.detail_workers)
+        steps = {}
+        if not args.no_browser and args.applications > 0:
+            browser_stages, steps = run_browser_stage(server, jobs, checks, args.applications)
+            stages.extend(browser_stages)
+        server_stats = server.stats()
+
+    commit, dirty = git_revision()
+    entry = {
+        'time': time.time(), 'commit': commit, 'dirty': dirty, 'server': server.config,
+        'rps': args.rps, 'stages': stages, 'browser_steps': steps, 'server_stats': server_stats,
+    }
+    if not args.no_save:
+        save_result(entry, PIPELINE_BENCHMARK_FILE)
+    print(f"\n{COLORS['HEADER']}{format_report(entry)}{COLORS['END']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""
+Corpus de pages HTML hors ligne pour les tests et mesures du parseur
+
+Les pages de résultats et d'offres sont générées de façon déterministe (mêmes
+octets à chaque exécution) avec des données fictives: une page par mise en page
+connue et par sélecteur de repli, plus des pages volumineuses entourées du
+bruit d'un vrai site (navigation, scripts, pied de page). Une page réelle peut
+aussi être enregistrée dans le corpus après anonymisation.
+
+Usage:
+    python benchmarks/make_fixtures.py                 # régénère le corpus
+    python benchmarks/make_fixtures.py record URL listing nom_de_page
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+TITLES = [
+    'Développeur Python H/F', 'Technicien de maintenance industrielle', 'Assistant(e) comptable',
+    'Chargé(e) de clientèle', 'Aide-soignant(e) de nuit', 'Cuisinier / Cuisinière',
+    'Magasinier cariste', 'Ingénieur « data » & cloud', 'Conducteur de bus', 'Vendeur en boulangerie',
+]
+COMPANIES = [
+    'Société Exemple Alpha', 'Atelier Fictif & Fils', 'Groupe Démo Services', 'Clinique du Test',
+    'Boulangerie Modèle', 'Transports Imaginaires', 'Logistique Échantillon', 'Cabinet Fictif',
+]
+CITIES = [
+    '75 - Paris 11e', '69 - Lyon 3e', '13 - Marseille', '33 - Bordeaux', '59 - Lille',
+    '31 - Toulouse', '44 - Nantes', '67 - Strasbourg',
+]
+CONTRACTS = ['CDI', 'CDD - 6 Mois', 'Intérim - 3 Mois', 'Alternance', 'Stage', 'Saisonnier']
+DATES = ["Publié aujourd'hui", 'Publié hier', 'Publié il y a 3 jours', 'Actualisé le 12/03']
+SENTENCES = [
+    'Vous rejoignez une équipe de dix personnes au sein d\'un site de production.',
+    'Vous assurez la relation avec les clients et le suivi des dossiers.',
+    'Horaires en journée, du lundi au vendredi, avec une astreinte par mois.',
+    'Une première expérience sur un poste similaire est appréciée.',
+    'Formation assurée en interne pendant les deux premières semaines.',
+    'Poste accessible aux personnes en situation de handicap.',
+    'Les candidatures sont étudiées au fil de l\'eau.',
+]
+SALARIES = ['Mensuel de 1900,00 Euros à 2200,00 Euros', 'Annuel de 38000 Euros', 'Horaire de 11,65 Euros']
+
+
+def fake_offer(rng, index):
+    """Données fictives d'une offre"""
+    return {
+        'id': f"{rng.randint(100, 199)}{''.join(rng.choice('ABCDEFGHJKLMNPQRSTUVWXYZ') for _ in range(4))}",
+        'title': rng.choice(TITLES),
+        'company': rng.choice(COMPANIES),
+        'city': rng.choice(CITIES),
+        'contract': rng.choice(CONTRACTS),
+        'date': rng.choice(DATES),
+        # Assez long pour tester la troncature à 200 caractères
+        'description': ' '.join(rng.sample(SENTENCES, 4)),
+        'index': index,
+    }
+
+
+def page_noise(rng, blocks):
+    """Navigation, scripts et styles qui entourent les résultats sur un vrai site"""
+    parts = ['<style>' + ''.join(f'.c{i}{{margin:{i}px;padding:{i % 7}px}}' for i in range(200)) + '</style>']
+    for block in range(blocks):
+        links = ''.join(f'<li class="menu-item"><a href="/rubrique/{block}/{i}">Rubrique {block}.{i}</a></li>'
+                        for i in range(25))
+        parts.append(f'<nav class="menu menu-{block}"><ul>{links}</ul></nav>')
+        parts.append('<script>window.__etat_%d = %s;</script>' % (
+            block, '[' + ','.join(str(rng.randint(0, 99999)) for _ in range(300)) + ']'))
+    return '\n'.join(parts)
+
+
+def html_page(title, body, head_extra=''):
+    return (f'<!DOCTYPE html>\n<html lang="fr">\n<head>\n<meta charset="utf-8">\n'
+            f'<title>{title}</title>\n{head_extra}\n</head>\n<body>\n{body}\n</body>\n</html>\n')
+
+
+# --- Cartes d'offres, une mise en page par sélecteur de carte -------------
+
+def _card_testid(o):
+    return (f'<li><article data-testid="offre-emploi" class="resultat">'
+            f'<h3 class="media-heading"><a href="/offres/recherche/detail/{o["id"]}">{o["title"]}</a></h3>'
+            f'<p class="subtext"><span class="entreprise">{o["company"]}</span> - '
+            f'<span class="lieu">{o["city"]}</span></p>'
+            f'<p class="typeContrat">{o["contract"]}</p>'
+            f'<p class="date">{o["date"]}</p>'
+            f'<p class="description">{o["description"]}</p></article></li>')
+
+
+def _card_titremedia(o):
+    return (f'<div class="media"><div class="titreMedia">'
+            f'<a href="/offres/emploi/detail?idOffre={o["id"]}" class="lien">{o["title"]}</a>'
+            f'<span class="employeur">{o["company"]}</span>'
+            f'<span class="ville">{o["city"]}</span>'
+            f'<span class="contrat">{o["contract"]}</span>'
+            f'<span class="datePublication">{o["date"]}</span>'
+            f'<div class="resume">{o["description"]}</div></div></div>')
+
+
+def _card_result(o):
+    return (f'<div class="result"><h2 class="titre"><a href="https://candidat.pole-emploi.fr/offres/recherche/'
+            f'detail/{o["id"]}?from=liste">{o["title"]}</a></h2>'
+            f'<div class="company">{o["company"]}</div><div class="location">{o["city"]}</div>'
+            f'<div class="contract">{o["contract"]}</div><div class="publication">{o["date"]}</div>'
+            f'<div class="summary">{o["description"]}</div></div>')
+
+
+def _card_job_result(o):
+    return (f'<section class="job-result"><a class="titreOffre" href="/offres/detail?offreId={o["id"]}">'
+            f'{o["title"]}</a><b class="societe">{o["company"]}</b><i class="adresse">{o["city"]}</i>'
+            f'<em class="natureContrat">{o["contract"]}</em><small class="creation">{o["date"]}</small>'
+            f'<p class="extrait">{o["description"]}</p></section>')
+
+
+def _card_job_offer(o):
+    return (f'<div data-testid="job-offer"><a data-testid="offre-lien" href="/offres/recherche/detail/{o["id"]}">'
+            f'{o["title"]}</a><span data-testid="entreprise">{o["company"]}</span>'
+            f'<span data-testid="lieu">{o["city"]}</span><span data-testid="type-contrat">{o["contract"]}</span>'
+            f'<span data-testid="date">{o["date"]}</span>'
+            f'<span data-testid="description">{o["description"]}</span></div>')
+
+
+def _card_fallback(o):
+    # Aucun sélecteur de carte ne correspond: repli sur la classe « offre »
+    # Titre sans lien (h3 seul), lien « Voir l'offre » à côté, champs incomplets
+    company = f'<div class="nomEntreprise">{o["company"]}</div>' if o['index'] % 3 else ''
+    location = f'<div class="localisation">{o["city"]}</div>' if o['index'] % 4 else ''
+    return (f'<div class="carte-offre"><h3>{o["title"]}</h3>{company}{location}'
+            f'<div class="type">{o["contract"]}</div><div class="dateOffre">{o["date"]}</div>'
+            f'<div class="texteOffre">{o["description"]}</div>'
+            f'<a href="/offres/recherche/detail/{o["id"]}">Voir l\'offre</a></div>')
+
+
+def _card_partial(o):
+    # Mise en page principale avec des sélecteurs de second rang et des champs absents
+    heading = (f'<div class="title"><a href="/offres/recherche/detail/{o["id"]}">{o["title"]}</a></div>'
+               if o['index'] % 2 else f'<h3>{o["title"]}</h3>')
+    date = f'<span class="dateOffre">{o["date"]}</span>' if o['index'] % 3 else ''
+    return (f'<li><article data-testid="offre-emploi">{heading}'
+            f'<span class="nomEntreprise">{o["company"]}</span>{date}'
+            f'<span class="natureContrat">  {o["contract"]}  </span>'
+            f'<p class="texteOffre">{o["description"][:120]} <strong>&amp; plus</strong></p></article></li>')
+
+
+# Mises en page de carte, par nom
+CARD_LAYOUTS = {
+    'testid': _card_testid,
+    'titremedia': _card_titremedia,
+    'result': _card_result,
+    'job_result': _card_job_result,
+    'job_offer': _card_job_offer,
+    'fallback': _card_fallback,
+    'partial': _card_partial,
+}
+
+
+def _listing(rng, card, count, noise_blocks=0, wrapper='ul'):
+    cards = '\n'.join(card(fake_offer(rng, i)) for i in range(count))
+    body = (f'{page_noise(rng, noise_blocks) if noise_blocks else ""}\n'
+            f'<main id="contenu"><h1>{count} offres</h1><{wrapper} class="liste-offres">\n{cards}\n</{wrapper}></main>\n'
+            f'{page_noise(rng, noise_blocks) if noise_blocks else ""}')
+    return html_page('Offres d\'emploi - Recherche', body)
+
+
+def _detail(rng, description_html, salary_html, noise_blocks=0):
+    o = fake_offer(rng, 0)
+    body = (f'{page_noise(rng, noise_blocks) if noise_blocks else ""}\n'
+            f'<main><h1 class="t2 title">{o["title"]}</h1><p class="entreprise">{o["company"]}</p>\n'
+            f'{description_html}\n{salary_html}\n'
+            f'<a class="btn btn-primary" href="/offres/recherche/detail/{o["id"]}/postuler">Postuler</a></main>\n'
+            f'{page_noise(rng, noise_blocks) if noise_blocks else ""}')
+    return html_page(o['title'], body)
+
+
+def _description(rng, paragraphs=3):
+    return ''.join(f'<p>{" ".join(rng.sample(SENTENCES, 3))}</p>' for _ in range(paragraphs))
+
+
+def build_corpus():
+    """
+    Construit le corpus synthétique
+
+    Returns:
+        dict: Chemin relatif ('listing/nom.html') -> contenu HTML
+    """
+    rng = random.Random(2024)
+    corpus = {
+        'listing/testid.html': _listing(rng, _card_testid, 20),
+        'listing/titremedia.html': _listing(rng, _card_titremedia, 10, wrapper='div'),
+        'listing/result.html': _listing(rng, _card_result, 10, wrapper='div'),
+        'listing/job_result.html': _listing(rng, _card_job_result, 10, wrapper='div'),
+        'listing/job_offer.html': _listing(rng, _card_job_offer, 10, wrapper='div'),
+        'listing/fallback.html': _listing(rng, _card_fallback, 12, wrapper='div'),
+        'listing/partial.html': _listing(rng, _card_partial, 12),
+        'listing/empty.html': html_page('Aucune offre', '<main><p class="aucun">Aucune offre ne correspond.</p></main>'),
+        'listing/large.html': _listing(rng, _card_testid, 50, noise_blocks=6),
+    }
+    salary = rng.choice(SALARIES)
+    corpus.update({
+        'detail/standard.html': _detail(
+            rng, f'<div class="descriptionOffre">{_description(rng)}</div>', f'<span class="salaire">{salary}</span>'),
+        'detail/description_remuneration.html': _detail(
+            rng, f'<div class="description">{_description(rng)}</div>',
+            f'<dl><dt>Salaire</dt><dd class="remuneration">{rng.choice(SALARIES)}</dd></dl>'),
+        'detail/contenu_salary.html': _detail(
+            rng, f'<section class="contenuOffre">{_description(rng, 2)}</section>',
+            f'<p class="salary">{rng.choice(SALARIES)}</p>'),
+        'detail/testid.html': _detail(
+            rng, f'<div data-testid="description-complete">{_description(rng)}</div>',
+            f'<span class="salaireOffre">{rng.choice(SALARIES)}</span>'),
+        'detail/texte_complet.html': _detail(rng, f'<article class="texteComplet">{_description(rng, 4)}</article>', ''),
+        'detail/missing.html': html_page('Offre indisponible', '<main><p>Cette offre n\'est plus disponible.</p></main>'),
+        'detail/large.html': _detail(
+            rng, f'<div class="descriptionOffre">{_description(rng, 12)}</div>',
+            f'<span class="salaire">{rng.choice(SALARIES)}</span>', noise_blocks=6),
+    })
+    return corpus
+
+
+def write_corpus(directory=FIXTURES_DIR):
+    """Écrit le corpus synthétique (octets identiques d'une exécution à l'autre)"""
+    corpus = build_corpus()
+    for name, html_content in corpus.items():
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(html_content)
+    return sorted(corpus)
+
+
+# --- Enregistrement d'une page réelle -------------------------------------
+
+_ANONYMIZE_RULES = [
+    (re.compile(r'[\w.+-]+@[\w-]+(\.[\w-]+)+'), 'contact@exemple.fr'),
+    (re.compile(r'(?<!\d)(?:\+33\s?|0)[1-9](?:[\s.-]?\d{2}){4}(?!\d)'), '01 00 00 00 00'),
+    (re.compile(r'\b\d{14}\b'), '00000000000000'),  # SIRET
+    (re.compile(r'(?i)(csrf|token|session|jsessionid)(["\']?\s*[:=]\s*["\']?)[\w.-]{8,}'), r'\1\2ANONYME'),
+]
+
+
+def anonymize(html_content):
+    """
+    Retire d'une page réelle les données personnelles et jetons de session
+
+    Args:
+        html_content (str): Page téléchargée
+
+    Returns:
+        str: Page anonymisée (e-mails, téléphones, SIRET, jetons)
+    """
+    for pattern, replacement in _ANONYMIZE_RULES:
+        html_content = pattern.sub(replacement, html_content)
+    return html_content
+
+
+def record(url, page_type, name, directory=FIXTURES_DIR):
+    """
+    Télécharge une page réelle et l'ajoute au corpus après anonymisation
+
+    Args:
+        url (str): Page de résultats ou d'offre
+        page_type (str): 'listing' ou 'detail'
+        name (str): Nom du fichier (sans extension)
+
+    Returns:
+        str: Chemin du fichier écrit
+    """
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from pole_emploi_scraper import PoleEmploiScraper
+
+    response = PoleEmploiScraper(http_cache=False, session_bridge=False).session.get(url, timeout=30)
+    response.raise_for_status()
+    path = os.path.join(directory, page_type, f"{name}.html")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(anonymize(response.text))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Corpus HTML hors ligne du parseur")
+    subparsers = parser.add_subparsers(dest='command')
+    record_parser = subparsers.add_parser('record', help="Enregistre une page réelle anonymisée")
+    record_parser.add_argument('url')
+    record_parser.add_argument('page_type', choices=['listing', 'detail'])
+    record_parser.add_argument('name')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        print(f"Page enregistrée: {record(args.url, args.page_type, args.name)}")
+        print("Relancez 'bench_parsers.py update-golden' après avoir vérifié la page.")
+    else:
+        names = write_corpus()
+        print(f"{len(names)} pages écrites dans {FIXTURES_DIR}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,410 @@
+"""
+Serveur local imitant France Travail pour les mesures de bout en bout
+
+Il sert des pages de résultats paginées (même paramètres que
+POLE_EMPLOI_SEARCH_URL), des pages d'offres et plusieurs variantes de
+formulaire de candidature, avec des données fictives et déterministes:
+
+- inline: le bouton « Postuler » affiche le formulaire dans la page de l'offre;
+- page: le lien « Postuler » mène à une page de formulaire (champs par name);
+- ajax: formulaire repéré par ses placeholders, envoyé en fetch, confirmation
+  insérée dans la page sans changer d'URL;
+- tab: comme 'page', mais le lien s'ouvre dans un nouvel onglet.
+
+La latence, le taux d'erreurs serveur, le taux de réponses 429 et la part
+d'offres expirées sont réglables; les requêtes et soumissions reçues sont
+comptées par route (aussi servies en JSON sur /__stats). Les pages de résultats
+et d'offres portent un ETag: une requête conditionnelle (If-None-Match) reçoit
+un 304 sans corps si la page n'a pas changé.
+
+Usage:
+    python benchmarks/standin_server.py --port 8765 --latency 80 --throttle-rate 0.05
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from make_fixtures import CARD_LAYOUTS, SALARIES, SENTENCES, fake_offer, html_page, page_noise
+
+SEARCH_PATH = '/offres/recherche'
+DETAIL_PATH = '/offres/recherche/detail/'
+FORM_VARIANTS = ('inline', 'page', 'ajax', 'tab')
+ROUTES = ('search', 'detail', 'form', 'submit', 'confirmation')
+
+# Champs de chaque variante: (balise, type, attributs, libellé)
+_FORM_FIELDS = {
+    'inline': [
+        ('input', 'text', 'id="nom" name="nom"', 'Nom'),
+        ('input', 'text', 'id="prenom" name="prenom"', 'Prénom'),
+        ('input', 'email', 'id="email" name="email"', 'E-mail'),
+        ('input', 'tel', 'id="telephone" name="telephone"', 'Téléphone'),
+        ('input', 'file', 'id="cv" name="cv"', 'CV'),
+        ('input', 'file', 'id="lettre_motivation" name="lettre_motivation"', 'Lettre de motivation'),
+        ('textarea', '', 'id="message" name="message"', 'Votre message'),
+    ],
+    'page': [
+        ('input', 'text', 'name="lastname"', 'Nom de famille'),
+        ('input', 'text', 'name="firstname"', 'Prénom'),
+        ('input', 'email', 'name="mail"', 'Adresse e-mail'),
+        ('input', 'tel', 'name="phone"', 'Téléphone'),
+        ('input', 'text', 'name="city"', 'Ville'),
+        ('input', 'file', 'name="piece_cv"', 'Curriculum vitae'),
+        ('input', 'file', 'name="cover_letter"', 'Lettre'),
+        ('textarea', '', 'name="experience_detail"', 'Expérience'),
+    ],
+    'ajax': [
+        ('input', 'text', 'placeholder="nom"', ''),
+        ('input', 'text', 'placeholder="prenom"', ''),
+        ('input', 'email', 'placeholder="email" name="courriel"', ''),
+        ('input', 'tel', 'placeholder="telephone" name="tel"', ''),
+        ('input', 'file', 'name="resume_file"', ''),
+        ('textarea', '', 'name="commentaire" placeholder="Votre motivation"', ''),
+    ],
+}
+_FORM_FIELDS['tab'] = _FORM_FIELDS['page']
+
+# Envoi en fetch: la confirmation vient du serveur (aucun texte de succès dans le script)
+_AJAX_SUBMIT_JS = """
+document.getElementById('candidature').addEventListener('submit', function (event) {
+    event.preventDefault();
+    var form = event.target;
+    fetch(form.action + '?mode=ajax', {method: 'POST', body: new FormData(form)})
+        .then(function (response) { return response.text(); })
+        .then(function (html) { document.getElementById('reponse').innerHTML = html; form.remove(); });
+});
+"""
+
+
+class StandInServer:
+    """Site de recherche et de candidature local, aux défaillances réglables"""
+
+    def __init__(self, offers=120, page_size=20, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 throttle_rate=0.0, expired_rate=0.0, variants=('inline', 'page', 'ajax'),
+                 fault_routes=('search', 'detail'), layout='testid', noise_blocks=2, seed=2024,
+                 host='127.0.0.1', port=0):
+        """
+        Initialise le serveur (sans le démarrer)
+
+        Args:
+            offers (int): Nombre total d'offres
+            page_size (int): Offres par page de résultats
+            latency_ms (float): Latence ajoutée à chaque réponse, en millisecondes
+            jitter_ms (float): Variation aléatoire de la latence (0 à jitter_ms)
+            error_rate (float): Part des requêtes en erreur 503
+            throttle_rate (float): Part des requêtes refusées en 429 (avec Retry-After)
+            expired_rate (float): Part des offres expirées (410 sur la page de l'offre)
+            variants (tuple): Variantes de formulaire, attribuées aux offres à tour de rôle
+            fault_routes (tuple): Routes soumises aux erreurs et 429 (voir ROUTES)
+            layout (str): Mise en page des cartes (clé de make_fixtures.CARD_LAYOUTS)
+            noise_blocks (int): Blocs de navigation et de scripts autour des résultats
+            seed (int): Graine des données et des défaillances
+            host (str): Adresse d'écoute
+            port (int): Port d'écoute (0: port libre choisi par le système)
+        """
+        unknown = set(variants) - set(FORM_VARIANTS)
+        if unknown:
+            raise ValueError(f"Variantes inconnues: {', '.join(sorted(unknown))}")
+        self.page_size = page_size
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.fault_routes = set(fault_routes)
+        self.card = CARD_LAYOUTS[layout]
+        self.config = {
+            'offers': offers, 'page_size': page_size, 'latency_ms': latency_ms, 'jitter_ms': jitter_ms,
+            'error_rate': error_rate, 'throttle_rate': throttle_rate, 'expired_rate': expired_rate,
+            'variants': list(variants), 'fault_routes': sorted(self.fault_routes), 'layout': layout,
+            'noise_blocks': noise_blocks, 'seed': seed,
+        }
+
+        rng = random.Random(seed)
+        self.offers = []
+        self.by_id = {}
+        for index in range(offers):
+            offer = fake_offer(rng, index)
+            offer['id'] = f"{index + 1:03d}{offer['id'][3:]}"  # Identifiants uniques
+            offer['variant'] = variants[index % len(variants)]
+            offer['expired'] = rng.random() < expired_rate
+            offer['salary'] = rng.choice(SALARIES)
+            self.offers.append(offer)
+            self.by_id[offer['id']] = offer
+        self.noise = page_noise(rng, noise_blocks) if noise_blocks else ''
+
+        self._fault_rng = random.Random(seed + 1)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.standin = self
+        self._thread = None
+        self.reset_stats()
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def search_url(self):
+        return self.url + SEARCH_PATH
+
+    def offer_url(self, offer_id):
+        return self.url + DETAIL_PATH + offer_id
+
+    def start(self):
+        """Démarre le serveur dans un thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='standin-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Arrête le serveur"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # --- Comptage ---------------------------------------------------------
+
+    def reset_stats(self):
+        """Remet les compteurs à zéro"""
+        with self._lock:
+            self._stats = {route: {'requests': 0, 'bytes': 0, 'status': {}} for route in ROUTES}
+            self._stats['submissions'] = []
+
+    def stats(self):
+        """
+        Compteurs depuis le dernier reset_stats
+
+        Returns:
+            dict: Par route: requêtes, octets envoyés et réponses par code HTTP;
+                'submissions': une entrée par formulaire reçu (offre, variante, fichiers)
+        """
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+
+    def _count(self, route, status, size):
+        with self._lock:
+            entry = self._stats[route]
+            entry['requests'] += 1
+            entry['bytes'] += size
+            entry['status'][str(status)] = entry['status'].get(str(status), 0) + 1
+
+    def _record_submission(self, offer, body):
+        files = re.findall(rb'filename="([^"]+)"', body)
+        with self._lock:
+            self._stats['submissions'].append({
+                'offer_id': offer['id'], 'variant': offer['variant'], 'bytes': len(body), 'files': len(files)
+            })
+
+    def _fault(self, route):
+        """Défaillance tirée au sort pour une requête: 429, 503 ou None"""
+        if route not in self.fault_routes:
+            return None
+        with self._lock:
+            draw = self._fault_rng.random()
+        if draw < self.throttle_rate:
+            return 429
+        if draw < self.throttle_rate + self.error_rate:
+            return 503
+        return None
+
+    def _delay(self):
+        delay = self.latency_ms
+        if self.jitter_ms:
+            with self._lock:
+                delay += self._fault_rng.uniform(0, self.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+
+    # --- Pages --------------------------------------------------------------
+
+    def search_page(self, query):
+        page = max(1, int((query.get('page') or ['1'])[0] or 1))
+        keywords = (query.get('motsCles') or [''])[0]
+        offers = self.offers[(page - 1) * self.page_size:page * self.page_size]
+        if not offers:
+            body = '<main><p class="aucun">Aucune offre ne correspond à votre recherche.</p></main>'
+            return html_page('Aucune offre', body)
+        cards = '\n'.join(self.card(offer) for offer in offers)
+        body = (f'{self.noise}\n<main id="contenu"><h1>{len(self.offers)} offres pour « {keywords} »</h1>'
+                f'<p>Page {page}</p><ul class="liste-offres">\n{cards}\n</ul></main>')
+        return html_page("Offres d'emploi - Recherche", body)
+
+    def detail_page(self, offer):
+        description = ''.join(f'<p>{sentence}</p>' for sentence in SENTENCES[:4])
+        variant = offer['variant']
+        if variant == 'inline':
+            apply_block = (
+                '<button type="button" class="btn postuler" onclick="document.getElementById(\'formulaire\')'
+                '.style.display=\'block\'; this.style.display=\'none\';">Postuler</button>'
+                f'<div id="formulaire" style="display:none">{self.form(offer)}</div>'
+            )
+        else:
+            target = ' target="_blank"' if variant == 'tab' else ''
+            label = 'Candidater' if variant == 'ajax' else 'Postuler'
+            apply_block = f'<a class="btn" href="/candidature/{variant}/{offer["id"]}"{target}>{label}</a>'
+        body = (f'<main><h1 class="t2 title">{offer["title"]}</h1><p class="entreprise">{offer["company"]}</p>'
+                f'<p class="lieu">{offer["city"]}</p><div class="descriptionOffre">{description}</div>'
+                f'<span class="salaire">{offer["salary"]}</span>\n{apply_block}</main>')
+        return html_page(f"Offre d'emploi - {offer['title']}", body)
+
+    def form(self, offer):
+        rows = []
+        for tag, field_type, attributes, label in _FORM_FIELDS[offer['variant']]:
+            field_id = re.search(r'id="([^"]+)"', attributes)
+            label_html = (f'<label for="{field_id.group(1)}">{label}</label>' if label and field_id
+                          else f'<label>{label}</label>' if label else '')
+            control = (f'<textarea {attributes} rows="4"></textarea>' if tag == 'textarea'
+                       else f'<input type="{field_type}" {attributes}>')
+            rows.append(f'<div class="champ">{label_html}{control}</div>')
+        return (f'<form id="candidature" method="post" action="/candidature/envoi/{offer["id"]}" '
+                f'enctype="multipart/form-data">{"".join(rows)}'
+                '<button type="submit" class="btn">Envoyer ma candidature</button></form>')
+
+    def form_page(self, offer):
+        script = f'<script>{_AJAX_SUBMIT_JS}</script>' if offer['variant'] == 'ajax' else ''
+        body = (f'<main><h1>Candidature: {offer["title"]}</h1><div id="reponse"></div>'
+                f'{self.form(offer)}</main>{script}')
+        return html_page('Formulaire de candidature', body)
+
+    @staticmethod
+    def confirmation(offer):
+        return (f'<div class="alert alert-ok"><h2>Candidature envoyée</h2>'
+                f'<p>Merci, votre candidature à l\'offre {offer["id"]} a bien été transmise.</p></div>')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes du serveur de remplacement"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass  # Pas de journal par requête: il fausserait les mesures
+
+    def _send(self, route, status, body='', content_type='text/html; charset=utf-8', headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+        if route:
+            self.server.standin._count(route, status, len(data))
+
+    def _send_page(self, route, body):
+        """Page avec ETag: 304 sans corps si le client en a déjà la version courante"""
+        etag = '"' + hashlib.sha1(body.encode('utf-8')).hexdigest()[:16] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            return self._send(route, 304, headers={'ETag': etag})
+        return self._send(route, 200, body, headers={'ETag': etag})
+
+    def _route(self):
+        """(route, offre, variante) d'après le chemin; route None si inconnu"""
+        standin = self.server.standin
+        path = urlparse(self.path).path
+        if path == SEARCH_PATH:
+            return 'search', None
+        match = re.fullmatch(r'/offres/recherche/detail/(\w+)', path)
+        if match:
+            return 'detail', standin.by_id.get(match.group(1))
+        match = re.fullmatch(r'/candidature/(page|ajax|tab)/(\w+)', path)
+        if match:
+            return 'form', standin.by_id.get(match.group(2))
+        match = re.fullmatch(r'/candidature/envoi/(\w+)', path)
+        if match:
+            return 'submit', standin.by_id.get(match.group(1))
+        match = re.fullmatch(r'/candidature/confirmation/(\w+)', path)
+        if match:
+            return 'confirmation', standin.by_id.get(match.group(1))
+        return None, None
+
+    def _handle(self):
+        standin = self.server.standin
+        if urlparse(self.path).path == '/__stats':
+            return self._send(None, 200, json.dumps(standin.stats()), 'application/json')
+
+        route, offer = self._route()
+        body = b''
+        if self.command == 'POST':
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if route is None or (route != 'search' and offer is None):
+            return self._send(route, 404, html_page('Page introuvable', '<p>Page introuvable</p>'))
+
+        standin._delay()
+        fault = standin._fault(route)
+        if fault == 429:
+            return self._send(route, 429, 'Trop de requêtes', 'text/plain; charset=utf-8', {'Retry-After': '1'})
+        if fault:
+            return self._send(route, fault, 'Service indisponible', 'text/plain; charset=utf-8')
+
+        if route == 'search':
+            return self._send_page(route, standin.search_page(parse_qs(urlparse(self.path).query)))
+        if offer['expired'] and route in ('detail', 'form', 'submit'):
+            return self._send(route, 410, html_page('Offre expirée', "<p>Cette offre n'est plus disponible.</p>"))
+        if route == 'detail':
+            return self._send_page(route, standin.detail_page(offer))
+        if route == 'form':
+            return self._send(route, 200, standin.form_page(offer))
+        if route == 'submit':
+            if self.command != 'POST':
+                return self._send(route, 405, 'POST attendu', 'text/plain; charset=utf-8')
+            standin._record_submission(offer, body)
+            if 'mode=ajax' in urlparse(self.path).query:
+                return self._send(route, 200, standin.confirmation(offer))
+            return self._send(route, 303, '', headers={'Location': f"/candidature/confirmation/{offer['id']}"})
+        return self._send(route, 200, html_page('Confirmation', f'<main>{standin.confirmation(offer)}</main>'))
+
+    do_GET = do_POST = do_HEAD = _handle
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur local imitant France Travail")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--offers', type=int, default=120)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0, help="Latence ajoutée (ms)")
+    parser.add_argument('--jitter', type=float, default=0, help="Variation de latence (ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Part de réponses 429")
+    parser.add_argument('--expired-rate', type=float, default=0.0)
+    parser.add_argument('--variants', default='inline,page,ajax', help=f"Parmi {', '.join(FORM_VARIANTS)}")
+    parser.add_argument('--fault-routes', default='search,detail', help=f"Parmi {', '.join(ROUTES)}")
+    parser.add_argument('--layout', default='testid', choices=sorted(CARD_LAYOUTS))
+    parser.add_argument('--seed', type=int, default=2024)
+    args = parser.parse_args()
+
+    server = StandInServer(
+        offers=args.offers, page_size=args.page_size, latency_ms=args.latency, jitter_ms=args.jitter,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate, expired_rate=args.expired_rate,
+        variants=tuple(args.variants.split(',')), fault_routes=tuple(args.fault_routes.split(',')),
+        layout=args.layout, seed=args.seed, host=args.host, port=args.port
+    )
+    with server:
+        print(f"Serveur de remplacement sur {server.search_url} (Ctrl+C pour arrêter)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -17,9 +17,13 @@ init(autoreset=True)
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from config import COLORS
+    from config import COLORS, JOB_STORE_ENABLED, JOB_STORE_FILE, BATCH_WORKERS, PREFLIGHT_ENABLED
     from pole_emploi_scraper import PoleEmploiScraper
-    from selenium_handler import SeleniumHandler
+    from driver_pool import DriverPool
+    from batch_apply import run_batch
+    from preflight import OfferPreflight, EXPIRED, EXTERNAL
+    from job_store import JobStore
+    from instrumentation import close_instrumentation
 except ImportError as e:
     print(f"Erreur d'import: {e}")
     print("Veuillez installer les dependances avec: pip install -r requirements.txt")
@@ -34,6 +38,9 @@ class BoostEmploi:
         self.personal_info = {}
         self.cv_path = None
         self.cover_letter_path = None
+        self.store = None
+        self.driver_pool = None
+        self.preflight = None
         
         # Configuration des couleurs élégantes
         self.colors = {
@@ -87,11 +94,12 @@ class BoostEmploi:
             ("1", "Rechercher des offres d'emploi", "Trouvez les meilleures opportunites"),
             ("2", "Ajouter mon CV et ma lettre de motivation", "Configurez vos documents"),
             ("3", "Postuler a une offre d'emploi", "Candidature automatique"),
-            ("4", "Quitter", "Fermer l'application")
+            ("4", "Postuler a plusieurs offres", "Candidatures groupees en parallele"),
+            ("5", "Quitter", "Fermer l'application")
         ]
         
         for num, title, desc in options:
-            if num == "4":
+            if num == "5":
                 color = self.colors['quit_option']
             else:
                 color = self.colors['menu_option']
@@ -106,17 +114,17 @@ class BoostEmploi:
         """Récupère le choix de l'utilisateur"""
         while True:
             try:
-                choice = input(f"{self.colors['input']}Votre choix (1-4): {self.colors['reset']}").strip()
+                choice = input(f"{self.colors['input']}Votre choix (1-5): {self.colors['reset']}").strip()
                 
-                if choice in ['1', '2', '3', '4']:
+                if choice in ['1', '2', '3', '4', '5']:
                     return int(choice)
                 else:
-                    print(f"{self.colors['error']}Choix invalide ! Veuillez entrer un nombre entre 1 et 4.{self.colors['reset']}")
+                    print(f"{self.colors['error']}Choix invalide ! Veuillez entrer un nombre entre 1 et 5.{self.colors['reset']}")
                     time.sleep(1)
                     
             except KeyboardInterrupt:
                 print(f"\n{self.colors['warning']}Operation annulee par l'utilisateur.{self.colors['reset']}")
-                return 4
+                return 5
             except:
                 print(f"{self.colors['error']}Erreur de saisie ! Veuillez reessayer.{self.colors['reset']}")
                 time.sleep(1)
@@ -156,18 +164,22 @@ class BoostEmploi:
             print(f"{self.colors['info']}Veuillez patienter, cela peut prendre quelques instants...{self.colors['reset']}")
             print()
             
+            # Affichage progressif: chaque offre est affichée dès son extraction
+            self.jobs = []
             try:
                 scraper = PoleEmploiScraper()
-                self.jobs = scraper.search_jobs(
+                for job in scraper.iter_jobs(
                     keywords=keywords,
                     location=location,
                     contract_type=contract_type,
-                    max_results=max_results
-                )
+                    max_results=max_results,
+                    store=self.get_store()
+                ):
+                    self.jobs.append(job)
+                    self.print_job_line(len(self.jobs), job)
             except Exception as scrape_error:
                 print(f"{self.colors['error']}Erreur lors du scraping: {str(scrape_error)}{self.colors['reset']}")
                 print(f"{self.colors['info']}Verifiez votre connexion Internet et reessayez.{self.colors['reset']}")
-                self.jobs = []
             
             if self.jobs:
                 print(f"\n{self.colors['success']}RECHERCHE TERMINEE AVEC SUCCES !{self.colors['reset']}")
@@ -182,6 +194,42 @@ class BoostEmploi:
             print(f"\n{self.colors['error']}Erreur lors de la recherche : {str(e)}{self.colors['reset']}")
             input(f"\n{self.colors['info']}Appuyez sur Entree pour continuer...{self.colors['reset']}")
     
+    def print_job_line(self, index, job):
+        """Affiche une offre sur une ligne, au fil de la recherche"""
+        print(f"  {self.colors['menu_number']}[{index}]{self.colors['reset']} {self.colors['menu_option']}{job['title'][:50]}{self.colors['reset']}"
+              f" {self.colors['info']}- {job['company']} | {job['location']} | {job['contract_type']}{self.colors['reset']}")
+    
+    def get_store(self):
+        """Ouvre la base des offres à la première utilisation (None si désactivée)"""
+        if self.store is None and JOB_STORE_ENABLED:
+            try:
+                self.store = JobStore(JOB_STORE_FILE)
+            except Exception as e:
+                print(f"{self.colors['warning']}Historique des offres indisponible : {str(e)}{self.colors['reset']}")
+        return self.store
+    
+    def get_driver_pool(self):
+        """Crée le pool de navigateurs à la première candidature, puis le réutilise"""
+        if self.driver_pool is None:
+            self.driver_pool = DriverPool(headless=False)
+        return self.driver_pool
+    
+    def get_preflight(self):
+        """Crée la pré-vérification HTTP des offres à la première utilisation (None si désactivée)"""
+        if self.preflight is None and PREFLIGHT_ENABLED:
+            self.preflight = OfferPreflight()
+        return self.preflight
+    
+    def close_resources(self):
+        """Ferme les navigateurs et la base des offres, puis affiche le résumé des étapes mesurées"""
+        if self.driver_pool is not None:
+            self.driver_pool.close()
+            self.driver_pool = None
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        close_instrumentation()
+    
     def add_documents(self):
         """Fonction pour ajouter CV et lettre de motivation"""
         self.clear_screen()
@@ -278,13 +326,27 @@ class BoostEmploi:
             
             if confirm in ['oui', 'o', 'yes', 'y']:
                 print(f"\n{self.colors['info']}Lancement de la candidature automatique...{self.colors['reset']}")
+                
+                # Vérifier que l'offre est toujours en ligne avant d'ouvrir le navigateur
+                start_url = selected_job['url']
+                preflight = self.get_preflight()
+                if preflight:
+                    result = preflight.check(selected_job)
+                    if result['status'] == EXPIRED:
+                        print(f"\n{self.colors['error']}Offre expiree ({result['reason']}){self.colors['reset']}")
+                        input(f"\n{self.colors['info']}Appuyez sur Entree pour continuer...{self.colors['reset']}")
+                        return
+                    if result['status'] == EXTERNAL and result['apply_url']:
+                        print(f"{self.colors['info']}Candidature sur un site externe : {result['apply_url']}{self.colors['reset']}")
+                        start_url = result['apply_url']
+                
                 print(f"{self.colors['info']}Veuillez patienter, le navigateur va s'ouvrir...{self.colors['reset']}")
                 
                 # Candidature automatique
                 try:
-                    with SeleniumHandler(headless=False) as handler:
+                    with self.get_driver_pool().handler() as handler:
                         handler.set_documents(self.cv_path, self.cover_letter_path)
-                        success = handler.apply_to_job(selected_job['url'], self.personal_info)
+                        success = handler.apply_to_job(start_url, self.personal_info)
                         
                         if success:
                             print(f"\n{self.colors['success']}CANDIDATURE ENVOYEE AVEC SUCCES !{self.colors['reset']}")
@@ -304,6 +366,85 @@ class BoostEmploi:
             print(f"\n{self.colors['error']}Erreur lors de la candidature : {str(e)}{self.colors['reset']}")
             input(f"\n{self.colors['info']}Appuyez sur Entree pour continuer...{self.colors['reset']}")
     
+    def parse_selection(self, text, count):
+        """
+        Convertit une sélection ("1,3,5-8" ou "tous") en index d'offres
+        
+        Args:
+            text (str): Saisie de l'utilisateur
+            count (int): Nombre d'offres disponibles
+            
+        Returns:
+            list: Index (base 0) sans doublon, dans l'ordre saisi ; None si la saisie est invalide
+        """
+        if text.lower() in ['tous', 'toutes', 't', 'all']:
+            return list(range(count))
+        
+        indexes = []
+        for part in text.replace(' ', '').split(','):
+            bounds = part.split('-')
+            if not part or len(bounds) > 2 or not all(b.isdigit() for b in bounds):
+                return None
+            first, last = int(bounds[0]), int(bounds[-1])
+            if not (1 <= first <= last <= count):
+                return None
+            for number in range(first, last + 1):
+                if number - 1 not in indexes:
+                    indexes.append(number - 1)
+        return indexes
+    
+    def batch_apply(self):
+        """Fonction pour postuler à plusieurs offres en parallèle (navigateurs headless)"""
+        self.clear_screen()
+        print(f"{self.colors['title']}{'CANDIDATURES GROUPEES':^80}{self.colors['reset']}")
+        print(f"{self.colors['info']}{'=' * 80}{self.colors['reset']}")
+        print()
+        
+        # Vérifications préalables
+        if not self.jobs:
+            print(f"{self.colors['error']}Aucune offre disponible{self.colors['reset']}")
+            print(f"{self.colors['info']}Veuillez d'abord effectuer une recherche d'offres{self.colors['reset']}")
+            input(f"\n{self.colors['info']}Appuyez sur Entree pour continuer...{self.colors['reset']}")
+            return
+        
+        if not self.cv_path or not self.cover_letter_path:
+            print(f"{self.colors['error']}Documents non configures{self.colors['reset']}")
+            print(f"{self.colors['info']}Veuillez d'abord configurer votre CV et lettre de motivation{self.colors['reset']}")
+            input(f"\n{self.colors['info']}Appuyez sur Entree pour continuer...{self.colors['reset']}")
+            return
+        
+        try:
+            print(f"{self.colors['info']}Offres disponibles :{self.colors['reset']}")
+            for i, job in enumerate(self.jobs, 1):
+                self.print_job_line(i, job)
+            print()
+            
+            # Sélection des offres
+            selection = input(f"{self.colors['input']}Offres a traiter (ex: 1,3,5-8 ou 'tous'): {self.colors['reset']}").strip()
+            indexes = self.parse_selection(selection, len(self.jobs))
+            if not indexes:
+                print(f"{self.colors['error']}Selection invalide !{self.colors['reset']}")
+                input(f"\n{self.colors['info']}Appuyez sur Entree pour continuer...{self.colors['reset']}")
+                return
+            selected_jobs = [self.jobs[i] for i in indexes]
+            
+            workers = input(f"{self.colors['input']}Navigateurs en parallele (defaut {BATCH_WORKERS}): {self.colors['reset']}").strip()
+            workers = int(workers) if workers.isdigit() and int(workers) > 0 else BATCH_WORKERS
+            
+            confirm = input(f"\n{self.colors['warning']}Postuler a {len(selected_jobs)} offre(s) ? (oui/non): {self.colors['reset']}").strip().lower()
+            
+            if confirm in ['oui', 'o', 'yes', 'y']:
+                print()
+                run_batch(selected_jobs, self.personal_info, self.cv_path, self.cover_letter_path, workers=workers)
+            else:
+                print(f"\n{self.colors['info']}Candidatures annulees{self.colors['reset']}")
+            
+            input(f"\n{self.colors['info']}Appuyez sur Entree pour continuer...{self.colors['reset']}")
+            
+        except Exception as e:
+            print(f"\n{self.colors['error']}Erreur lors des candidatures groupees : {str(e)}{self.colors['reset']}")
+            input(f"\n{self.colors['info']}Appuyez sur Entree pour continuer...{self.colors['reset']}")
+    
     def show_jobs_summary(self):
         """Affiche un résumé des offres trouvées"""
         if not self.jobs:
@@ -344,6 +485,8 @@ class BoostEmploi:
                 elif choice == 3:
                     self.apply_to_job()
                 elif choice == 4:
+                    self.batch_apply()
+                elif choice == 5:
                     self.clear_screen()
                     print(f"{self.colors['title']}{'MERCI D\'AVOIR UTILISE BOOST EMPLOIE !':^80}{self.colors['reset']}")
                     print(f"{self.colors['info']}{'=' * 80}{self.colors['reset']}")
@@ -362,6 +505,8 @@ class BoostEmploi:
             except Exception as e:
                 print(f"\n{self.colors['error']}Erreur inattendue : {str(e)}{self.colors['reset']}")
                 input(f"\n{self.colors['info']}Appuyez sur Entree pour continuer...{self.colors['reset']}")
+        
+        self.close_resources()
 
 
 def main():
@@ -0,0 +1,245 @@
+"""
+Extracteur compilé pour les cartes d'offres d'emploi
+
+Les listes de sélecteurs CSS de chaque champ sont compilées une seule fois en
+règles simples, puis chaque carte est parcourue une seule fois : pour chaque
+champ, on retient le premier noeud (dans l'ordre du document) qui correspond au
+sélecteur le plus prioritaire. Le résultat est identique à une cascade de
+`select_one`, sans re-parcourir le sous-arbre pour chaque sélecteur.
+"""
+
+import re
+from bs4 import Tag
+
+
+# Partie composée d'un sélecteur: tag optionnel, puis .classe, #id ou [attribut]
+_TAG_RE = re.compile(r'[a-zA-Z][\w-]*')
+_SIMPLE_RE = re.compile(
+    r'\.([\w-]+)|#([\w-]+)'
+    r'|\[\s*([\w-]+)\s*(?:(=)\s*(?:"([^"]*)"|\'([^\']*)\'|([\w-]+))\s*)?\]'
+)
+
+
+def _xpath_literal(value):
+    """Chaîne littérale XPath, quelles que soient les guillemets de la valeur"""
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return "concat(%s)" % ", '\"', ".join(f'"{chunk}"' for chunk in value.split('"'))
+
+
+def selector_to_xpath(selector):
+    """
+    Traduit un sélecteur CSS supporté par l'extracteur en expression XPath
+
+    Args:
+        selector (str): Sélecteur CSS (tag, .classe, #id, [attribut], descendant)
+
+    Returns:
+        str: Expression XPath équivalente, évaluée depuis la racine du document
+
+    Raises:
+        ValueError: Si le sélecteur n'est pas supporté
+    """
+    steps = []
+    for part in selector.split():
+        compound = _Compound(part)
+        predicates = [
+            f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+            for cls in compound.classes
+        ]
+        for name, value in compound.attrs:
+            predicates.append(f"@{name}" if value is None else f"@{name}={_xpath_literal(value)}")
+        steps.append('//' + (compound.tag or '*') + ''.join(f'[{p}]' for p in predicates))
+
+    if not steps:
+        raise ValueError("Sélecteur vide")
+    return ''.join(steps)
+
+
+class _Compound:
+    """Partie d'un sélecteur sans combinateur (ex: a.titreOffre[data-testid="x"])"""
+
+    __slots__ = ('tag', 'classes', 'attrs')
+
+    def __init__(self, text):
+        self.tag = None
+        self.classes = []
+        self.attrs = []
+
+        pos = 0
+        match = _TAG_RE.match(text)
+        if match:
+            self.tag = match.group(0).lower()
+            pos = match.end()
+
+        while pos < len(text):
+            match = _SIMPLE_RE.match(text, pos)
+            if not match:
+                raise ValueError(f"Sélecteur non supporté: {text}")
+
+            cls, id_, attr, equals, dq, sq, bare = match.groups()
+            if cls:
+                self.classes.append(cls)
+            elif id_:
+                self.attrs.append(('id', id_))
+            elif equals:
+                self.attrs.append((attr.lower(), dq if dq is not None else sq if sq is not None else bare))
+            else:
+                self.attrs.append((attr.lower(), None))
+            pos = match.end()
+
+        if not (self.tag or self.classes or self.attrs):
+            raise ValueError(f"Sélecteur non supporté: {text}")
+
+    def matches(self, node):
+        """Vérifie si le noeud correspond à cette partie du sélecteur"""
+        if self.tag and node.name != self.tag:
+            return False
+
+        node_attrs = node.attrs
+        if self.classes:
+            node_classes = node_attrs.get('class') or ()
+            for cls in self.classes:
+                if cls not in node_classes:
+                    return False
+
+        for name, value in self.attrs:
+            if name not in node_attrs:
+                return False
+            if value is not None:
+                actual = node_attrs[name]
+                if isinstance(actual, list):
+                    actual = ' '.join(actual)
+                if actual != value:
+                    return False
+
+        return True
+
+
+class _Rule:
+    """Sélecteur compilé (combinateur descendant uniquement)"""
+
+    __slots__ = ('field', 'priority', 'parts')
+
+    def __init__(self, field, priority, selector):
+        self.field = field
+        self.priority = priority
+        self.parts = [_Compound(part) for part in selector.split()]
+        if not self.parts:
+            raise ValueError("Sélecteur vide")
+
+    def matches(self, node):
+        """Vérifie le noeud et, de droite à gauche, ses ancêtres"""
+        if not self.parts[-1].matches(node):
+            return False
+
+        ancestor = node.parent
+        for part in reversed(self.parts[:-1]):
+            while ancestor is not None and not (ancestor.name and part.matches(ancestor)):
+                ancestor = ancestor.parent
+            if ancestor is None:
+                return False
+            ancestor = ancestor.parent
+
+        return True
+
+
+class CardExtractor:
+    """Plan de sélecteurs compilé, appliqué en un seul parcours par carte"""
+
+    def __init__(self, field_selectors):
+        """
+        Compile le plan de sélecteurs
+
+        Args:
+            field_selectors (dict): Champ -> liste ordonnée de sélecteurs CSS
+                (le premier sélecteur est le plus prioritaire)
+        """
+        self.fields = list(field_selectors)
+        self._by_tag = {}
+        self._by_class = {}
+        self._by_attr = {}
+        self._universal = []
+        self._fallback = []  # Sélecteurs non compilables, évalués par select_one
+
+        for field, selectors in field_selectors.items():
+            for priority, selector in enumerate(selectors):
+                try:
+                    rule = _Rule(field, priority, selector)
+                except ValueError:
+                    self._fallback.append((field, priority, selector))
+                    continue
+                self._index_rule(rule)
+
+    def _index_rule(self, rule):
+        """Range la règle selon la partie la plus sélective de son dernier composant"""
+        last = rule.parts[-1]
+        if last.classes:
+            self._by_class.setdefault(last.classes[0], []).append(rule)
+        elif last.attrs:
+            self._by_attr.setdefault(last.attrs[0][0], []).append(rule)
+        elif last.tag:
+            self._by_tag.setdefault(last.tag, []).append(rule)
+        else:
+            self._universal.append(rule)
+
+    def extract(self, element):
+        """
+        Trouve, pour chaque champ, le noeud retenu par la cascade de sélecteurs
+
+        Args:
+            element (Tag): Carte d'offre d'emploi
+
+        Returns:
+            dict: Champ -> (priorité, noeud) ; les champs sans correspondance sont absents
+        """
+        best = {}
+
+        for field, priority, selector in self._fallback:
+            current = best.get(field)
+            if current is None or priority < current[0]:
+                node = element.select_one(selector)
+                if node is not None:
+                    best[field] = (priority, node)
+
+        by_tag = self._by_tag
+        by_class = self._by_class
+        by_attr = self._by_attr
+        universal = self._universal
+        remaining = sum(1 for field in self.fields if best.get(field, (None,))[0] != 0)
+
+        for node in element.descendants:
+            if not isinstance(node, Tag):
+                continue
+
+            candidates = []
+            rules = by_tag.get(node.name)
+            if rules:
+                candidates.extend(rules)
+            for cls in node.attrs.get('class') or ():
+                rules = by_class.get(cls)
+                if rules:
+                    candidates.extend(rules)
+            for attr in node.attrs:
+                rules = by_attr.get(attr)
+                if rules:
+                    candidates.extend(rules)
+            if universal:
+                candidates.extend(universal)
+
+            for rule in candidates:
+                current = best.get(rule.field)
+                if current is not None and current[0] <= rule.priority:
+                    continue
+                if rule.matches(node):
+                    if rule.priority == 0:
+                        remaining -= 1
+                    best[rule.field] = (rule.priority, node)
+
+            # Tous les champs ont trouvé leur sélecteur prioritaire
+            if not remaining:
+                break
+
+        return best
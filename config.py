@@ -2,6 +2,11 @@
 Configuration pour l'outil de scraping Pôle Emploi
 """
 
+import os
+
+# Dossier des données persistantes (statistiques, caches...)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
 # Configuration des URLs
 POLE_EMPLOI_BASE_URL = "https://candidat.pole-emploi.fr"
 POLE_EMPLOI_SEARCH_URL = "https://candidat.pole-emploi.fr/offres/recherche"
@@ -10,6 +15,114 @@ POLE_EMPLOI_SEARCH_URL = "https://candidat.pole-emploi.fr/offres/recherche"
 REQUEST_DELAY = 2
 SELENIUM_WAIT_TIME = 10
 PAGE_LOAD_TIMEOUT = 30
+WAIT_POLL_INTERVAL = 0.1   # Intervalle de vérification des attentes conditionnelles
+NETWORK_IDLE_MS = 500      # Calme réseau exigé après la soumission (millisecondes)
+
+# Configuration de la récupération concurrente des pages de résultats
+# Le débit reste borné par REQUESTS_PER_SECOND: avec le budget par défaut (une
+# requête toutes les REQUEST_DELAY secondes, bien plus que la latence d'une page),
+# plusieurs pages en vol ne vont pas plus vite qu'une seule. La concurrence ne
+# sert qu'avec un budget relevé au-delà de 1 / latence (ex: 4 req/s pour 250 ms).
+CONCURRENT_SEARCH = False                  # Plusieurs pages en vol simultanément
+MAX_CONCURRENT_REQUESTS = 4                # Nombre de requêtes simultanées
+REQUESTS_PER_SECOND = 1.0 / REQUEST_DELAY  # Budget global de requêtes par seconde
+DETAIL_WORKERS = 8                         # Pages d'offres récupérées simultanément
+ASYNC_QUEUE_SIZE = 100                     # Offres en attente dans aiter_jobs
+
+# Analyse HTML: 'lxml-strained' (sous-arbres utiles uniquement) ou 'html.parser'
+HTML_PARSER_MODE = 'lxml-strained'
+PARSER_BENCHMARK_FILE = os.path.join(DATA_DIR, 'parser_benchmarks.jsonl')   # Mesures de benchmarks/bench_parsers.py
+PIPELINE_BENCHMARK_FILE = os.path.join(DATA_DIR, 'pipeline_benchmarks.jsonl')   # Mesures de benchmarks/bench_pipeline.py
+
+# Statistiques des sélecteurs gagnants (rapport seulement: l'ordre déclaré reste la priorité)
+SELECTOR_STATS_FILE = os.path.join(DATA_DIR, 'selector_stats.json')
+
+# Cache HTTP persistant (revalidation ETag / If-Modified-Since à expiration)
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_FILE = os.path.join(DATA_DIR, 'http_cache.sqlite')
+HTTP_CACHE_SEARCH_TTL = 10 * 60        # Pages de résultats (secondes)
+HTTP_CACHE_DETAIL_TTL = 24 * 60 * 60   # Pages d'offres (secondes)
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Historique persistant des offres (SQLite, dédupliqué par identifiant d'offre)
+JOB_STORE_ENABLED = True
+JOB_STORE_FILE = os.path.join(DATA_DIR, 'jobs.sqlite')
+
+# Pool de navigateurs Chrome réutilisés entre les candidatures
+DRIVER_POOL_SIZE = 1      # Navigateurs gardés lancés
+DRIVER_MAX_USES = 20      # Candidatures avant de relancer un navigateur
+DRIVER_ACQUIRE_TIMEOUT = 300   # Attente maximale d'un navigateur libre (secondes)
+
+# chromedriver: chemin imposé (sinon cache par version de Chrome, puis webdriver-manager)
+CHROMEDRIVER_PATH = os.environ.get('CHROMEDRIVER_PATH') or None
+CHROMEDRIVER_CACHE_FILE = os.path.join(DATA_DIR, 'chromedriver.json')
+
+# Modèles de formulaires appris par portail (domaine + structure du formulaire)
+FORM_TEMPLATES_ENABLED = True
+FORM_TEMPLATES_FILE = os.path.join(DATA_DIR, 'form_templates.json')
+
+# Vérifications de page, faites dans le navigateur (textes en minuscules)
+JOB_PAGE_INDICATORS = [
+    "offre", "emploi", "job", "poste", "recrutement",
+    "candidature", "apply", "postuler"
+]
+SUCCESS_INDICATORS = [
+    "candidature envoyée", "merci", "confirmation",
+    "success", "envoyé", "réussi"
+]
+SUCCESS_SELECTORS = []       # Sélecteurs CSS confirmant l'envoi (ex: '.alert-success')
+SUCCESS_URL_PATTERNS = []    # Expressions régulières sur l'URL de confirmation (ex: r'/confirmation')
+
+# Candidatures groupées (navigateurs headless en parallèle, journal reprenable)
+BATCH_WORKERS = 2
+BATCH_JOURNAL_FILE = os.path.join(DATA_DIR, 'applications.jsonl')
+SCREENSHOT_DIR = os.path.join(DATA_DIR, 'screenshots')   # Captures des échecs uniquement
+
+# Recherches groupées en ligne de commande (batch_search.py)
+SEARCH_QUERY_WORKERS = 4   # Recherches simultanées, toutes sous le même budget REQUESTS_PER_SECOND
+BATCH_SEARCH_OUTPUT_FILE = os.path.join(DATA_DIR, 'search_results.json')   # Offres fusionnées, sans doublons
+
+# Chargement des pages dans Chrome: stratégie et blocage des ressources (Chrome DevTools)
+PAGE_LOAD_STRATEGY = 'normal'      # 'normal', 'eager' (DOM prêt) ou 'none'
+RESOURCE_BLOCKING = True
+BLOCKED_RESOURCE_TYPES = ['image', 'font', 'media']   # 'stylesheet' possible
+BLOCKED_URL_PATTERNS = [
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*facebook.net*', '*hotjar.com*', '*clarity.ms*', '*youtube.com/embed*',
+]
+ALLOWED_ORIGINS = [POLE_EMPLOI_BASE_URL]   # En plus des origines de l'offre et du formulaire
+# Mesures de chargement des pages, pour comparer avec et sans blocage
+# (ex: os.path.join(DATA_DIR, 'page_loads.jsonl'); None: en mémoire seulement).
+# Le fichier est archivé comme le journal d'instrumentation (TELEMETRY_JSONL_MAX_BYTES / _BACKUPS)
+PAGE_LOAD_STATS_FILE = None
+PAGE_LOAD_STATS_MAX_ENTRIES = 1000   # Mesures gardées en mémoire (les plus récentes)
+
+# Session partagée entre le scraper et le navigateur (cookies persistés entre les exécutions)
+SESSION_BRIDGE_ENABLED = True
+COOKIE_STORE_FILE = os.path.join(DATA_DIR, 'cookies.json')
+# Domaines dont les cookies du navigateur sont partagés (en plus de ceux des offres visitées)
+COOKIE_DOMAINS = ['pole-emploi.fr', 'francetravail.fr']
+BROWSER_PROFILE_DIR = os.path.join(DATA_DIR, 'chrome-profile')   # None: profil temporaire
+
+# Pré-vérification HTTP des offres avant d'ouvrir un navigateur
+PREFLIGHT_ENABLED = True
+PREFLIGHT_TIMEOUT = 10
+PREFLIGHT_WORKERS = 8
+SAME_SITE_ALIASES = [    # Domaines d'un même site: une redirection entre eux ne rend pas l'offre externe
+    ['pole-emploi.fr', 'francetravail.fr'],
+]
+EXPIRED_OFFER_MARKERS = [    # Textes sans accents ni majuscules
+    "offre n'est plus disponible", "n'est plus en ligne", "offre expiree",
+    "offre a ete pourvue", "cette offre n'existe plus", "offre introuvable",
+]
+
+# Instrumentation: étapes chronométrées et compteurs (la console n'est qu'une des sorties)
+# Événements au fil de l'eau, pour le diagnostic (ex: os.path.join(DATA_DIR, 'telemetry.jsonl'); None: désactivé)
+TELEMETRY_JSONL_FILE = None
+TELEMETRY_JSONL_MAX_BYTES = 10 * 1024 * 1024   # Taille à partir de laquelle le journal JSONL est archivé
+TELEMETRY_JSONL_BACKUPS = 3                    # Archives conservées (telemetry.jsonl.1, .2...)
+TELEMETRY_SUMMARY_FILE = os.path.join(DATA_DIR, 'telemetry_summary.json')    # Résumé de la dernière exécution (None: désactivé)
+TELEMETRY_CONSOLE_SPANS = False   # Afficher dans la console chaque étape terminée et sa durée
 
 # Configuration des headers pour les requêtes
 DEFAULT_HEADERS = {
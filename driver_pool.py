@@ -0,0 +1,197 @@
+"""
+Pool de navigateurs Chrome préchauffés pour enchaîner les candidatures
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+from config import DRIVER_POOL_SIZE, DRIVER_MAX_USES, DRIVER_ACQUIRE_TIMEOUT, BROWSER_PROFILE_DIR
+from instrumentation import log
+from selenium_handler import SeleniumHandler
+
+
+class DriverPool:
+    """Garde N navigateurs lancés et les prête à chaque candidature"""
+
+    def __init__(self, size=DRIVER_POOL_SIZE, headless=False, max_uses=DRIVER_MAX_USES,
+                 profile_dir=BROWSER_PROFILE_DIR):
+        """
+        Initialise le pool (les navigateurs sont lancés par start ou à la demande)
+
+        Args:
+            size (int): Nombre maximum de navigateurs
+            headless (bool): Mode headless pour les navigateurs
+            max_uses (int): Nombre d'utilisations avant de relancer un navigateur
+            profile_dir (str): Dossier des profils Chrome persistants, un par
+                emplacement du pool (None: profils temporaires)
+        """
+        self.size = size
+        self.headless = headless
+        self.max_uses = max_uses
+        self.profile_dir = profile_dir
+        self._idle = queue.Queue()
+        self._uses = {}
+        # Emplacement de chaque navigateur: un profil ne sert qu'à un Chrome à la fois
+        self._slots = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {'launched': 0, 'reused': 0, 'recycled': 0, 'crashed': 0}
+
+    def start(self):
+        """
+        Lance les navigateurs manquants en parallèle pour qu'ils soient prêts
+
+        Returns:
+            int: Nombre de navigateurs disponibles
+        """
+        with self._lock:
+            missing = self.size - len(self._uses)
+        if missing > 0:
+            with ThreadPoolExecutor(max_workers=missing) as executor:
+                for handler in executor.map(lambda _: self._launch(), range(missing)):
+                    if handler:
+                        self._idle.put(handler)
+        return self._idle.qsize()
+
+    def _launch(self):
+        """Lance un navigateur et l'enregistre dans le pool (None en cas d'échec)"""
+        with self._lock:
+            if len(self._uses) >= self.size:
+                return None
+            slot = min(set(range(self.size)) - set(self._slots.values()))
+            profile = os.path.join(self.profile_dir, f"slot-{slot}") if self.profile_dir else None
+            handler = SeleniumHandler(headless=self.headless, profile_dir=profile)
+            self._uses[handler] = 0
+            self._slots[handler] = slot
+
+        if not handler.setup_driver():
+            with self._lock:
+                del self._uses[handler]
+                del self._slots[handler]
+            return None
+
+        with self._lock:
+            self.stats['launched'] += 1
+        return handler
+
+    def acquire(self, timeout=None):
+        """
+        Emprunte un navigateur prêt, en le lançant si le pool n'est pas plein
+
+        Args:
+            timeout (float): Attente maximale d'un navigateur libre (None: DRIVER_ACQUIRE_TIMEOUT)
+
+        Returns:
+            SeleniumHandler: Gestionnaire avec un navigateur initialisé
+
+        Raises:
+            RuntimeError: Si aucun navigateur n'a pu être obtenu
+        """
+        if self._closed:
+            raise RuntimeError("Pool de navigateurs fermé")
+
+        try:
+            handler = self._idle.get_nowait()
+        except queue.Empty:
+            handler = self._launch()
+            if handler is None:
+                with self._lock:
+                    in_service = len(self._uses)
+                if not in_service:
+                    # Lancement en échec et aucun navigateur en service: aucun ne sera jamais rendu
+                    raise RuntimeError("Impossible d'initialiser le navigateur")
+                try:
+                    handler = self._idle.get(timeout=DRIVER_ACQUIRE_TIMEOUT if timeout is None else timeout)
+                except queue.Empty:
+                    handler = None
+        if handler is None:
+            raise RuntimeError("Impossible d'obtenir un navigateur")
+
+        with self._lock:
+            if self._uses[handler]:
+                self.stats['reused'] += 1
+            self._uses[handler] += 1
+        return handler
+
+    def release(self, handler, crashed=False):
+        """
+        Rend un navigateur au pool après l'avoir réinitialisé
+
+        Le navigateur est relancé s'il a planté ou atteint max_uses.
+
+        Args:
+            handler (SeleniumHandler): Gestionnaire emprunté
+            crashed (bool): Le navigateur a rencontré une erreur WebDriver
+        """
+        with self._lock:
+            uses = self._uses.get(handler, 0)
+
+        recycle = crashed or self._closed or uses >= self.max_uses
+        if not recycle:
+            recycle = not handler.reset_session()
+            crashed = crashed or recycle
+
+        if not recycle:
+            self._idle.put(handler)
+            return
+
+        handler.close()
+        with self._lock:
+            self._uses.pop(handler, None)
+            self._slots.pop(handler, None)
+            self.stats['crashed' if crashed else 'recycled'] += 1
+
+        if not self._closed:
+            replacement = self._launch()
+            if replacement:
+                self._idle.put(replacement)
+
+    @contextmanager
+    def handler(self, timeout=None):
+        """
+        Emprunte un navigateur le temps d'un bloc with
+
+        Yields:
+            SeleniumHandler: Gestionnaire avec un navigateur initialisé
+        """
+        handler = self.acquire(timeout)
+        crashed = False
+        try:
+            yield handler
+        except WebDriverException:
+            crashed = True
+            raise
+        finally:
+            self.release(handler, crashed=crashed or not handler.is_alive())
+
+    def close(self):
+        """Ferme tous les navigateurs du pool"""
+        self._closed = True
+        while True:
+            try:
+                handler = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            handler.close()
+            with self._lock:
+                self._uses.pop(handler, None)
+                self._slots.pop(handler, None)
+
+        if self.stats['launched']:
+            log('INFO', f"♻️ Pool de navigateurs: {self.stats['launched']} lancés, "
+                f"{self.stats['reused']} réutilisations, {self.stats['recycled']} recyclés, "
+                f"{self.stats['crashed']} plantés")
+
+    def __enter__(self):
+        """Context manager entry"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
@@ -0,0 +1,220 @@
+"""
+Résolution du chromedriver local, sans passer par le réseau quand c'est possible
+
+Ordre de recherche:
+1. CHROMEDRIVER_PATH fixé dans la configuration
+2. Cache sur disque: version de Chrome installée -> chemin du chromedriver
+3. chromedriver présent dans le PATH, si sa version majeure correspond à Chrome
+4. webdriver-manager (téléchargement), dont le résultat est mis en cache
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+from config import CHROMEDRIVER_PATH, CHROMEDRIVER_CACHE_FILE
+from file_store import file_lock, read_json, write_json
+from instrumentation import log
+
+
+_VERSION_RE = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+
+# Emplacements usuels du binaire Chrome, par système
+CHROME_CANDIDATES = {
+    'win32': [
+        os.path.join(os.environ.get('PROGRAMFILES', r'C:\Program Files'), r'Google\Chrome\Application\chrome.exe'),
+        os.path.join(os.environ.get('PROGRAMFILES(X86)', r'C:\Program Files (x86)'), r'Google\Chrome\Application\chrome.exe'),
+        os.path.join(os.environ.get('LOCALAPPDATA', ''), r'Google\Chrome\Application\chrome.exe'),
+    ],
+    'darwin': [
+        '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+        '/Applications/Chromium.app/Contents/MacOS/Chromium',
+    ],
+    'linux': [
+        'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser',
+    ],
+}
+
+
+class DriverResolver:
+    """Trouve le chromedriver adapté au Chrome installé et mémorise le résultat"""
+
+    def __init__(self, cache_file=CHROMEDRIVER_CACHE_FILE, pinned_path=CHROMEDRIVER_PATH):
+        """
+        Initialise le résolveur
+
+        Args:
+            cache_file (str): Fichier JSON du cache (None pour ne rien persister)
+            pinned_path (str): Chemin imposé du chromedriver (prioritaire)
+        """
+        self.cache_file = cache_file
+        self.pinned_path = pinned_path
+        self._lock = threading.Lock()
+        self._cache = self._load_cache()
+        self.last_source = None
+        self.last_elapsed = 0.0
+
+    def _load_cache(self):
+        """Charge le cache, vide s'il est absent ou illisible"""
+        data = read_json(self.cache_file, None) if self.cache_file else None
+        if not isinstance(data, dict):
+            return {'chrome': {}, 'drivers': {}}
+        data.setdefault('chrome', {})
+        data.setdefault('drivers', {})
+        return data
+
+    def _save_cache(self, merge=True):
+        """
+        Enregistre le cache sur disque, sous verrou entre processus
+
+        Args:
+            merge (bool): Garder les chromedrivers enregistrés entre-temps par
+                d'autres processus (False pour écraser, après forget)
+        """
+        if not self.cache_file:
+            return
+        with file_lock(self.cache_file):
+            if merge:
+                on_disk = self._load_cache()
+                self._cache['drivers'] = {**on_disk['drivers'], **self._cache['drivers']}
+                if not self._cache['chrome']:
+                    self._cache['chrome'] = on_disk['chrome']
+            write_json(self.cache_file, self._cache)
+
+    @staticmethod
+    def find_chrome():
+        """
+        Cherche le binaire de Chrome installé
+
+        Returns:
+            str: Chemin du binaire, ou None s'il est introuvable
+        """
+        platform = 'win32' if sys.platform.startswith('win') else sys.platform
+        for candidate in CHROME_CANDIDATES.get(platform, CHROME_CANDIDATES['linux']):
+            path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+            if path and os.path.exists(path):
+                return path
+        return None
+
+    @staticmethod
+    def _run_version(binary):
+        """Version (a.b.c.d) affichée par binary --version, ou None"""
+        try:
+            output = subprocess.run(
+                [binary, '--version'], capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+        match = _VERSION_RE.search(output)
+        return match.group(0) if match else None
+
+    @staticmethod
+    def _windows_chrome_version():
+        """Version de Chrome lue dans le registre Windows, ou None"""
+        try:
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r'Software\Google\Chrome\BLBeacon') as key:
+                return winreg.QueryValueEx(key, 'version')[0]
+        except (ImportError, OSError):
+            return None
+
+    def chrome_version(self):
+        """
+        Version de Chrome installée, mise en cache tant que le binaire n'a pas changé
+
+        Returns:
+            str: Version complète (ex: '126.0.6478.126'), ou None
+        """
+        binary = self.find_chrome()
+        if not binary:
+            return None
+
+        mtime = os.path.getmtime(binary)
+        cached = self._cache['chrome']
+        if cached.get('binary') == binary and cached.get('mtime') == mtime and cached.get('version'):
+            return cached['version']
+
+        if sys.platform.startswith('win'):
+            # chrome.exe --version n'affiche rien sous Windows
+            version = self._windows_chrome_version()
+        else:
+            version = self._run_version(binary)
+        if version:
+            self._cache['chrome'] = {'binary': binary, 'mtime': mtime, 'version': version}
+            self._save_cache()
+        return version
+
+    @staticmethod
+    def _major(version):
+        return version.split('.')[0] if version else None
+
+    def resolve(self):
+        """
+        Renvoie le chemin du chromedriver à utiliser
+
+        Returns:
+            str: Chemin du chromedriver
+
+        Raises:
+            RuntimeError: Si aucun chromedriver n'a pu être trouvé ni téléchargé
+        """
+        start = time.perf_counter()
+        with self._lock:
+            path, source = self._resolve()
+        self.last_source = source
+        self.last_elapsed = time.perf_counter() - start
+        return path
+
+    def _resolve(self):
+        """Applique l'ordre de recherche; renvoie (chemin, source)"""
+        if self.pinned_path:
+            if os.path.exists(self.pinned_path):
+                return self.pinned_path, 'config'
+            log('WARNING', f"⚠️ CHROMEDRIVER_PATH introuvable: {self.pinned_path}")
+
+        major = self._major(self.chrome_version())
+        drivers = self._cache['drivers']
+
+        if major and os.path.exists(drivers.get(major, '')):
+            return drivers[major], 'cache'
+
+        local = shutil.which('chromedriver')
+        if local and (major is None or self._major(self._run_version(local)) == major):
+            if major:
+                drivers[major] = local
+                self._save_cache()
+            return local, 'path'
+
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+        except Exception as e:
+            raise RuntimeError(f"chromedriver introuvable et téléchargement impossible: {str(e)}")
+
+        if major:
+            drivers[major] = path
+            self._save_cache()
+        return path, 'webdriver-manager'
+
+    def forget(self):
+        """Oublie les chromedrivers mémorisés (ex: après un échec de lancement)"""
+        with self._lock:
+            self._cache['drivers'] = {}
+            self._save_cache(merge=False)
+
+
+_default_resolver = None
+_default_lock = threading.Lock()
+
+
+def get_resolver():
+    """Résolveur partagé par tous les SeleniumHandler du processus"""
+    global _default_resolver
+    with _default_lock:
+        if _default_resolver is None:
+            _default_resolver = DriverResolver()
+        return _default_resolver
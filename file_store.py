@@ -0,0 +1,108 @@
+"""
+Écriture sûre des fichiers JSON partagés entre processus
+
+Chaque écriture passe par un fichier temporaire unique du même dossier puis
+remplace le fichier d'un coup (os.replace): un lecteur voit l'ancienne ou la
+nouvelle version, jamais un mélange. Un verrou de fichier (fichier .lock à côté
+du fichier protégé) sérialise les lecture-fusion-écriture des processus qui
+partagent le même fichier (candidatures en parallèle, plusieurs lancements).
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import time
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+def _lock_file(f):
+    if os.name == 'nt':
+        # msvcrt.locking abandonne après ~10 s: réessayer jusqu'à obtenir le verrou
+        while True:
+            try:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                time.sleep(0.05)
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(f):
+    if os.name == 'nt':
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """
+    Verrou exclusif entre processus sur un fichier
+
+    Args:
+        path (str): Fichier protégé (le verrou est pris sur path + '.lock')
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path + '.lock', 'a+') as f:
+        _lock_file(f)
+        try:
+            yield
+        finally:
+            _unlock_file(f)
+
+
+def read_json(path, default=None):
+    """
+    Lit un fichier JSON
+
+    Args:
+        path (str): Fichier à lire
+        default: Valeur rendue si le fichier est absent ou illisible
+
+    Returns:
+        Contenu du fichier, ou default
+    """
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path, data):
+    """
+    Remplace un fichier JSON en une fois, via un fichier temporaire unique
+
+    Args:
+        path (str): Fichier à écrire
+        data: Contenu sérialisable en JSON
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory,
+                                     prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                     delete=False) as f:
+        tmp_path = f.name
+        try:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        except BaseException:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
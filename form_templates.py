@@ -0,0 +1,207 @@
+"""
+Modèles de formulaires appris par portail de recrutement
+
+Un modèle est identifié par le domaine du formulaire et une empreinte de sa
+structure (champs présents). Il mémorise les localisateurs qui ont servi lors
+d'une candidature réussie: informations personnelles, champs fichier du CV et
+de la lettre, champs complémentaires et bouton de soumission. Les candidatures
+suivantes sur le même portail rejouent le modèle au lieu de tout redécouvrir.
+"""
+
+import hashlib
+import os
+import threading
+
+from config import FORM_TEMPLATES_FILE
+from file_store import file_lock, read_json, write_json
+
+
+class FormTemplates:
+    """Cache persistant des modèles de formulaires, par domaine et empreinte"""
+
+    def __init__(self, path=None):
+        """
+        Initialise le cache
+
+        Args:
+            path (str): Fichier JSON de persistance (None pour rester en mémoire)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._templates = {}
+        # Modifications pas encore écrites, fusionnées avec le fichier à l'enregistrement
+        self._changed = set()
+        self._removed = set()
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'saved_ms': 0.0}
+        self.load()
+
+    def _read_file(self):
+        """Modèles du fichier (vide s'il est absent ou illisible)"""
+        data = read_json(self.path, {})
+        templates = data.get('templates') if isinstance(data, dict) else None
+        return templates if isinstance(templates, dict) else {}
+
+    def load(self):
+        """Charge les modèles enregistrés, si le fichier existe"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        templates = self._read_file()
+        with self._lock:
+            self._templates = templates
+
+    def save(self):
+        """
+        Enregistre les modèles sur disque
+
+        Le fichier est relu sous verrou et seules les modifications de ce
+        processus y sont reportées: les modèles appris en parallèle par
+        d'autres processus sont conservés (et repris en mémoire).
+        """
+        if not self.path:
+            return
+        with file_lock(self.path):
+            templates = self._read_file()
+            with self._lock:
+                for key in self._removed:
+                    templates.pop(key, None)
+                for key in self._changed:
+                    if key in self._templates:
+                        templates[key] = self._templates[key]
+                write_json(self.path, {'version': 1, 'templates': templates})
+                self._templates = templates
+                self._changed.clear()
+                self._removed.clear()
+
+    @staticmethod
+    def fingerprint(fields):
+        """
+        Empreinte de la structure d'un formulaire (indépendante des valeurs saisies)
+
+        Args:
+            fields (list): Champs décrits par SeleniumHandler._read_form_schema
+
+        Returns:
+            str: Empreinte courte
+        """
+        shape = sorted(f"{field['tag']}|{field['type']}|{field['id']}|{field['name']}" for field in fields)
+        return hashlib.sha1('\n'.join(shape).encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def _key(domain, fingerprint):
+        return f"{domain}#{fingerprint}"
+
+    def get(self, domain, fingerprint):
+        """
+        Modèle connu pour ce formulaire
+
+        Returns:
+            dict: Modèle (plan du formulaire, bouton de soumission, durées), ou None
+        """
+        with self._lock:
+            template = self._templates.get(self._key(domain, fingerprint))
+            if template is None:
+                self.stats['misses'] += 1
+            return template
+
+    @staticmethod
+    def locate(fields, locator):
+        """
+        Retrouve le champ désigné par un localisateur [attribut, valeur]
+
+        Returns:
+            dict: Champ trouvé, ou None
+        """
+        attribute, value = locator
+        for field in fields:
+            if field[attribute] == value:
+                return field
+        return None
+
+    def replay(self, template, fields):
+        """
+        Résout les localisateurs du modèle sur les champs de la page
+
+        Args:
+            template (dict): Modèle renvoyé par get
+            fields (list): Champs de la page
+
+        Returns:
+            dict: Plan avec les champs résolus, ou None si un localisateur ne correspond plus
+        """
+        plan = {'personal': {}, 'extras': {}, 'files': {}}
+        for group in plan:
+            for key, locator in template['plan'][group].items():
+                field = self.locate(fields, locator)
+                if field is None:
+                    return None
+                plan[group][key] = field
+        return plan
+
+    def learn(self, domain, fingerprint, plan, submit_selector, discovery_ms):
+        """
+        Enregistre les localisateurs d'une candidature réussie
+
+        Args:
+            domain (str): Domaine du formulaire
+            fingerprint (str): Empreinte du formulaire
+            plan (dict): Localisateurs par groupe ('personal', 'extras', 'files')
+            submit_selector (str): Sélecteur du bouton de soumission utilisé
+            discovery_ms (float): Temps de découverte du formulaire, en millisecondes
+        """
+        key = self._key(domain, fingerprint)
+        with self._lock:
+            self._changed.add(key)
+            self._removed.discard(key)
+            self._templates[key] = {
+                'domain': domain,
+                'plan': plan,
+                'submit': submit_selector,
+                'discovery_ms': discovery_ms,
+                'uses': 0,
+            }
+        self.save()
+
+    def record_hit(self, domain, fingerprint, replay_ms):
+        """Comptabilise un modèle rejoué avec succès et le temps gagné"""
+        key = self._key(domain, fingerprint)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is None:
+                return
+            self._changed.add(key)
+            template['uses'] += 1
+            self.stats['hits'] += 1
+            self.stats['saved_ms'] += max(0.0, template['discovery_ms'] - replay_ms)
+        self.save()
+
+    def forget(self, domain, fingerprint):
+        """Supprime un modèle qui ne correspond plus à la page"""
+        key = self._key(domain, fingerprint)
+        with self._lock:
+            self._removed.add(key)
+            self._changed.discard(key)
+            if self._templates.pop(key, None) is not None:
+                self.stats['stale'] += 1
+        self.save()
+
+    def format_report(self):
+        """Résumé lisible: taux de réutilisation et temps gagné"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses'] + self.stats['stale']
+            rate = self.stats['hits'] / lookups * 100 if lookups else 0.0
+            return (f"Modèles de formulaires: {self.stats['hits']}/{lookups} réutilisés ({rate:.0f}%), "
+                    f"{self.stats['stale']} obsolètes, {self.stats['saved_ms']:.0f} ms gagnées, "
+                    f"{len(self._templates)} portails connus")
+
+
+_default_templates = None
+_default_lock = threading.Lock()
+
+
+def get_form_templates():
+    """Modèles partagés par tous les SeleniumHandler du processus"""
+    global _default_templates
+    with _default_lock:
+        if _default_templates is None:
+            _default_templates = FormTemplates(FORM_TEMPLATES_FILE)
+        return _default_templates
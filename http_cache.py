@@ -0,0 +1,219 @@
+"""
+Cache HTTP persistant pour les pages de Pôle Emploi
+
+Les réponses sont stockées dans une base SQLite, indexées par URL et paramètres
+normalisés. Une réponse fraîche (TTL non expiré) est servie sans requête ; une
+réponse expirée est revalidée avec ETag / If-Modified-Since quand le serveur
+les fournit. La taille totale est bornée par éviction LRU.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+
+
+class HttpCache:
+    """Cache de réponses HTTP sur disque avec TTL, LRU et revalidation conditionnelle"""
+
+    def __init__(self, path, ttl=3600, max_bytes=200 * 1024 * 1024):
+        """
+        Initialise le cache
+
+        Args:
+            path (str): Fichier SQLite du cache
+            ttl (float): Durée de fraîcheur d'une réponse, en secondes
+            max_bytes (int): Taille maximale des corps de réponse stockés
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {
+            'hits': 0,               # Servies depuis le cache sans requête
+            'revalidated': 0,        # Confirmées par une réponse 304
+            'misses': 0,             # Téléchargées en entier
+            'evictions': 0,
+            'bytes_from_cache': 0,
+            'bytes_downloaded': 0,
+        }
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(url, params=None):
+        """
+        Clé de cache: URL complète avec les paramètres non vides triés
+
+        Args:
+            url (str): URL de la requête
+            params (dict): Paramètres de la requête
+
+        Returns:
+            str: Clé normalisée
+        """
+        items = sorted((k, str(v)) for k, v in (params or {}).items() if v not in (None, ''))
+        return requests.Request('GET', url, params=items).prepare().url
+
+    def get(self, key, ttl=None):
+        """
+        Cherche une réponse en cache
+
+        Args:
+            key (str): Clé de cache
+            ttl (float): Durée de fraîcheur à appliquer (par défaut, self.ttl)
+
+        Returns:
+            tuple: (requests.Response, bool fraîche) ou (None, False) si absente
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, False
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+        url, status, headers, body, stored_at = row
+        fresh = time.time() - stored_at < (self.ttl if ttl is None else ttl)
+        return self._build_response(url, status, json.loads(headers), body), fresh
+
+    def conditional_headers(self, key):
+        """
+        En-têtes de revalidation pour une réponse en cache
+
+        Args:
+            key (str): Clé de cache
+
+        Returns:
+            dict: If-None-Match / If-Modified-Since (vide sans validateurs)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        headers = {}
+        if row:
+            if row[0]:
+                headers['If-None-Match'] = row[0]
+            if row[1]:
+                headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def store(self, key, response):
+        """
+        Enregistre une réponse complète et applique l'éviction LRU
+
+        Une réponse plus grosse que max_bytes n'est pas stockée (elle évincerait
+        tout le cache sans y tenir) ; l'ancienne version est alors oubliée.
+
+        Args:
+            key (str): Clé de cache
+            response (requests.Response): Réponse 200 à stocker
+        """
+        body = response.content
+        now = time.time()
+        headers = {k: v for k, v in response.headers.items()
+                   if k.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')}
+        if response.encoding and 'charset' not in headers.get('Content-Type', ''):
+            headers['Content-Type'] = f"{headers.get('Content-Type', 'text/html')}; charset={response.encoding}"
+
+        with self._lock:
+            self.stats['misses'] += 1
+            self.stats['bytes_downloaded'] += len(body)
+            if len(body) > self.max_bytes:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, response.status_code, json.dumps(headers), body, len(body),
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now)
+            )
+            self._evict(keep=key)
+            self._conn.commit()
+
+    def refresh(self, key, cached, not_modified):
+        """
+        Prolonge la fraîcheur d'une réponse revalidée par un 304
+
+        Args:
+            key (str): Clé de cache
+            cached (requests.Response): Réponse en cache, servie à la place
+            not_modified (requests.Response): Réponse 304 du serveur
+        """
+        now = time.time()
+        with self._lock:
+            self.stats['revalidated'] += 1
+            self.stats['bytes_from_cache'] += len(cached.content)
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (now, now, not_modified.headers.get('ETag'), not_modified.headers.get('Last-Modified'), key)
+            )
+            self._conn.commit()
+
+    def record_hit(self, response):
+        """Comptabilise une réponse servie depuis le cache"""
+        with self._lock:
+            self.stats['hits'] += 1
+            self.stats['bytes_from_cache'] += len(response.content)
+
+    def _evict(self, keep=None):
+        """Supprime les réponses les moins récemment utilisées au-delà de max_bytes, sauf la clé keep"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses WHERE key != ? ORDER BY accessed_at ASC", (keep or '',)
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.stats['evictions'] += 1
+
+    @staticmethod
+    def _build_response(url, status, headers, body):
+        """Reconstruit un objet requests.Response à partir d'une entrée du cache"""
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response.headers.update(headers)
+        response._content = body
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self):
+        """Ferme la base du cache"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,389 @@
+"""
+Instrumentation: étapes chronométrées imbriquées, compteurs et sorties
+
+Chaque étape (requête, analyse, lancement du navigateur, remplissage...) est
+mesurée dans un « span » qui s'imbrique dans l'étape en cours du thread. Les
+compteurs (requêtes, octets, succès du cache, sélecteurs sans résultat)
+s'additionnent au fil de l'exécution. Messages, étapes et compteurs sont
+transmis à des sorties: la console colorée n'en est qu'une, à côté du journal
+JSONL (sur demande, archivé au-delà d'une taille maximale); un résumé (tableau
+et fichier JSON) est produit en fin d'exécution.
+"""
+
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from config import (
+    TELEMETRY_JSONL_FILE, TELEMETRY_JSONL_MAX_BYTES, TELEMETRY_JSONL_BACKUPS, TELEMETRY_SUMMARY_FILE,
+    TELEMETRY_CONSOLE_SPANS, COLORS
+)
+from file_store import write_json
+
+
+class Span:
+    """Étape en cours de mesure"""
+
+    __slots__ = ('id', 'name', 'path', 'parent', 'attrs', 'start', 'ms', 'status')
+
+    def __init__(self, span_id, name, parent, attrs):
+        self.id = span_id
+        self.name = name
+        self.path = f"{parent.path}/{name}" if parent else name
+        self.parent = parent.id if parent else None
+        self.attrs = attrs
+        self.start = time.time()
+        self.ms = 0.0
+        self.status = 'ok'
+
+    def set(self, **attrs):
+        """Ajoute des attributs à l'étape (statut HTTP, octets, règle trouvée...)"""
+        self.attrs.update(attrs)
+
+    def to_dict(self):
+        return {'id': self.id, 'name': self.name, 'path': self.path, 'parent': self.parent,
+                'start': self.start, 'ms': self.ms, 'status': self.status, 'attrs': self.attrs}
+
+
+class ConsoleSink:
+    """Sortie console: messages colorés, étapes terminées (optionnel) et résumé final"""
+
+    def __init__(self, spans=TELEMETRY_CONSOLE_SPANS, summary=True):
+        """
+        Initialise la sortie console
+
+        Args:
+            spans (bool): Afficher chaque étape terminée avec sa durée
+            summary (bool): Afficher le tableau récapitulatif à la fermeture
+        """
+        self.spans = spans
+        self.summary = summary
+
+    def on_log(self, level, message, span):
+        if level:
+            print(f"{COLORS[level]}{message}{COLORS['END']}")
+        else:
+            print(message)
+
+    def on_span(self, span):
+        if self.spans:
+            color = COLORS['INFO'] if span.status == 'ok' else COLORS['WARNING']
+            print(f"{color}⏱️ {span.path}: {span.ms:.1f} ms{COLORS['END']}")
+
+    def on_close(self, instrumentation):
+        if self.summary and instrumentation.has_spans():
+            print(f"\n{COLORS['HEADER']}{instrumentation.format_summary()}{COLORS['END']}")
+
+
+def rotate_jsonl(path, max_bytes, backups):
+    """
+    Archive un journal JSONL trop gros (path -> path.1 -> path.2...)
+
+    Args:
+        path (str): Journal à archiver s'il atteint max_bytes
+        max_bytes (int): Taille déclenchant l'archivage
+        backups (int): Archives conservées (0: le journal est supprimé)
+    """
+    try:
+        # Un autre processus a pu archiver le fichier entre-temps
+        if os.path.getsize(path) < max_bytes:
+            return
+        if backups <= 0:
+            os.remove(path)
+            return
+        for index in range(backups - 1, 0, -1):
+            if os.path.exists(f"{path}.{index}"):
+                os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+        os.replace(path, f"{path}.1")
+    except OSError:
+        pass  # Fichier absent, ou encore ouvert par un autre processus (Windows): réessayé plus tard
+
+
+class JsonlSink:
+    """Sortie JSONL: un événement par ligne (message, étape terminée, compteurs finaux)"""
+
+    def __init__(self, path, run_id=None, max_bytes=TELEMETRY_JSONL_MAX_BYTES, backups=TELEMETRY_JSONL_BACKUPS):
+        """
+        Initialise le journal
+
+        Args:
+            path (str): Fichier JSONL (ouvert en ajout, une ligne écrite à la fois)
+            run_id (str): Identifiant de l'exécution, repris dans chaque événement
+            max_bytes (int): Taille à partir de laquelle le fichier est archivé (None: sans limite)
+            backups (int): Archives conservées (path.1 la plus récente)
+        """
+        self.path = path
+        self.run_id = run_id
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _rotate(self):
+        """Archive le journal trop gros (path -> path.1 -> path.2...), puis repart d'un fichier vide"""
+        self._file.close()
+        self._file = None
+        rotate_jsonl(self.path, self.max_bytes, self.backups)
+
+    def _write(self, event):
+        event['run'] = self.run_id
+        line = json.dumps(event, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            if self._file is not None and self.max_bytes and self._file.tell() >= self.max_bytes:
+                self._rotate()
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # Tampon par ligne: les processus qui écrivent en parallèle n'entremêlent pas leurs lignes
+                self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+            self._file.write(line)
+
+    def on_log(self, level, message, span):
+        self._write({'type': 'log', 'time': time.time(), 'level': level, 'message': message,
+                     'span': span.id if span else None})
+
+    def on_span(self, span):
+        event = span.to_dict()
+        event['type'] = 'span'
+        self._write(event)
+
+    def on_close(self, instrumentation):
+        self._write({'type': 'summary', 'time': time.time(), 'counters': dict(instrumentation.counters),
+                     'spans': instrumentation.summary()})
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Instrumentation:
+    """Étapes imbriquées et compteurs d'une exécution, transmis à des sorties"""
+
+    def __init__(self, sinks=None, run_id=None):
+        """
+        Initialise l'instrumentation
+
+        Args:
+            sinks (list): Sorties (par défaut, la console seule)
+            run_id (str): Identifiant de l'exécution (par défaut, date et PID)
+        """
+        self.run_id = run_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.sinks = list(sinks) if sinks is not None else [ConsoleSink()]
+        for sink in self.sinks:
+            if isinstance(sink, JsonlSink) and sink.run_id is None:
+                sink.run_id = self.run_id
+        self.started = time.time()
+        self.counters = {}
+        self._durations = {}
+        self._errors = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self):
+        """Étape en cours dans ce thread (None hors de toute étape)"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name, parent=None, **attrs):
+        """
+        Mesure une étape, imbriquée dans l'étape en cours du thread
+
+        Args:
+            name (str): Nom de l'étape ('request', 'parse', 'navigate'...)
+            parent (Span): Étape parente (par défaut, l'étape en cours du thread)
+            **attrs: Attributs de l'étape
+
+        Yields:
+            Span: L'étape, complétable avec Span.set
+        """
+        span = Span(next(self._ids), name, parent or self.current(), attrs)
+        stack = self._stack()
+        stack.append(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span.status = 'error'
+            span.attrs.setdefault('error', f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            span.ms = (time.perf_counter() - start) * 1000
+            # remove plutôt que pop: une étape ouverte dans un générateur peut se fermer dans le désordre
+            stack.remove(span)
+            self._finish(span)
+
+    def _finish(self, span):
+        with self._lock:
+            self._durations.setdefault(span.path, []).append(span.ms)
+            if span.status != 'ok':
+                self._errors[span.path] = self._errors.get(span.path, 0) + 1
+        for sink in self.sinks:
+            sink.on_span(span)
+
+    def bind(self, function):
+        """
+        Rattache à l'étape en cours les étapes d'une fonction exécutée dans un autre thread
+
+        Returns:
+            callable: Fonction à confier au pool de threads
+        """
+        parent = self.current()
+        if parent is None:
+            return function
+
+        def bound(*args, **kwargs):
+            stack = self._stack()
+            stack.append(parent)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stack.remove(parent)
+        return bound
+
+    def count(self, name, value=1):
+        """Ajoute value au compteur name"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def log(self, level, message):
+        """
+        Transmet un message aux sorties
+
+        Args:
+            level (str): Clé de COLORS ('INFO', 'SUCCESS', 'WARNING', 'ERROR'...), None sans couleur
+            message (str): Message
+        """
+        span = self.current()
+        for sink in self.sinks:
+            sink.on_log(level, message, span)
+
+    def has_spans(self):
+        with self._lock:
+            return bool(self._durations)
+
+    def summary(self):
+        """
+        Durées agrégées par chemin d'étapes ('search/request', 'apply/fill'...)
+
+        Returns:
+            list: Une ligne (dict) par chemin: appels, erreurs, total, moyenne, p90 et max en ms
+        """
+        with self._lock:
+            durations = {path: sorted(values) for path, values in self._durations.items()}
+            errors = dict(self._errors)
+        rows = []
+        for path, values in sorted(durations.items()):
+            total = sum(values)
+            rows.append({
+                'path': path,
+                'calls': len(values),
+                'errors': errors.get(path, 0),
+                'total_ms': total,
+                'avg_ms': total / len(values),
+                'p90_ms': values[max(1, int(math.ceil(0.9 * len(values)))) - 1],
+                'max_ms': values[-1],
+            })
+        return rows
+
+    def format_summary(self):
+        """Tableau récapitulatif: étapes (indentées selon leur imbrication) puis compteurs"""
+        lines = [f"{'Étape':<34} {'Appels':>7} {'Erreurs':>8} {'Total ms':>10} {'Moy. ms':>9} "
+                 f"{'p90 ms':>9} {'Max ms':>9}"]
+        for row in self.summary():
+            depth = row['path'].count('/')
+            name = '  ' * depth + row['path'].rsplit('/', 1)[-1]
+            lines.append(f"{name:<34} {row['calls']:>7} {row['errors']:>8} {row['total_ms']:>10.1f} "
+                         f"{row['avg_ms']:>9.2f} {row['p90_ms']:>9.2f} {row['max_ms']:>9.2f}")
+        with self._lock:
+            counters = sorted(self.counters.items())
+        if counters:
+            lines.append('')
+            lines.append(f"{'Compteur':<34} {'Valeur':>10}")
+            for name, value in counters:
+                lines.append(f"{name:<34} {value:>10}")
+        return '\n'.join(lines)
+
+    def export(self, path):
+        """
+        Enregistre le résumé de l'exécution en JSON
+
+        Args:
+            path (str): Fichier JSON (remplacé)
+        """
+        with self._lock:
+            counters = dict(self.counters)
+        write_json(path, {'run': self.run_id, 'started': self.started, 'ended': time.time(),
+                          'counters': counters, 'spans': self.summary()})
+
+    def close(self, export_path=None):
+        """
+        Termine l'exécution: résumé transmis aux sorties, puis exporté en JSON
+
+        Args:
+            export_path (str): Fichier du résumé JSON (None: pas d'export)
+        """
+        for sink in self.sinks:
+            sink.on_close(self)
+        if export_path and self.has_spans():
+            try:
+                self.export(export_path)
+            except OSError as e:
+                self.log('WARNING', f"⚠️ Résumé d'instrumentation non enregistré: {str(e)}")
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_instrumentation():
+    """Instrumentation partagée du processus (console, et journal JSONL si TELEMETRY_JSONL_FILE)"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            sinks = [ConsoleSink()]
+            if TELEMETRY_JSONL_FILE:
+                sinks.append(JsonlSink(TELEMETRY_JSONL_FILE))
+            _default = Instrumentation(sinks)
+        return _default
+
+
+def close_instrumentation():
+    """Ferme l'instrumentation partagée (résumé affiché et exporté vers TELEMETRY_SUMMARY_FILE)"""
+    global _default
+    with _default_lock:
+        instrumentation, _default = _default, None
+    if instrumentation is not None:
+        instrumentation.close(TELEMETRY_SUMMARY_FILE)
+
+
+def span(name, **attrs):
+    """Mesure une étape avec l'instrumentation partagée (voir Instrumentation.span)"""
+    return get_instrumentation().span(name, **attrs)
+
+
+def count(name, value=1):
+    """Incrémente un compteur de l'instrumentation partagée"""
+    get_instrumentation().count(name, value)
+
+
+def log(level, message):
+    """Transmet un message aux sorties de l'instrumentation partagée (console colorée comprise)"""
+    get_instrumentation().log(level, message)
+
+
+def bind(function):
+    """Rattache une fonction exécutée dans un autre thread à l'étape en cours"""
+    return get_instrumentation().bind(function)
@@ -0,0 +1,161 @@
+"""
+Index inversé des offres pour un filtrage rapide et insensible aux accents
+"""
+
+import hashlib
+import re
+import unicodedata
+
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# Champs interrogés par chaque critère de PoleEmploiScraper.filter_jobs
+FILTER_FIELDS = {
+    'keywords': ('title', 'description', 'company'),
+    'contract_type': ('contract_type',),
+    'location': ('location',),
+}
+_INDEXED_FIELDS = sorted({field for group in FILTER_FIELDS.values() for field in group})
+
+
+def normalize_text(text):
+    """
+    Normalise un texte pour la recherche: minuscules et sans accents
+
+    Args:
+        text (str): Texte à normaliser
+
+    Returns:
+        str: Texte normalisé ("Développeur" -> "developpeur")
+    """
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class JobIndex:
+    """Index des offres: tokens normalisés et n-grammes par champ"""
+
+    def __init__(self, jobs, n=3):
+        """
+        Construit l'index
+
+        Args:
+            jobs (list): Offres à indexer (l'ordre est conservé dans les résultats)
+            n (int): Taille des n-grammes utilisés pour les recherches par sous-chaîne
+        """
+        self.jobs = jobs
+        self.size = len(jobs)
+        self.n = n
+        self.fingerprint = self.content_fingerprint(jobs)
+        self._texts = {}
+        self._tokens = {}
+        self._ngrams = {}
+
+        for field in _INDEXED_FIELDS:
+            texts = [normalize_text(job.get(field, '')) for job in jobs]
+            tokens = {}
+            ngrams = {}
+            for job_id, text in enumerate(texts):
+                for token in set(_TOKEN_RE.findall(text)):
+                    tokens.setdefault(token, set()).add(job_id)
+                for gram in {text[i:i + n] for i in range(len(text) - n + 1)}:
+                    ngrams.setdefault(gram, set()).add(job_id)
+            self._texts[field] = texts
+            self._tokens[field] = tokens
+            self._ngrams[field] = ngrams
+
+    @staticmethod
+    def content_fingerprint(jobs):
+        """
+        Empreinte des offres et de leurs champs indexés
+
+        Toute offre remplacée ou modifiée sur place (détails ajoutés par
+        enrich_jobs...) dont un champ indexé change, change l'empreinte.
+
+        Args:
+            jobs (list): Offres
+
+        Returns:
+            str: Empreinte SHA-1
+        """
+        digest = hashlib.sha1()
+        for job in jobs:
+            for field in _INDEXED_FIELDS:
+                digest.update(f"{job.get(field) or ''}\0".encode('utf-8'))
+        return digest.hexdigest()
+
+    def is_current(self, jobs):
+        """Vérifie que l'index correspond toujours à cette liste d'offres et à leur contenu"""
+        return (jobs is self.jobs and len(jobs) == self.size
+                and self.content_fingerprint(jobs) == self.fingerprint)
+
+    def search(self, field, query):
+        """
+        Offres dont le champ contient la requête (sous-chaîne, sans accents)
+
+        Args:
+            field (str): Champ interrogé
+            query (str): Texte recherché
+
+        Returns:
+            set: Positions des offres correspondantes
+        """
+        query = normalize_text(query)
+        texts = self._texts[field]
+        if not query:
+            return set(range(self.size))
+
+        if len(query) >= self.n:
+            # Intersection des n-grammes, de la liste la plus courte à la plus longue
+            ngrams = self._ngrams[field]
+            postings = []
+            for gram in {query[i:i + self.n] for i in range(len(query) - self.n + 1)}:
+                posting = ngrams.get(gram)
+                if not posting:
+                    return set()
+                postings.append(posting)
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates &= posting
+                if not candidates:
+                    return candidates
+        elif _TOKEN_RE.fullmatch(query):
+            # Requête courte: parcourir le vocabulaire plutôt que les offres
+            candidates = set()
+            for token, posting in self._tokens[field].items():
+                if query in token:
+                    candidates |= posting
+            return candidates
+        else:
+            candidates = range(self.size)
+
+        # Vérifier la sous-chaîne exacte sur les candidats
+        return {job_id for job_id in candidates if query in texts[job_id]}
+
+    def filter(self, filters):
+        """
+        Applique les critères de PoleEmploiScraper.filter_jobs par intersection d'ensembles
+
+        Args:
+            filters (dict): Critères (keywords, contract_type, location)
+
+        Returns:
+            list: Offres correspondantes, dans l'ordre d'origine
+        """
+        selected = None
+        for criterion, fields in FILTER_FIELDS.items():
+            query = filters.get(criterion)
+            if not query or (criterion == 'contract_type' and query == 'TOUS'):
+                continue
+
+            matches = set()
+            for field in fields:
+                matches |= self.search(field, query)
+            selected = matches if selected is None else selected & matches
+            if not selected:
+                return []
+
+        if selected is None:
+            return list(self.jobs)
+        return [self.jobs[job_id] for job_id in sorted(selected)]
@@ -0,0 +1,238 @@
+"""
+Stockage persistant des offres d'emploi dans une base SQLite
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from pole_emploi_scraper import canonical_offer_id
+from job_index import normalize_text
+
+
+# Colonnes d'une offre, dans l'ordre des dictionnaires renvoyés par le scraper
+JOB_FIELDS = ('title', 'company', 'location', 'contract_type', 'date', 'description', 'url', 'source')
+
+# Colonnes normalisées (minuscules, sans accents) pour les recherches par sous-chaîne
+SEARCH_FIELDS = ('title', 'company', 'location', 'contract_type', 'description')
+
+
+class JobStore:
+    """Historique des offres, dédupliquées par identifiant canonique"""
+
+    def __init__(self, path):
+        """
+        Ouvre (ou crée) la base des offres
+
+        Args:
+            path (str): Fichier SQLite
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    offer_id TEXT PRIMARY KEY,
+                    title TEXT, company TEXT, location TEXT, contract_type TEXT,
+                    date TEXT, description TEXT, url TEXT, source TEXT,
+                    details TEXT,
+                    title_lc TEXT, company_lc TEXT, location_lc TEXT,
+                    contract_type_lc TEXT, description_lc TEXT,
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL
+                )
+            """)
+            for column in ('title', 'company', 'location', 'contract_type', 'first_seen'):
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_jobs_{column} ON jobs ({column})")
+            # Offres déjà renvoyées par chaque recherche (mode incrémental)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS query_seen (
+                    query_key TEXT NOT NULL,
+                    offer_id TEXT NOT NULL,
+                    first_seen REAL NOT NULL,
+                    PRIMARY KEY (query_key, offer_id)
+                ) WITHOUT ROWID
+            """)
+
+    def upsert_jobs(self, jobs):
+        """
+        Insère ou met à jour des offres dans une seule transaction
+
+        Args:
+            jobs (list): Offres telles que renvoyées par le scraper
+
+        Returns:
+            set: Identifiants des offres vues pour la première fois
+        """
+        now = time.time()
+        rows = {}
+        for job in jobs:
+            offer_id = job.get('offer_id') or canonical_offer_id(
+                job.get('url', ''), job.get('title', ''), job.get('company', ''), job.get('location', '')
+            )
+            rows.setdefault(offer_id, job)
+
+        with self._lock, self._conn:
+            known = self._known_ids(rows)
+            self._conn.executemany(
+                f"""
+                INSERT INTO jobs (offer_id, {', '.join(JOB_FIELDS)}, details,
+                                  {', '.join(f + '_lc' for f in SEARCH_FIELDS)}, first_seen, last_seen)
+                VALUES ({', '.join('?' * (len(JOB_FIELDS) + len(SEARCH_FIELDS) + 4))})
+                ON CONFLICT(offer_id) DO UPDATE SET
+                    {', '.join(f'{f} = excluded.{f}' for f in JOB_FIELDS)},
+                    details = COALESCE(excluded.details, jobs.details),
+                    {', '.join(f'{f}_lc = excluded.{f}_lc' for f in SEARCH_FIELDS)},
+                    last_seen = excluded.last_seen
+                """,
+                [
+                    (offer_id,)
+                    + tuple(job.get(f, '') for f in JOB_FIELDS)
+                    + (json.dumps(job['details'], ensure_ascii=False) if job.get('details') else None,)
+                    + tuple(normalize_text(job.get(f)) for f in SEARCH_FIELDS)
+                    + (now, now)
+                    for offer_id, job in rows.items()
+                ]
+            )
+
+        return set(rows) - known
+
+    def _known_ids(self, offer_ids):
+        """Identifiants déjà présents dans la base parmi ceux donnés"""
+        known = set()
+        offer_ids = list(offer_ids)
+        for i in range(0, len(offer_ids), 500):
+            chunk = offer_ids[i:i + 500]
+            known.update(row[0] for row in self._conn.execute(
+                f"SELECT offer_id FROM jobs WHERE offer_id IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+        return known
+
+    def known_ids(self, offer_ids):
+        """
+        Filtre les identifiants déjà enregistrés
+
+        Args:
+            offer_ids (iterable): Identifiants canoniques
+
+        Returns:
+            set: Identifiants déjà présents dans la base
+        """
+        with self._lock:
+            return self._known_ids(offer_ids)
+
+    @staticmethod
+    def query_key(keywords, location, contract_type):
+        """
+        Clé normalisée d'une recherche (mots-clés, localisation, type de contrat)
+
+        Returns:
+            str: Clé de la recherche
+        """
+        return '|'.join(' '.join(normalize_text(value).split()) for value in (keywords, location, contract_type))
+
+    def seen_for_query(self, query_key, offer_ids):
+        """
+        Filtre les offres déjà renvoyées par une recherche
+
+        Args:
+            query_key (str): Clé de la recherche (voir query_key)
+            offer_ids (iterable): Identifiants canoniques
+
+        Returns:
+            set: Identifiants déjà vus pour cette recherche
+        """
+        offer_ids = list(offer_ids)
+        seen = set()
+        with self._lock:
+            for i in range(0, len(offer_ids), 500):
+                chunk = offer_ids[i:i + 500]
+                seen.update(row[0] for row in self._conn.execute(
+                    f"SELECT offer_id FROM query_seen WHERE query_key = ? "
+                    f"AND offer_id IN ({', '.join('?' * len(chunk))})", [query_key] + chunk
+                ))
+        return seen
+
+    def mark_seen(self, query_key, offer_ids):
+        """
+        Enregistre des offres comme vues pour une recherche
+
+        Args:
+            query_key (str): Clé de la recherche
+            offer_ids (iterable): Identifiants canoniques
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO query_seen (query_key, offer_id, first_seen) VALUES (?, ?, ?)",
+                [(query_key, offer_id, now) for offer_id in offer_ids]
+            )
+
+    def query(self, filters=None, limit=None):
+        """
+        Recherche des offres avec les mêmes critères que PoleEmploiScraper.filter_jobs
+
+        Args:
+            filters (dict): Critères (keywords, contract_type, location)
+            limit (int): Nombre maximum d'offres à renvoyer
+
+        Returns:
+            list: Offres, les plus récemment découvertes en premier
+        """
+        filters = filters or {}
+        clauses = []
+        params = []
+
+        if filters.get('keywords'):
+            keywords = normalize_text(filters['keywords'])
+            clauses.append("(instr(title_lc, ?) > 0 OR instr(description_lc, ?) > 0 OR instr(company_lc, ?) > 0)")
+            params.extend([keywords] * 3)
+
+        if filters.get('contract_type') and filters['contract_type'] != 'TOUS':
+            clauses.append("instr(contract_type_lc, ?) > 0")
+            params.append(normalize_text(filters['contract_type']))
+
+        if filters.get('location'):
+            clauses.append("instr(location_lc, ?) > 0")
+            params.append(normalize_text(filters['location']))
+
+        sql = f"SELECT offer_id, {', '.join(JOB_FIELDS)}, details, first_seen, last_seen FROM jobs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY first_seen DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    @staticmethod
+    def _row_to_job(row):
+        """Convertit une ligne de la base en dictionnaire d'offre"""
+        job = {field: row[field] for field in JOB_FIELDS}
+        job['offer_id'] = row['offer_id']
+        job['first_seen'] = row['first_seen']
+        job['last_seen'] = row['last_seen']
+        if row['details']:
+            job['details'] = json.loads(row['details'])
+        return job
+
+    def count(self):
+        """Nombre d'offres enregistrées"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        """Ferme la base"""
+        with self._lock:
+            self._conn.close()
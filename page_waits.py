@@ -0,0 +1,264 @@
+"""
+Attentes conditionnelles pour le parcours de candidature Selenium
+
+Remplace les pauses fixes: chaque étape attend un événement de la page
+(DOM prêt, formulaire présent, changement d'URL, réseau inactif, message de
+succès) et s'arrête dès qu'il survient. La durée réelle de chaque étape est
+enregistrée.
+"""
+
+import time
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from config import SELENIUM_WAIT_TIME, WAIT_POLL_INTERVAL, NETWORK_IDLE_MS
+from instrumentation import span, log
+
+
+# Nombre de formulaires et champs de saisie visibles
+_FORM_PRESENT_JS = """
+var fields = document.querySelectorAll(
+    'form, input[type=file], input[type=email], input[type=text], textarea');
+var visible = 0;
+for (var i = 0; i < fields.length; i++) {
+    var rect = fields[i].getBoundingClientRect();
+    if (rect.width > 0 && rect.height > 0) visible++;
+}
+return visible;
+"""
+
+# Nombre de ressources chargées, et requêtes fetch/XHR en cours (compteur injecté)
+_NETWORK_STATE_JS = """
+if (!window.__boostPending) {
+    window.__boostPending = {count: 0};
+    var pending = window.__boostPending;
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        pending.count++;
+        this.addEventListener('loadend', function() { pending.count--; });
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function() {
+            pending.count++;
+            return fetch.apply(this, arguments).finally(function() { pending.count--; });
+        };
+    }
+}
+return [performance.getEntriesByType('resource').length, window.__boostPending.count,
+        document.readyState];
+"""
+
+# Vérification dans le navigateur: textes visibles, sélecteurs CSS ou motifs d'URL.
+# Renvoie seulement les règles qui ont correspondu (la première, ou toutes si
+# arguments[3]), jamais le contenu de la page.
+_PAGE_CHECK_JS = """
+var indicators = arguments[0], selectors = arguments[1], urlPatterns = arguments[2], all = arguments[3];
+var matches = [];
+function found(rule) { matches.push(rule); return !all; }
+for (var i = 0; i < urlPatterns.length; i++) {
+    try {
+        if (new RegExp(urlPatterns[i], 'i').test(location.href) && found('url:' + urlPatterns[i])) return matches;
+    } catch (e) {}
+}
+for (var j = 0; j < selectors.length; j++) {
+    try {
+        if (document.querySelector(selectors[j]) && found('css:' + selectors[j])) return matches;
+    } catch (e) {}
+}
+// innerText: texte affiché seulement (ni scripts, ni styles, ni éléments masqués)
+var body = document.body;
+var text = ((document.title || '') + ' ' + (body ? body.innerText : '')).toLowerCase();
+for (var k = 0; k < indicators.length; k++) {
+    if (text.indexOf(indicators[k]) !== -1 && found('texte:' + indicators[k])) return matches;
+}
+return matches;
+"""
+
+
+def page_check(driver, indicators=(), selectors=(), url_patterns=()):
+    """
+    Vérifie une page sans rapatrier son contenu
+
+    Args:
+        driver (WebDriver): Navigateur piloté
+        indicators (list): Textes recherchés (en minuscules)
+        selectors (list): Sélecteurs CSS dont la présence suffit
+        url_patterns (list): Expressions régulières testées sur l'URL courante
+
+    Returns:
+        tuple: (bool trouvé, règle qui a correspondu ou None)
+    """
+    matches = driver.execute_script(
+        _PAGE_CHECK_JS, [i.lower() for i in indicators], list(selectors), list(url_patterns), False
+    ) or []
+    return bool(matches), matches[0] if matches else None
+
+
+def page_matches(driver, indicators=(), selectors=(), url_patterns=()):
+    """
+    Toutes les règles de page_check qui correspondent à la page
+
+    Returns:
+        set: Règles ('texte:...', 'css:...', 'url:...')
+    """
+    return set(driver.execute_script(
+        _PAGE_CHECK_JS, [i.lower() for i in indicators], list(selectors), list(url_patterns), True
+    ) or [])
+
+
+class PageWaiter:
+    """Attentes par condition, avec mesure de la durée de chaque étape"""
+
+    def __init__(self, driver, timeout=SELENIUM_WAIT_TIME, poll=WAIT_POLL_INTERVAL, verbose=True):
+        """
+        Initialise les attentes
+
+        Args:
+            driver (WebDriver): Navigateur piloté
+            timeout (float): Attente maximale par étape, en secondes
+            poll (float): Intervalle entre deux vérifications, en secondes
+            verbose (bool): Afficher la durée de chaque étape
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.poll = poll
+        self.verbose = verbose
+        self.timings = []
+        # États du document acceptés par dom_ready ('interactive' suffit en chargement eager/none)
+        self.ready_states = ('complete',)
+
+    def until(self, step, condition, timeout=None):
+        """
+        Attend qu'une condition soit vraie et enregistre la durée de l'étape
+
+        Args:
+            step (str): Nom de l'étape (pour le journal)
+            condition (callable): Fonction driver -> valeur (fausse tant qu'il faut attendre)
+            timeout (float): Attente maximale (par défaut, self.timeout)
+
+        Returns:
+            La valeur renvoyée par la condition, ou None à l'expiration
+        """
+        with span('wait', step=step) as wait_span:
+            start = time.perf_counter()
+            wait = WebDriverWait(self.driver, self.timeout if timeout is None else timeout,
+                                 poll_frequency=self.poll, ignored_exceptions=(WebDriverException,))
+            try:
+                result = wait.until(condition)
+            except TimeoutException:
+                result = None
+                wait_span.status = 'timeout'
+            elapsed = time.perf_counter() - start
+        self.timings.append({'step': step, 'ms': elapsed * 1000, 'ok': result is not None})
+
+        if self.verbose:
+            status = '' if result is not None else ' (délai dépassé)'
+            log('INFO' if result is not None else 'WARNING', f"⏱️ {step}: {elapsed * 1000:.0f} ms{status}")
+        return result
+
+    def dom_ready(self, step='DOM prêt', timeout=None):
+        """Attend que le document atteigne un des états de ready_states"""
+        return self.until(
+            step, lambda d: d.execute_script("return document.readyState") in self.ready_states or None, timeout
+        )
+
+    def form_present(self, step='Formulaire présent', timeout=None):
+        """Attend qu'un formulaire ou un champ de saisie soit visible"""
+        return self.until(step, lambda d: d.execute_script(_FORM_PRESENT_JS) or None, timeout)
+
+    def visible_form_fields(self):
+        """Nombre de formulaires et champs de saisie visibles (relevé avant un clic)"""
+        return self.driver.execute_script(_FORM_PRESENT_JS) or 0
+
+    def watch_network(self):
+        """Installe le compteur de requêtes fetch/XHR avant une action (voir network_idle)"""
+        self.driver.execute_script(_NETWORK_STATE_JS)
+
+    def url_change(self, old_url, step='Changement de page', timeout=None):
+        """Attend que l'URL courante diffère de old_url"""
+        return self.until(step, lambda d: d.current_url if d.current_url != old_url else None, timeout)
+
+    def page_change(self, old_url, old_handles, step='Réaction au clic', timeout=None, fields_before=0):
+        """
+        Attend la réaction à un clic: nouvelle URL, nouvel onglet (ou fenêtre) ou formulaire affiché
+
+        Args:
+            old_url (str): URL avant le clic
+            old_handles (list): Onglets et fenêtres ouverts avant le clic
+            fields_before (int): visible_form_fields() avant le clic; seul un
+                formulaire apparu depuis compte (pas un champ de recherche déjà là)
+
+        Returns:
+            str: 'url', 'window' (à suivre avec switch_to.window) ou 'form' selon
+                l'événement observé, None à l'expiration
+        """
+        def changed(driver):
+            if len(driver.window_handles) > len(old_handles):
+                return 'window'
+            if driver.current_url != old_url:
+                return 'url'
+            if (driver.execute_script(_FORM_PRESENT_JS) or 0) > fields_before:
+                return 'form'
+            return None
+        return self.until(step, changed, timeout)
+
+    def network_idle(self, step='Réseau inactif', idle_ms=NETWORK_IDLE_MS, timeout=None):
+        """
+        Attend qu'aucune ressource ni requête fetch/XHR n'ait démarré pendant idle_ms
+
+        Args:
+            idle_ms (float): Durée de calme exigée, en millisecondes
+        """
+        state = {'last': None, 'since': time.perf_counter()}
+
+        def idle(driver):
+            resources, pending, ready = driver.execute_script(_NETWORK_STATE_JS)
+            now = time.perf_counter()
+            if (resources, pending) != state['last'] or pending or ready != 'complete':
+                state['last'] = (resources, pending)
+                state['since'] = now
+                return None
+            return (now - state['since']) * 1000 >= idle_ms or None
+
+        return self.until(step, idle, timeout)
+
+    def text_present(self, markers, step='Message de succès', timeout=None):
+        """
+        Attend qu'un des textes apparaisse dans la page (insensible à la casse)
+
+        Args:
+            markers (list): Textes recherchés
+
+        Returns:
+            str: La règle trouvée ('texte:...'), ou None à l'expiration
+        """
+        return self.until(step, lambda d: page_check(d, markers)[1], timeout)
+
+    def submission(self, old_url, markers, selectors=(), url_patterns=(),
+                   step='Réaction à la soumission', timeout=None, baseline=()):
+        """
+        Attend un signe de succès (texte, sélecteur CSS, URL) ou le départ vers une autre page
+
+        Args:
+            baseline (set): page_matches() relevé avant la soumission: un signe
+                déjà présent (ex: « merci » dans la page) ne compte pas
+
+        Returns:
+            str: 'text' (succès reconnu) ou 'url' selon l'événement observé, None à l'expiration
+        """
+        baseline = set(baseline)
+
+        def reacted(driver):
+            if page_matches(driver, markers, selectors, url_patterns) - baseline:
+                return 'text'
+            if driver.current_url != old_url:
+                return 'url'
+            return None
+        return self.until(step, reacted, timeout)
+
+    def total_ms(self):
+        """Durée cumulée des étapes enregistrées"""
+        return sum(timing['ms'] for timing in self.timings)
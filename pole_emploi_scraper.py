@@ -3,27 +3,199 @@ Module de scraping pour les offres d'emploi de Pôle Emploi
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import time
 import re
+import hashlib
+import math
+import asyncio
+import threading
+from html import escape as html_escape
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin, urlparse, parse_qs
 from config import (
     POLE_EMPLOI_SEARCH_URL, 
     DEFAULT_HEADERS, 
-    REQUEST_DELAY,
-    COLORS
+    CONCURRENT_SEARCH,
+    MAX_CONCURRENT_REQUESTS,
+    DETAIL_WORKERS,
+    ASYNC_QUEUE_SIZE,
+    REQUESTS_PER_SECOND,
+    HTML_PARSER_MODE,
+    SELECTOR_STATS_FILE,
+    HTTP_CACHE_ENABLED,
+    HTTP_CACHE_FILE,
+    HTTP_CACHE_SEARCH_TTL,
+    HTTP_CACHE_DETAIL_TTL,
+    HTTP_CACHE_MAX_BYTES,
+    SESSION_BRIDGE_ENABLED
 )
+from rate_limiter import RateLimiter
+from card_extractor import CardExtractor, selector_to_xpath
+from selector_stats import SelectorStats
+from http_cache import HttpCache
+from job_index import JobIndex
+from session_bridge import get_session_bridge
+from instrumentation import span, count, log, bind
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # Sans lxml, les pages sont analysées avec html.parser
+    etree = lxml_html = None
+
+
+# Paramètres d'URL pouvant porter l'identifiant d'une offre
+OFFER_ID_PARAMS = ('id', 'idOffre', 'offreId', 'numeroOffre')
+
+
+def canonical_offer_id(url, *fallback_fields):
+    """
+    Identifiant canonique d'une offre, stable entre pages et sources
+    
+    L'identifiant est pris dans les paramètres de l'URL s'il y figure, sinon
+    dans le dernier segment du chemin (ex: /offres/recherche/detail/123ABCD).
+    
+    Args:
+        url (str): URL de l'offre
+        *fallback_fields (str): Champs hachés quand l'offre n'a pas d'URL
+        
+    Returns:
+        str: Identifiant canonique
+    """
+    if url:
+        parsed = urlparse(url)
+        query = parse_qs(parsed.query)
+        for param in OFFER_ID_PARAMS:
+            if query.get(param):
+                return query[param][0]
+        
+        segments = [segment for segment in parsed.path.split('/') if segment]
+        if segments:
+            return segments[-1]
+        return url
+    
+    digest = hashlib.sha1('|'.join(fallback_fields).encode('utf-8')).hexdigest()
+    return f"sans-url-{digest[:16]}"
 
 
 class PoleEmploiScraper:
     """Classe pour scraper les offres d'emploi sur Pôle Emploi"""
     
-    def __init__(self):
+    # Sélecteurs des cartes d'offres sur une page de résultats, par ordre de priorité
+    LISTING_SELECTORS = [
+        'article[data-testid="offre-emploi"]',
+        '.titreMedia',
+        '.result',
+        '.job-result',
+        '[data-testid="job-offer"]'
+    ]
+    
+    # Mots-clés de classe des cartes quand aucun sélecteur ne correspond
+    LISTING_FALLBACK_KEYWORDS = ('offre', 'job', 'result', 'emploi')
+    
+    # Noms utilisés dans les statistiques de sélecteurs
+    LISTING_FALLBACK_RULE = 'article/div[class~=offre|job|result|emploi]'
+    CARD_WALK_FIELD = '(parcours carte)'
+    
+    # Sélecteurs des champs d'une page d'offre, par ordre de priorité
+    DETAIL_FIELD_SELECTORS = {
+        'full_description': [
+            '.descriptionOffre', '.description', '.contenuOffre',
+            '[data-testid="description-complete"]', '.texteComplet'
+        ],
+        'salary': [
+            '.salaire', '.remuneration', '.salary', '.salaireOffre'
+        ],
+    }
+    
+    # Sélecteurs des champs d'une carte d'offre, par ordre de priorité
+    CARD_FIELD_SELECTORS = {
+        'title': [
+            'h3 a', 'h2 a', '.titreMedia a', 'a[data-testid="offre-lien"]',
+            'a.titreOffre', '.title a', 'h3', 'h2'
+        ],
+        'company': [
+            '.entreprise', '.company', '.employeur', '.societe',
+            '[data-testid="entreprise"]', '.nomEntreprise'
+        ],
+        'location': [
+            '.lieu', '.location', '.ville', '.adresse',
+            '[data-testid="lieu"]', '.localisation'
+        ],
+        'contract_type': [
+            '.typeContrat', '.contract', '.contrat', '.type',
+            '[data-testid="type-contrat"]', '.natureContrat'
+        ],
+        'date': [
+            '.date', '.publication', '.creation', '.datePublication',
+            '[data-testid="date"]', '.dateOffre'
+        ],
+        'description': [
+            '.description', '.resume', '.extrait', '.summary',
+            '[data-testid="description"]', '.texteOffre'
+        ],
+    }
+    
+    def __init__(self, rate_limiter=None, selector_stats=None, http_cache=None, session_bridge=None):
+        """
+        Initialise le scraper
+        
+        Args:
+            rate_limiter (RateLimiter): Budget de requêtes partagé (par défaut,
+                un budget propre de REQUESTS_PER_SECOND)
+            selector_stats (SelectorStats): Statistiques des sélecteurs (par
+                défaut, celles de SELECTOR_STATS_FILE)
+            http_cache (HttpCache): Cache des réponses HTTP (par défaut, celui de
+                HTTP_CACHE_FILE si HTTP_CACHE_ENABLED)
+            session_bridge (SessionBridge): Cookies partagés avec le navigateur (par
+                défaut, ceux de COOKIE_STORE_FILE si SESSION_BRIDGE_ENABLED)
+        """
         self.session = requests.Session()
         self.session.headers.update(DEFAULT_HEADERS)
+        # Pool de connexions dimensionné pour les requêtes simultanées
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(MAX_CONCURRENT_REQUESTS, DETAIL_WORKERS))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.base_url = "https://candidat.pole-emploi.fr"
+        self.search_url = POLE_EMPLOI_SEARCH_URL
+        self.rate_limiter = rate_limiter or RateLimiter(REQUESTS_PER_SECOND)
+        self.selector_stats = selector_stats or SelectorStats(SELECTOR_STATS_FILE)
+        if http_cache is None and HTTP_CACHE_ENABLED:
+            http_cache = HttpCache(HTTP_CACHE_FILE, HTTP_CACHE_SEARCH_TTL, HTTP_CACHE_MAX_BYTES)
+        self.http_cache = http_cache
+        if session_bridge is None and SESSION_BRIDGE_ENABLED:
+            session_bridge = get_session_bridge()
+        self.session_bridge = session_bridge
+        if session_bridge:
+            # Reprendre la session (consentement, identifiants) établie par le navigateur
+            session_bridge.store_to_session(self.session)
+        self._job_index = None
+        # Plan de sélecteurs compilé une seule fois pour toutes les cartes
+        self._card_extractor = CardExtractor(self.CARD_FIELD_SELECTORS)
+        # Sous-arbres utiles de chaque type de page (mode 'lxml-strained')
+        self._listing_xpath = self._compile_xpath(
+            self.LISTING_SELECTORS,
+            "//*[self::article or self::div][%s]" % ' or '.join(
+                f"contains(@class, '{keyword}')" for keyword in self.LISTING_FALLBACK_KEYWORDS
+            )
+        )
+        self._detail_xpath = self._compile_xpath(
+            [selector for selectors in self.DETAIL_FIELD_SELECTORS.values() for selector in selectors]
+        )
+    
+    @staticmethod
+    def _compile_xpath(selectors, *extra_xpaths):
+        """Compile l'union XPath des sélecteurs (None si lxml ou un sélecteur n'est pas supporté)"""
+        if lxml_html is None:
+            return None
+        try:
+            return etree.XPath(' | '.join([selector_to_xpath(s) for s in selectors] + list(extra_xpaths)))
+        except (ValueError, etree.XPathError):
+            return None
         
-    def search_jobs(self, keywords="", location="", contract_type="TOUS", max_results=50):
+    def search_jobs(self, keywords="", location="", contract_type="TOUS", max_results=50,
+                    concurrent=None, store=None, incremental=False):
         """
         Recherche des offres d'emploi sur Pôle Emploi
         
@@ -32,54 +204,250 @@ class PoleEmploiScraper:
             location (str): Localisation (ville, département, région)
             contract_type (str): Type de contrat
             max_results (int): Nombre maximum de résultats à retourner
+            concurrent (bool): Récupérer plusieurs pages simultanément
+                (par défaut: CONCURRENT_SEARCH)
+            store (JobStore): Base où enregistrer les offres trouvées
+            incremental (bool): Ne renvoyer que les offres jamais vues pour cette
+                recherche, et arrêter dès qu'une page n'en contient aucune
+                (nécessite store)
             
         Returns:
-            list: Liste des offres d'emploi trouvées
+            list: Liste des offres d'emploi trouvées (sans doublons)
         """
-        print(f"{COLORS['INFO']}🔍 Recherche d'offres d'emploi en cours...{COLORS['END']}")
-        print(f"   Mots-clés: {keywords}")
-        print(f"   Localisation: {location}")
-        print(f"   Type de contrat: {contract_type}")
-        
         jobs = []
-        page = 1
+        
+        try:
+            for job in self.iter_jobs(keywords, location, contract_type, max_results,
+                                      concurrent, store, incremental):
+                jobs.append(job)
+        except Exception as e:
+            log('ERROR', f"❌ Erreur lors de la recherche: {str(e)}")
+        
+        return jobs
+    
+    def iter_jobs(self, keywords="", location="", contract_type="TOUS", max_results=50,
+                  concurrent=None, store=None, incremental=False, raise_errors=False):
+        """
+        Recherche des offres et les renvoie une par une, dès leur extraction
+        
+        Les paramètres sont ceux de search_jobs. Les offres sont enregistrées
+        dans store page par page ; interrompre l'itération enregistre celles
+        déjà renvoyées et annule les requêtes en attente.
+        
+        Args:
+            raise_errors (bool): Propager l'erreur d'une page de résultats au lieu
+                d'arrêter la recherche en silence (l'appelant sait alors qu'elle
+                est incomplète)
+        
+        Yields:
+            dict: Offre d'emploi (sans doublons)
+        """
+        log('INFO', "🔍 Recherche d'offres d'emploi en cours...")
+        log(None, f"   Mots-clés: {keywords}")
+        log(None, f"   Localisation: {location}")
+        log(None, f"   Type de contrat: {contract_type}")
+        
+        seen_ids = set()
+        yielded = 0
+        new_in_store = 0
         max_pages = 10  # Limiter le nombre de pages à scraper
         
+        if incremental and store is None:
+            log('WARNING', "⚠️ Recherche incrémentale impossible sans base d'offres")
+            incremental = False
+        
+        if concurrent is None:
+            concurrent = CONCURRENT_SEARCH
+        # En mode incrémental, l'arrêt dépend de chaque page: pas de préchargement
+        workers = MAX_CONCURRENT_REQUESTS if concurrent and not incremental else 1
+        
+        query_key = None
+        if incremental:
+            query_key = store.query_key(keywords, location, contract_type)
+        
+        if max_results <= 0:
+            return
+        
+        # En mode incrémental, la page 1 en cache masquerait les nouvelles offres:
+        # chaque page est revalidée auprès du serveur (If-None-Match)
+        cache_ttl = 0 if incremental else HTTP_CACHE_SEARCH_TTL
+        pages = self._iter_result_pages(keywords, location, contract_type, max_pages, workers,
+                                        raise_errors, cache_ttl)
+        page_jobs = []  # Offres de la page en cours, enregistrées à la fin de la page
         try:
-            while len(jobs) < max_results and page <= max_pages:
-                print(f"{COLORS['INFO']}   📄 Scraping page {page}...{COLORS['END']}")
-                
-                # Construire les paramètres de recherche
-                params = self._build_search_params(keywords, location, contract_type, page)
-                
-                # Effectuer la requête
-                response = self._make_request(POLE_EMPLOI_SEARCH_URL, params)
-                
-                if not response:
+            for page, html_content in pages:
+                if html_content is None:
                     break
+                
+                listings = list(self._iter_job_listings(html_content))
+                page_count = len(listings)
+                page_jobs = []
+                page_new = 0
+                # Offres déjà vues lors des exécutions précédentes (une requête par page)
+                known = set()
+                if incremental and listings:
+                    known = store.seen_for_query(query_key, [job['offer_id'] for job in listings])
+                for job in listings:
+                    if job['offer_id'] in seen_ids:
+                        continue
+                    seen_ids.add(job['offer_id'])
+                    if job['offer_id'] in known:
+                        continue
                     
-                # Parser les résultats
-                page_jobs = self._parse_job_listings(response.text)
+                    page_new += 1
+                    page_jobs.append(job)
+                    yielded += 1
+                    yield job
+                    if yielded >= max_results:
+                        break
                 
-                if not page_jobs:
-                    print(f"{COLORS['WARNING']}   ⚠️ Aucune offre trouvée sur la page {page}{COLORS['END']}")
+                if not page_count:
+                    log('WARNING', f"   ⚠️ Aucune offre trouvée sur la page {page}")
                     break
-                    
-                jobs.extend(page_jobs)
-                print(f"{COLORS['SUCCESS']}   ✅ {len(page_jobs)} offres trouvées sur la page {page}{COLORS['END']}")
                 
-                page += 1
-                time.sleep(REQUEST_DELAY)
+                log('SUCCESS', f"   ✅ {page_count} offres trouvées sur la page {page}")
+                new_in_store += self._store_page_jobs(store, query_key, page_jobs)
+                page_jobs = []
+                
+                if yielded >= max_results:
+                    break
                 
-            # Limiter les résultats au maximum demandé
-            jobs = jobs[:max_results]
+                if incremental and not page_new:
+                    log('INFO', f"   ⏹️ Page {page} déjà connue: arrêt de la recherche incrémentale")
+                    break
             
-            print(f"{COLORS['SUCCESS']}🎉 Recherche terminée: {len(jobs)} offres trouvées{COLORS['END']}")
+            if store is not None:
+                log('INFO', f"💾 {new_in_store} nouvelles offres enregistrées ({store.count()} au total)")
+            log('SUCCESS', f"🎉 Recherche terminée: {yielded} offres trouvées")
+        finally:
+            pages.close()
+            # Itération interrompue en cours de page: enregistrer les offres déjà renvoyées
+            self._store_page_jobs(store, query_key, page_jobs)
+            self._save_selector_stats()
+            self.save_session()
+    
+    async def aiter_jobs(self, *args, **kwargs):
+        """
+        Équivalent asynchrone de iter_jobs
+        
+        La recherche s'exécute dans un thread ; les offres sont transmises par
+        une file bornée, ce qui limite la mémoire si le consommateur est lent.
+        Les paramètres sont ceux de iter_jobs.
+        
+        Yields:
+            dict: Offre d'emploi
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=ASYNC_QUEUE_SIZE)
+        stop = threading.Event()
+        
+        def produce():
+            try:
+                for job in self.iter_jobs(*args, **kwargs):
+                    if stop.is_set():
+                        break
+                    asyncio.run_coroutine_threadsafe(queue.put(('job', job)), loop).result()
+                item = ('done', None)
+            except Exception as e:
+                item = ('error', e)
+            if not stop.is_set():
+                asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+        
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == 'done':
+                    break
+                if kind == 'error':
+                    raise value
+                yield value
+        finally:
+            stop.set()
+            # Débloquer le producteur s'il attend une place dans la file
+            while not queue.empty():
+                queue.get_nowait()
+            await producer
+    
+    @staticmethod
+    def _store_page_jobs(store, query_key, jobs):
+        """Enregistre les offres d'une page (et les marque vues en mode incrémental)"""
+        if store is None or not jobs:
+            return 0
+        new_ids = store.upsert_jobs(jobs)
+        if query_key is not None:
+            store.mark_seen(query_key, [job['offer_id'] for job in jobs])
+        return len(new_ids)
+    
+    def _iter_result_pages(self, keywords, location, contract_type, max_pages, workers=1, raise_errors=False,
+                           cache_ttl=HTTP_CACHE_SEARCH_TTL):
+        """
+        Récupère et parse les pages de résultats, éventuellement en parallèle
+        
+        Jusqu'à `workers` pages sont en vol simultanément, sous le budget global
+        de self.rate_limiter. Les pages sont toujours renvoyées dans l'ordre ;
+        fermer le générateur annule les pages préchargées: celles qui attendent
+        leur créneau abandonnent sans envoyer de requête, et le générateur ne
+        rend la main qu'une fois les requêtes déjà parties terminées.
+        
+        Args:
+            keywords (str): Mots-clés de recherche
+            location (str): Localisation
+            contract_type (str): Type de contrat
+            max_pages (int): Nombre maximum de pages à récupérer
+            workers (int): Nombre de requêtes simultanées (1 = séquentiel)
+            raise_errors (bool): Propager les erreurs de requête (voir iter_jobs)
+            cache_ttl (int): Durée de validité des pages en cache (0 = toujours revalider)
             
-        except Exception as e:
-            print(f"{COLORS['ERROR']}❌ Erreur lors de la recherche: {str(e)}{COLORS['END']}")
+        Yields:
+            tuple: (numéro de page, contenu HTML ou None si la requête a échoué)
+        """
+        if workers <= 1:
+            for page in range(1, max_pages + 1):
+                yield page, self._fetch_result_page(keywords, location, contract_type, page, raise_errors,
+                                                    cache_ttl=cache_ttl)
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {}
+        cancelled = threading.Event()
+        next_page = 1
+        
+        try:
+            for page in range(1, max_pages + 1):
+                # Garder la fenêtre de requêtes en vol pleine
+                while next_page <= max_pages and next_page < page + workers:
+                    futures[next_page] = executor.submit(
+                        bind(self._fetch_result_page), keywords, location, contract_type, next_page,
+                        raise_errors, cancelled, cache_ttl
+                    )
+                    next_page += 1
+                
+                yield page, futures.pop(page).result()
+        finally:
+            cancelled.set()
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown(wait=True)
+    
+    def _fetch_result_page(self, keywords, location, contract_type, page, raise_errors=False, cancelled=None,
+                           cache_ttl=HTTP_CACHE_SEARCH_TTL):
+        """Télécharge une page de résultats (None si la requête a échoué ou a été annulée)"""
+        if cancelled is not None and cancelled.is_set():
+            return None
+        log('INFO', f"   📄 Scraping page {page}...")
+        
+        with span('search_page', page=page):
+            # Construire les paramètres de recherche
+            params = self._build_search_params(keywords, location, contract_type, page)
             
-        return jobs
+            # Effectuer la requête
+            response = self._make_request(self.search_url, params, cache_ttl, raise_errors, cancelled)
+        
+        if not response:
+            return None
+        
+        return response.text
     
     def _build_search_params(self, keywords, location, contract_type, page):
         """Construit les paramètres de recherche pour l'URL"""
@@ -103,161 +471,208 @@ class PoleEmploiScraper:
             'nomEntreprise': '',
             'lieuTravail': '',
             'filtresRecherche': '',
-            'origineOffre': 'PE',
             'origineOffre': 'PARTENAIRES'
         }
         
         # Nettoyer les paramètres vides
         return {k: v for k, v in params.items() if v}
     
-    def _make_request(self, url, params=None):
-        """Effectue une requête HTTP avec gestion d'erreurs"""
+    def _make_request(self, url, params=None, cache_ttl=None, raise_errors=False, cancelled=None):
+        """
+        Effectue une requête HTTP avec gestion d'erreurs, via le cache HTTP s'il est actif
+        
+        Avec raise_errors, les erreurs de requête sont propagées au lieu d'être
+        affichées (None n'est alors renvoyé que pour une requête annulée).
+        Si l'événement cancelled est levé pendant l'attente du créneau de
+        self.rate_limiter, l'attente s'interrompt aussitôt: la requête n'est pas
+        envoyée et None est renvoyé.
+        """
         try:
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return response
+            with span('request', url=url) as request_span:
+                key = cached = None
+                headers = {}
+                if self.http_cache:
+                    key = self.http_cache.make_key(url, params)
+                    cached, fresh = self.http_cache.get(key, cache_ttl)
+                    if cached is not None:
+                        if fresh:
+                            self.http_cache.record_hit(cached)
+                            count('http.cache_hits')
+                            request_span.set(cached=True)
+                            return cached
+                        # Réponse expirée: revalider avec ETag / Last-Modified
+                        headers = self.http_cache.conditional_headers(key)
+                
+                self.rate_limiter.acquire(cancelled)
+                if cancelled is not None and cancelled.is_set():
+                    request_span.set(cancelled=True)
+                    return None
+                response = self.session.get(url, params=params, headers=headers, timeout=30)
+                count('http.requests')
+                count('http.bytes', len(response.content))
+                request_span.set(status=response.status_code, bytes=len(response.content))
+                
+                if cached is not None and response.status_code == 304:
+                    self.http_cache.refresh(key, cached, response)
+                    count('http.not_modified')
+                    return cached
+                
+                response.raise_for_status()
+                if key and response.status_code == 200:
+                    self.http_cache.store(key, response)
+                return response
         except requests.exceptions.RequestException as e:
-            print(f"{COLORS['ERROR']}❌ Erreur de requête: {str(e)}{COLORS['END']}")
+            count('http.errors')
+            if raise_errors:
+                raise
+            log('ERROR', f"❌ Erreur de requête: {str(e)}")
             return None
     
     def _parse_job_listings(self, html_content):
         """Parse le contenu HTML pour extraire les offres d'emploi"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        jobs = []
-        
-        # Sélecteurs pour les offres d'emploi sur Pôle Emploi
-        job_selectors = [
-            'article[data-testid="offre-emploi"]',
-            '.titreMedia',
-            '.result',
-            '.job-result',
-            '[data-testid="job-offer"]'
-        ]
+        return list(self._iter_job_listings(html_content))
+    
+    def _iter_job_listings(self, html_content):
+        """Génère les offres d'une page de résultats, carte par carte"""
+        soup = self._make_soup(html_content, self._listing_xpath)
         
+        start = time.perf_counter()
         job_elements = []
-        for selector in job_selectors:
+        winner = None
+        for selector in self.LISTING_SELECTORS:
             job_elements = soup.select(selector)
             if job_elements:
+                winner = selector
                 break
         
         if not job_elements:
             # Essayer de trouver les offres avec d'autres sélecteurs
             job_elements = soup.find_all(['article', 'div'], class_=re.compile(r'(offre|job|result|emploi)'))
+            if job_elements:
+                winner = self.LISTING_FALLBACK_RULE
+        self._record_selector('listing', 'cards', winner, time.perf_counter() - start)
         
-        for element in job_elements:
-            job_data = self._extract_job_data(element)
+        # Une seule étape mesurée par page, pas une par carte
+        with span('extract', cards=len(job_elements)):
+            jobs = [self._extract_job_data(element) for element in job_elements]
+        for job_data in jobs:
             if job_data:
-                jobs.append(job_data)
+                yield job_data
+    
+    def _make_soup(self, html_content, xpath):
+        """
+        Construit l'arbre BeautifulSoup d'une page
         
-        return jobs
+        En mode 'lxml-strained', la page est analysée par lxml et seuls les
+        sous-arbres correspondant à `xpath` (avec la chaîne de leurs ancêtres)
+        sont convertis en arbre BeautifulSoup. Si rien ne correspond, ou si lxml
+        est indisponible, la page complète est analysée avec html.parser.
+        
+        Args:
+            html_content (str): Contenu HTML de la page
+            xpath (XPath): Union des sélecteurs utiles à la page
+            
+        Returns:
+            BeautifulSoup: Arbre de la page (complète ou restreinte)
+        """
+        with span('parse', mode=HTML_PARSER_MODE, bytes=len(html_content)) as parse_span:
+            if HTML_PARSER_MODE == 'lxml-strained' and lxml_html is not None and xpath is not None:
+                try:
+                    fragment = self._strained_fragment(lxml_html.document_fromstring(html_content), xpath)
+                    if fragment:
+                        return BeautifulSoup(fragment, 'lxml')
+                except Exception:
+                    pass
+            
+            parse_span.set(mode='html.parser')
+            return BeautifulSoup(html_content, 'html.parser')
+    
+    @staticmethod
+    def _strained_fragment(document, xpath):
+        """Sérialise les sous-arbres les plus externes correspondant à xpath ('' si aucun)"""
+        kept = set()
+        groups = []
+        for node in xpath(document):
+            if any(ancestor in kept for ancestor in node.iterancestors()):
+                continue  # Déjà inclus dans un sous-arbre retenu
+            kept.add(node)
+            
+            # Regrouper les noeuds consécutifs qui partagent le même parent
+            parent = node.getparent()
+            if groups and groups[-1][0] is parent:
+                groups[-1][1].append(node)
+            else:
+                groups.append((parent, [node]))
+        
+        parts = []
+        for parent, nodes in groups:
+            # Conserver les ancêtres pour les sélecteurs descendants (ex: 'h3 a')
+            ancestors = [a for a in reversed(list(nodes[0].iterancestors()))
+                         if a.tag not in ('html', 'body', 'head')]
+            for ancestor in ancestors:
+                attrs = ''.join(f' {name}="{html_escape(value)}"' for name, value in ancestor.attrib.items())
+                parts.append(f'<{ancestor.tag}{attrs}>')
+            for node in nodes:
+                parts.append(lxml_html.tostring(node, encoding='unicode', with_tail=False))
+            for ancestor in reversed(ancestors):
+                parts.append(f'</{ancestor.tag}>')
+        
+        return ''.join(parts)
     
     def _extract_job_data(self, element):
         """Extrait les données d'une offre d'emploi"""
         try:
-            # Titre de l'offre
-            title_selectors = [
-                'h3 a', 'h2 a', '.titreMedia a', 'a[data-testid="offre-lien"]',
-                'a.titreOffre', '.title a', 'h3', 'h2'
-            ]
+            # Un seul parcours de la carte pour tous les champs
+            start = time.perf_counter()
+            matches = self._card_extractor.extract(element)
+            self._record_card_matches(matches, time.perf_counter() - start)
             
-            title_element = None
+            def field_text(field, default):
+                match = matches.get(field)
+                return match[1].get_text(strip=True) if match else default
+            
+            # Titre de l'offre
             title = "Titre non trouvé"
             job_url = ""
             
-            for selector in title_selectors:
-                title_element = element.select_one(selector)
-                if title_element:
-                    title = title_element.get_text(strip=True)
-                    # Essayer d'extraire l'URL
-                    if title_element.name == 'a':
-                        href = title_element.get('href', '')
-                        if href:
-                            job_url = urljoin(self.base_url, href)
-                    else:
-                        # Chercher un lien à proximité
-                        link = element.find('a', href=True)
-                        if link:
-                            job_url = urljoin(self.base_url, link['href'])
-                    break
-            
-            # Entreprise
-            company_selectors = [
-                '.entreprise', '.company', '.employeur', '.societe',
-                '[data-testid="entreprise"]', '.nomEntreprise'
-            ]
-            
-            company = "Entreprise non spécifiée"
-            for selector in company_selectors:
-                company_element = element.select_one(selector)
-                if company_element:
-                    company = company_element.get_text(strip=True)
-                    break
-            
-            # Localisation
-            location_selectors = [
-                '.lieu', '.location', '.ville', '.adresse',
-                '[data-testid="lieu"]', '.localisation'
-            ]
-            
-            location = "Localisation non spécifiée"
-            for selector in location_selectors:
-                location_element = element.select_one(selector)
-                if location_element:
-                    location = location_element.get_text(strip=True)
-                    break
-            
-            # Type de contrat
-            contract_selectors = [
-                '.typeContrat', '.contract', '.contrat', '.type',
-                '[data-testid="type-contrat"]', '.natureContrat'
-            ]
-            
-            contract_type = "Type non spécifié"
-            for selector in contract_selectors:
-                contract_element = element.select_one(selector)
-                if contract_element:
-                    contract_type = contract_element.get_text(strip=True)
-                    break
-            
-            # Date de publication
-            date_selectors = [
-                '.date', '.publication', '.creation', '.datePublication',
-                '[data-testid="date"]', '.dateOffre'
-            ]
-            
-            date = "Date non spécifiée"
-            for selector in date_selectors:
-                date_element = element.select_one(selector)
-                if date_element:
-                    date = date_element.get_text(strip=True)
-                    break
+            title_match = matches.get('title')
+            if title_match:
+                title_element = title_match[1]
+                title = title_element.get_text(strip=True)
+                # Essayer d'extraire l'URL
+                if title_element.name == 'a':
+                    href = title_element.get('href', '')
+                    if href:
+                        job_url = urljoin(self.base_url, href)
+                else:
+                    # Chercher un lien à proximité
+                    link = element.find('a', href=True)
+                    if link:
+                        job_url = urljoin(self.base_url, link['href'])
             
             # Description (tronquée)
-            description_selectors = [
-                '.description', '.resume', '.extrait', '.summary',
-                '[data-testid="description"]', '.texteOffre'
-            ]
-            
             description = ""
-            for selector in description_selectors:
-                desc_element = element.select_one(selector)
-                if desc_element:
-                    description = desc_element.get_text(strip=True)[:200] + "..."
-                    break
+            desc_match = matches.get('description')
+            if desc_match:
+                description = desc_match[1].get_text(strip=True)[:200] + "..."
+            
+            company = field_text('company', "Entreprise non spécifiée")
+            location = field_text('location', "Localisation non spécifiée")
             
             return {
                 'title': title,
                 'company': company,
                 'location': location,
-                'contract_type': contract_type,
-                'date': date,
+                'contract_type': field_text('contract_type', "Type non spécifié"),
+                'date': field_text('date', "Date non spécifiée"),
                 'description': description,
                 'url': job_url,
-                'source': 'Pôle Emploi'
+                'source': 'Pôle Emploi',
+                'offer_id': canonical_offer_id(job_url, title, company, location)
             }
             
         except Exception as e:
-            print(f"{COLORS['WARNING']}⚠️ Erreur lors de l'extraction des données: {str(e)}{COLORS['END']}")
+            log('WARNING', f"⚠️ Erreur lors de l'extraction des données: {str(e)}")
             return None
     
     def get_job_details(self, job_url):
@@ -271,87 +686,211 @@ class PoleEmploiScraper:
             dict: Détails complets de l'offre
         """
         try:
-            response = self._make_request(job_url)
-            if not response:
-                return None
-                
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extraire les détails complets
-            details = {
-                'full_description': '',
-                'requirements': '',
-                'benefits': '',
-                'salary': '',
-                'contact_info': ''
-            }
-            
-            # Description complète
-            desc_selectors = [
-                '.descriptionOffre', '.description', '.contenuOffre',
-                '[data-testid="description-complete"]', '.texteComplet'
-            ]
-            
-            for selector in desc_selectors:
-                desc_element = soup.select_one(selector)
-                if desc_element:
-                    details['full_description'] = desc_element.get_text(strip=True)
-                    break
+            with span('details', url=job_url):
+                response = self._make_request(job_url, cache_ttl=HTTP_CACHE_DETAIL_TTL)
+                if not response:
+                    return None
+                    
+                details = self._parse_job_details(response.text)
+            self._save_selector_stats()
+            return details
             
-            # Salaire
-            salary_selectors = [
-                '.salaire', '.remuneration', '.salary', '.salaireOffre'
-            ]
+        except Exception as e:
+            log('ERROR', f"❌ Erreur lors de la récupération des détails: {str(e)}")
+            return None
+    
+    def iter_job_details(self, jobs, workers=None, stats=None):
+        """
+        Récupère les détails de plusieurs offres en parallèle
+        
+        Les résultats sont renvoyés au fur et à mesure qu'ils arrivent ; une
+        offre en échec produit une erreur sans interrompre le lot.
+        
+        Args:
+            jobs (list): Offres (dictionnaires avec une clé 'url')
+            workers (int): Nombre de requêtes simultanées (défaut: DETAIL_WORKERS)
+            stats (dict): Complété à la fin avec le débit et les percentiles de latence
             
-            for selector in salary_selectors:
-                salary_element = soup.select_one(selector)
-                if salary_element:
-                    details['salary'] = salary_element.get_text(strip=True)
-                    break
+        Yields:
+            tuple: (offre, détails ou None, message d'erreur ou None)
+        """
+        workers = workers or DETAIL_WORKERS
+        latencies = []
+        errors = 0
+        start = time.perf_counter()
+        
+        executor = ThreadPoolExecutor(max_workers=workers)
+        # Étapes des threads rattachées à l'étape en cours (une recherche groupée, par exemple)
+        fetch = bind(self._timed_job_details)
+        futures = {executor.submit(fetch, job): job for job in jobs}
+        
+        try:
+            for future in as_completed(futures):
+                job = futures[future]
+                details, error, elapsed = future.result()
+                latencies.append(elapsed)
+                if error:
+                    errors += 1
+                yield job, details, error
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+            self._save_selector_stats()
             
-            return details
+            summary = self._latency_summary(latencies, errors, time.perf_counter() - start)
+            if stats is not None:
+                stats.update(summary)
+            log('INFO',
+                f"📊 Détails: {summary['count']} offres ({summary['errors']} erreurs) "
+                f"en {summary['seconds']:.1f}s, {summary['per_second']:.1f} offres/s | "
+                f"p50 {summary['p50_ms']:.0f} ms, p90 {summary['p90_ms']:.0f} ms, "
+                f"p99 {summary['p99_ms']:.0f} ms"
+            )
+    
+    def enrich_jobs(self, jobs, workers=None, store=None):
+        """
+        Ajoute les détails complets (clé 'details') à une liste d'offres
+        
+        Args:
+            jobs (list): Offres à enrichir (modifiées sur place)
+            workers (int): Nombre de requêtes simultanées (défaut: DETAIL_WORKERS)
+            store (JobStore): Base où enregistrer les offres enrichies
             
+        Returns:
+            dict: Débit, erreurs et percentiles de latence du lot
+        """
+        stats = {}
+        enriched = []
+        for job, details, error in self.iter_job_details(jobs, workers, stats):
+            if error:
+                log('WARNING', f"⚠️ {job.get('title', job.get('url'))}: {error}")
+                continue
+            job['details'] = details
+            enriched.append(job)
+        
+        if store is not None and enriched:
+            store.upsert_jobs(enriched)
+        return stats
+    
+    def _timed_job_details(self, job):
+        """Récupère les détails d'une offre: (détails, erreur, durée en secondes)"""
+        start = time.perf_counter()
+        try:
+            with span('details', url=job.get('url')):
+                if not job.get('url'):
+                    raise ValueError("offre sans URL")
+                response = self._make_request(job['url'], cache_ttl=HTTP_CACHE_DETAIL_TTL, raise_errors=True)
+                return self._parse_job_details(response.text), None, time.perf_counter() - start
         except Exception as e:
-            print(f"{COLORS['ERROR']}❌ Erreur lors de la récupération des détails: {str(e)}{COLORS['END']}")
-            return None
+            return None, str(e), time.perf_counter() - start
+    
+    @staticmethod
+    def _latency_summary(latencies, errors, seconds):
+        """Débit et percentiles (rang le plus proche) d'une série de latences"""
+        ordered = sorted(latencies)
+        
+        def percentile(p):
+            if not ordered:
+                return 0.0
+            rank = max(1, int(math.ceil(p / 100.0 * len(ordered))))
+            return ordered[rank - 1] * 1000
+        
+        return {
+            'count': len(ordered),
+            'errors': errors,
+            'seconds': seconds,
+            'per_second': len(ordered) / seconds if seconds > 0 else 0.0,
+            'p50_ms': percentile(50),
+            'p90_ms': percentile(90),
+            'p99_ms': percentile(99),
+        }
+    
+    def _parse_job_details(self, html_content):
+        """Parse la page d'une offre pour en extraire les détails complets"""
+        soup = self._make_soup(html_content, self._detail_xpath)
+        
+        # Extraire les détails complets
+        details = {
+            'full_description': '',
+            'requirements': '',
+            'benefits': '',
+            'salary': '',
+            'contact_info': ''
+        }
+        
+        # Description complète, salaire
+        for field, selectors in self.DETAIL_FIELD_SELECTORS.items():
+            start = time.perf_counter()
+            winner = None
+            for selector in selectors:
+                element = soup.select_one(selector)
+                if element:
+                    details[field] = element.get_text(strip=True)
+                    winner = selector
+                    break
+            self._record_selector('detail', field, winner, time.perf_counter() - start)
+        
+        return details
+    
+    def _record_card_matches(self, matches, elapsed):
+        """Enregistre les sélecteurs gagnants d'une carte et le coût de son parcours"""
+        for field, selectors in self.CARD_FIELD_SELECTORS.items():
+            match = matches.get(field)
+            self._record_selector('card', field, selectors[match[0]] if match else None)
+        self.selector_stats.record_time('card', self.CARD_WALK_FIELD, elapsed)
+    
+    def _record_selector(self, page_type, field, selector, elapsed=0.0):
+        """Enregistre le sélecteur gagnant d'un champ; un champ sans sélecteur compte comme un échec"""
+        self.selector_stats.record(page_type, field, selector, elapsed)
+        if selector is None:
+            count(f"selector.misses.{page_type}")
+    
+    def _save_selector_stats(self):
+        """Enregistre les statistiques de sélecteurs sans interrompre le scraping"""
+        try:
+            self.selector_stats.save()
+        except OSError as e:
+            log('WARNING', f"⚠️ Statistiques de sélecteurs non enregistrées: {str(e)}")
+    
+    def save_session(self):
+        """Partage les cookies de la session HTTP avec le navigateur (magasin de cookies)"""
+        if not self.session_bridge:
+            return
+        try:
+            self.session_bridge.session_to_store(self.session)
+        except OSError as e:
+            log('WARNING', f"⚠️ Cookies de session non enregistrés: {str(e)}")
     
-    def filter_jobs(self, jobs, filters):
+    def selector_report(self):
+        """
+        Rapport des sélecteurs gagnants par type de page et par champ
+        
+        Returns:
+            str: Tableau des sélecteurs utilisés, des échecs et du temps par champ
+        """
+        return self.selector_stats.format_report()
+    
+    def filter_jobs(self, jobs, filters, store=None):
         """
         Filtre les offres d'emploi selon les critères spécifiés
         
+        La recherche se fait par sous-chaîne, sans tenir compte de la casse ni
+        des accents ("developpeur" trouve "Développeur").
+        
         Args:
-            jobs (list): Liste des offres d'emploi
+            jobs (list): Liste des offres d'emploi (None pour interroger store)
             filters (dict): Critères de filtrage
+            store (JobStore): Base d'offres à interroger quand jobs est None
             
         Returns:
             list: Offres filtrées
         """
-        filtered_jobs = jobs.copy()
-        
-        # Filtrage par mots-clés
-        if filters.get('keywords'):
-            keywords = filters['keywords'].lower()
-            filtered_jobs = [
-                job for job in filtered_jobs
-                if keywords in job['title'].lower() or 
-                   keywords in job['description'].lower() or
-                   keywords in job['company'].lower()
-            ]
-        
-        # Filtrage par type de contrat
-        if filters.get('contract_type') and filters['contract_type'] != 'TOUS':
-            contract = filters['contract_type'].lower()
-            filtered_jobs = [
-                job for job in filtered_jobs
-                if contract in job['contract_type'].lower()
-            ]
-        
-        # Filtrage par localisation
-        if filters.get('location'):
-            location = filters['location'].lower()
-            filtered_jobs = [
-                job for job in filtered_jobs
-                if location in job['location'].lower()
-            ]
-        
-        return filtered_jobs
+        if jobs is None and store is not None:
+            return store.query(filters)
+        
+        # L'index est construit une fois par liste d'offres puis réutilisé
+        if self._job_index is None or not self._job_index.is_current(jobs):
+            self._job_index = JobIndex(jobs)
+        
+        return self._job_index.filter(filters)
@@ -0,0 +1,194 @@
+"""
+Pré-vérification HTTP des offres avant d'ouvrir un navigateur
+
+Chaque offre est téléchargée avec la session du scraper (sans navigateur) puis
+classée: en ligne, expirée, ou redirigée vers un site externe. La cible de
+candidature (lien « Postuler ») est repérée au passage: pour une candidature
+externe, Selenium part directement de cette cible (portail de recrutement
+tiers). Seules les offres expirées sont écartées.
+
+Une offre n'est dite expirée que sur un code HTTP 404/410, ou si le texte
+visible du contenu principal (ni scripts, ni styles, ni traductions embarquées)
+contient un des EXPIRED_OFFER_MARKERS et qu'aucun lien de candidature n'y figure.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+from config import PREFLIGHT_TIMEOUT, PREFLIGHT_WORKERS, EXPIRED_OFFER_MARKERS, SAME_SITE_ALIASES
+from job_index import normalize_text
+from instrumentation import span, count, log
+
+try:
+    import lxml  # noqa: F401
+    _PARSER = 'lxml'
+except ImportError:
+    _PARSER = 'html.parser'
+
+
+# Textes et classes d'un lien ou bouton de candidature (normalisés)
+APPLY_KEYWORDS = ('postuler', 'candidater', 'apply')
+
+# Éléments dont le texte n'est jamais affiché
+HIDDEN_TAGS = ('script', 'style', 'noscript', 'template', 'head')
+
+# Statuts d'une offre
+LIVE = 'live'
+EXPIRED = 'expired'
+EXTERNAL = 'external'
+UNKNOWN = 'unknown'
+
+
+def _host(url):
+    return urlparse(url).netloc.lower()
+
+
+def _alias_group(host):
+    """Position du groupe de SAME_SITE_ALIASES auquel appartient l'hôte (None sinon)"""
+    for index, domains in enumerate(SAME_SITE_ALIASES):
+        if any(host == domain or host.endswith('.' + domain) for domain in domains):
+            return index
+    return None
+
+
+def _same_site(host, other):
+    """Même site: hôtes identiques, l'un sous-domaine de l'autre, ou domaines alias (SAME_SITE_ALIASES)"""
+    if host == other or host.endswith('.' + other) or other.endswith('.' + host):
+        return True
+    group = _alias_group(host)
+    return group is not None and group == _alias_group(other)
+
+
+class OfferPreflight:
+    """Vérifie par HTTP qu'une offre est encore en ligne et comment y postuler"""
+
+    def __init__(self, scraper=None, timeout=PREFLIGHT_TIMEOUT):
+        """
+        Initialise la pré-vérification
+
+        Args:
+            scraper (PoleEmploiScraper): Scraper dont la session et le budget de
+                requêtes sont réutilisés (par défaut, un nouveau scraper)
+            timeout (float): Délai maximal d'une requête, en secondes
+        """
+        if scraper is None:
+            from pole_emploi_scraper import PoleEmploiScraper
+            scraper = PoleEmploiScraper()
+        self.scraper = scraper
+        self.timeout = timeout
+
+    def check(self, job):
+        """
+        Classe une offre
+
+        Args:
+            job (dict): Offre (au moins 'url')
+
+        Returns:
+            dict: status ('live', 'expired', 'external' ou 'unknown'), http_status,
+                final_url, apply_url (cible de candidature, ou None), reason, elapsed_ms
+        """
+        url = job['url']
+        start = time.perf_counter()
+        result = {'url': url, 'status': UNKNOWN, 'http_status': None, 'final_url': url,
+                  'apply_url': None, 'reason': None}
+        with span('preflight', url=url) as check_span:
+            try:
+                self.scraper.rate_limiter.acquire()
+                response = self.scraper.session.get(url, timeout=self.timeout, allow_redirects=True)
+                count('http.requests')
+                count('http.bytes', len(response.content))
+                result['http_status'] = response.status_code
+                result['final_url'] = response.url
+                result.update(self._classify(url, response))
+            except requests.RequestException as e:
+                # Réseau indisponible: laisser le navigateur trancher
+                count('http.errors')
+                result['reason'] = str(e)
+            check_span.set(result=result['status'], http_status=result['http_status'])
+        result['elapsed_ms'] = (time.perf_counter() - start) * 1000
+        return result
+
+    def _classify(self, url, response):
+        """Statut, cible et raison d'après la réponse HTTP"""
+        if response.status_code in (404, 410):
+            return {'status': EXPIRED, 'reason': f"HTTP {response.status_code}"}
+        if response.status_code >= 400:
+            return {'status': UNKNOWN, 'reason': f"HTTP {response.status_code}"}
+
+        origin_host = _host(url)
+        final_host = _host(response.url)
+        if not _same_site(final_host, origin_host):
+            return {'status': EXTERNAL, 'apply_url': response.url, 'reason': f"redirection vers {final_host}"}
+
+        soup = BeautifulSoup(response.text, _PARSER)
+        for element in soup.find_all(HIDDEN_TAGS):
+            element.decompose()
+        main = soup.find('main') or soup.find(attrs={'role': 'main'}) or soup.body or soup
+        apply_url = self._find_apply_target(main, response.url)
+
+        if apply_url is None:
+            page_text = normalize_text(main.get_text(' '))
+            for marker in EXPIRED_OFFER_MARKERS:
+                if marker in page_text:
+                    return {'status': EXPIRED, 'reason': marker}
+        if apply_url is None:
+            return {'status': LIVE, 'reason': "cible de candidature non trouvée (page dynamique ?)"}
+        if not _same_site(_host(apply_url), final_host):
+            return {'status': EXTERNAL, 'apply_url': apply_url, 'reason': f"candidature sur {_host(apply_url)}"}
+        return {'status': LIVE, 'apply_url': apply_url}
+
+    @staticmethod
+    def _find_apply_target(root, base_url):
+        """
+        URL du premier lien ou bouton de candidature sous root
+
+        Args:
+            root (Tag): Contenu principal de la page
+            base_url (str): URL finale de la page
+
+        Returns:
+            str: URL absolue du lien, URL de la page pour un bouton, ou None
+        """
+        for element in root.find_all(['a', 'button', 'input']):
+            label = normalize_text(' '.join([
+                element.get_text(' '), element.get('value', ''), ' '.join(element.get('class', [])),
+                element.get('id', ''), element.get('data-testid', '')
+            ]))
+            if not any(keyword in label for keyword in APPLY_KEYWORDS):
+                continue
+            href = element.get('href') if element.name == 'a' else None
+            if href and not href.startswith(('#', 'javascript:')):
+                return urljoin(base_url, href)
+            return base_url
+        return None
+
+    def check_all(self, jobs, workers=PREFLIGHT_WORKERS):
+        """
+        Vérifie plusieurs offres en parallèle (dans la limite du budget de requêtes)
+
+        Args:
+            jobs (list): Offres à vérifier
+            workers (int): Requêtes simultanées
+
+        Returns:
+            dict: URL -> résultat de check
+        """
+        if not jobs:
+            return {}
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as executor:
+            results = {result['url']: result for result in executor.map(self.check, jobs)}
+
+        counts = {}
+        for result in results.values():
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        log('INFO', f"✈️ Pré-vérification de {len(results)} offre(s) en "
+            f"{(time.perf_counter() - start) * 1000:.0f} ms: {counts.get(LIVE, 0)} en ligne, "
+            f"{counts.get(EXPIRED, 0)} expirée(s), {counts.get(EXTERNAL, 0)} externe(s), "
+            f"{counts.get(UNKNOWN, 0)} indéterminée(s)")
+        return results
@@ -0,0 +1,49 @@
+"""
+Limiteur de débit partagé pour les requêtes HTTP vers Pôle Emploi
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Budget global de requêtes par seconde, partageable entre plusieurs threads"""
+
+    def __init__(self, requests_per_second):
+        """
+        Initialise le limiteur
+
+        Args:
+            requests_per_second (float): Nombre maximum de requêtes par seconde
+                (0 ou moins pour désactiver la limitation)
+        """
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, cancelled=None):
+        """
+        Réserve le prochain créneau disponible et attend qu'il soit atteint
+
+        Args:
+            cancelled (threading.Event): Interrompt l'attente dès qu'il est levé
+                (l'appelant vérifie ensuite l'événement avant d'envoyer sa requête)
+
+        Returns:
+            float: Temps d'attente effectif en secondes
+        """
+        if not self.interval:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            if cancelled is not None:
+                cancelled.wait(delay)
+            else:
+                time.sleep(delay)
+        return delay
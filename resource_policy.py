@@ -0,0 +1,219 @@
+"""
+Politique de chargement des ressources pour les pages ouvertes par Selenium
+
+Les ressources lourdes (images, polices, médias...) et les scripts tiers de
+mesure d'audience sont bloqués via Chrome DevTools (Network.setBlockedURLs).
+Les origines de l'offre et du formulaire sont ajoutées à une liste
+d'autorisation: aucun motif d'hôte ne les bloque. Les mesures de chargement
+(octets transférés, durées) sont gardées en mémoire, et consignées sur demande
+(PAGE_LOAD_STATS_FILE) pour comparer les pages chargées avec et sans la politique.
+"""
+
+import fnmatch
+import json
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+from config import (
+    RESOURCE_BLOCKING, BLOCKED_RESOURCE_TYPES, BLOCKED_URL_PATTERNS, ALLOWED_ORIGINS,
+    PAGE_LOAD_STATS_FILE, PAGE_LOAD_STATS_MAX_ENTRIES, TELEMETRY_JSONL_MAX_BYTES, TELEMETRY_JSONL_BACKUPS
+)
+from instrumentation import rotate_jsonl
+
+
+# Motifs d'URL (syntaxe DevTools, '*' générique) par type de ressource
+RESOURCE_TYPE_PATTERNS = {
+    'image': ['png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico'],
+    'font': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+    'media': ['mp4', 'webm', 'mp3', 'ogg', 'wav', 'm3u8'],
+    'stylesheet': ['css'],
+}
+
+# Octets et durées de la navigation et de ses ressources, selon la Performance API
+_LOAD_METRICS_JS = """
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var resources = performance.getEntriesByType('resource');
+var bytes = nav.transferSize || 0;
+for (var i = 0; i < resources.length; i++) bytes += resources[i].transferSize || 0;
+return {
+    url: location.href,
+    bytes: bytes,
+    resources: resources.length,
+    dom_ms: nav.domContentLoadedEventEnd || 0,
+    load_ms: nav.loadEventEnd || 0
+};
+"""
+
+
+def _origin(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else None
+
+
+class ResourcePolicy:
+    """Ressources bloquées et origines autorisées d'un navigateur"""
+
+    def __init__(self, enabled=RESOURCE_BLOCKING, blocked_types=BLOCKED_RESOURCE_TYPES,
+                 blocked_patterns=BLOCKED_URL_PATTERNS, allowed_origins=ALLOWED_ORIGINS):
+        """
+        Initialise la politique
+
+        Args:
+            enabled (bool): Appliquer le blocage
+            blocked_types (list): Types bloqués (clés de RESOURCE_TYPE_PATTERNS)
+            blocked_patterns (list): Motifs d'URL supplémentaires (ex: '*google-analytics.com*')
+            allowed_origins (list): Origines jamais bloquées par les motifs d'URL
+        """
+        self.enabled = enabled
+        self.blocked_types = list(blocked_types)
+        self.blocked_patterns = list(blocked_patterns)
+        self.base_origins = [_origin(url) or url for url in allowed_origins]
+        self.allowed_origins = list(self.base_origins)
+        self._applied = None
+
+    def allow(self, url):
+        """
+        Autorise l'origine d'une URL (offre, formulaire)
+
+        Returns:
+            bool: True si l'origine vient d'être ajoutée
+        """
+        origin = _origin(url)
+        if not origin or origin in self.allowed_origins:
+            return False
+        self.allowed_origins.append(origin)
+        return True
+
+    def reset(self):
+        """Revient aux seules origines autorisées par la configuration"""
+        self.allowed_origins = list(self.base_origins)
+
+    def blocked_urls(self):
+        """
+        Motifs transmis à Network.setBlockedURLs
+
+        Returns:
+            list: Motifs par type de ressource, puis motifs d'hôte ne visant aucune origine autorisée
+        """
+        if not self.enabled:
+            return []
+        urls = []
+        for resource_type in self.blocked_types:
+            for extension in RESOURCE_TYPE_PATTERNS.get(resource_type, []):
+                urls.extend([f"*.{extension}", f"*.{extension}?*"])
+        for pattern in self.blocked_patterns:
+            if not any(fnmatch.fnmatch(origin + '/', pattern) for origin in self.allowed_origins):
+                urls.append(pattern)
+        return urls
+
+    def apply(self, driver):
+        """
+        Applique la politique au navigateur (seulement si elle a changé)
+
+        Args:
+            driver (WebDriver): Navigateur Chrome
+        """
+        urls = self.blocked_urls()
+        if urls == self._applied:
+            return
+        if self._applied is None:
+            driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': urls})
+        self._applied = urls
+
+
+class PageLoadStats:
+    """Mesures de chargement des pages, consignées en JSONL pour comparer les politiques"""
+
+    def __init__(self, path=PAGE_LOAD_STATS_FILE, max_entries=PAGE_LOAD_STATS_MAX_ENTRIES,
+                 max_bytes=TELEMETRY_JSONL_MAX_BYTES, backups=TELEMETRY_JSONL_BACKUPS):
+        """
+        Initialise les mesures
+
+        Args:
+            path (str): Fichier JSONL (None pour rester en mémoire)
+            max_entries (int): Mesures gardées en mémoire (les plus récentes)
+            max_bytes (int): Taille à partir de laquelle le fichier est archivé (None: sans limite)
+            backups (int): Archives conservées (path.1 la plus récente)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        self.entries = deque(maxlen=max_entries)
+
+    def measure(self, driver, label, blocking):
+        """
+        Relève les octets transférés et les durées de la page courante
+
+        Args:
+            driver (WebDriver): Navigateur
+            label (str): Étape ('offre', 'formulaire'...)
+            blocking (bool): Politique de blocage active
+
+        Returns:
+            dict: Mesure enregistrée
+        """
+        metrics = driver.execute_script(_LOAD_METRICS_JS)
+        metrics.update({'label': label, 'blocking': blocking, 'time': time.time()})
+        with self._lock:
+            self.entries.append(metrics)
+            if self.path:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                if self.max_bytes:
+                    rotate_jsonl(self.path, self.max_bytes, self.backups)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(metrics, ensure_ascii=False) + '\n')
+        return metrics
+
+    def load(self):
+        """Toutes les mesures consignées (fichier, sinon mémoire)"""
+        if not self.path or not os.path.exists(self.path):
+            return list(self.entries)
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        return entries
+
+    def report(self):
+        """
+        Moyennes par étape, avec et sans blocage
+
+        Returns:
+            list: Une ligne (dict) par étape et par état du blocage
+        """
+        groups = {}
+        for entry in self.load():
+            groups.setdefault((entry['label'], entry['blocking']), []).append(entry)
+        rows = []
+        for (label, blocking), entries in sorted(groups.items()):
+            count = len(entries)
+            rows.append({
+                'label': label,
+                'blocking': blocking,
+                'pages': count,
+                'avg_kb': sum(e['bytes'] for e in entries) / count / 1024,
+                'avg_resources': sum(e['resources'] for e in entries) / count,
+                'avg_dom_ms': sum(e['dom_ms'] for e in entries) / count,
+                'avg_load_ms': sum(e['load_ms'] for e in entries) / count,
+            })
+        return rows
+
+    def format_report(self):
+        """Rapport lisible: chargement moyen par étape, avec et sans blocage"""
+        lines = [f"{'Étape':<12} {'Blocage':<8} {'Pages':>6} {'Ko moy.':>9} {'Ress.':>6} {'DOM ms':>8} {'Load ms':>8}"]
+        for row in self.report():
+            lines.append(
+                f"{row['label']:<12} {'oui' if row['blocking'] else 'non':<8} {row['pages']:>6} "
+                f"{row['avg_kb']:>9.1f} {row['avg_resources']:>6.1f} {row['avg_dom_ms']:>8.0f} {row['avg_load_ms']:>8.0f}"
+            )
+        return '\n'.join(lines)
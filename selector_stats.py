@@ -0,0 +1,122 @@
+"""
+Statistiques des sélecteurs CSS gagnants, persistées entre les exécutions
+"""
+
+import json
+import os
+import threading
+
+
+class SelectorStats:
+    """Compte, par type de page et par champ, quel sélecteur trouve l'élément"""
+
+    def __init__(self, path=None):
+        """
+        Initialise les statistiques
+
+        Args:
+            path (str): Fichier JSON de persistance (None pour rester en mémoire)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._pages = {}
+        self.load()
+
+    def load(self):
+        """Charge les statistiques enregistrées, si le fichier existe"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            with self._lock:
+                self._pages = data.get('pages', {})
+        except (OSError, ValueError):
+            # Fichier illisible: repartir de statistiques vides
+            self._pages = {}
+
+    def save(self):
+        """Enregistre les statistiques sur disque"""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with self._lock:
+            data = json.dumps({'version': 1, 'pages': self._pages}, ensure_ascii=False, indent=2)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+
+    def _entry(self, page_type, field):
+        fields = self._pages.setdefault(page_type, {})
+        return fields.setdefault(field, {'hits': {}, 'misses': 0, 'calls': 0, 'seconds': 0.0})
+
+    def record(self, page_type, field, selector, elapsed=0.0):
+        """
+        Enregistre le résultat d'une recherche de champ
+
+        Args:
+            page_type (str): Type de page ('listing', 'card', 'detail')
+            field (str): Nom du champ
+            selector (str): Sélecteur gagnant (None si aucun n'a trouvé d'élément)
+            elapsed (float): Temps passé sur ce champ, en secondes
+        """
+        with self._lock:
+            entry = self._entry(page_type, field)
+            entry['calls'] += 1
+            entry['seconds'] += elapsed
+            if selector is None:
+                entry['misses'] += 1
+            else:
+                entry['hits'][selector] = entry['hits'].get(selector, 0) + 1
+
+    def record_time(self, page_type, field, elapsed):
+        """
+        Enregistre un temps passé sans résultat de sélecteur (ex: parcours global d'une carte)
+
+        Args:
+            page_type (str): Type de page
+            field (str): Nom de l'étape
+            elapsed (float): Temps passé, en secondes
+        """
+        with self._lock:
+            entry = self._entry(page_type, field)
+            entry['calls'] += 1
+            entry['seconds'] += elapsed
+
+    def report(self):
+        """
+        Construit le rapport des statistiques
+
+        Returns:
+            list: Une ligne (dict) par type de page et par champ, avec les
+                sélecteurs gagnants, les échecs et le temps passé
+        """
+        rows = []
+        with self._lock:
+            for page_type, fields in sorted(self._pages.items()):
+                for field, entry in sorted(fields.items()):
+                    calls = entry['calls']
+                    rows.append({
+                        'page_type': page_type,
+                        'field': field,
+                        'calls': calls,
+                        'misses': entry['misses'],
+                        'hits': sorted(entry['hits'].items(), key=lambda item: -item[1]),
+                        'total_ms': entry['seconds'] * 1000,
+                        'avg_ms': entry['seconds'] * 1000 / calls if calls else 0.0,
+                    })
+        return rows
+
+    def format_report(self):
+        """Rapport lisible: sélecteurs gagnants et coût par champ"""
+        lines = [f"{'Page':<10} {'Champ':<18} {'Appels':>7} {'Échecs':>7} {'Total ms':>10} {'Moy. ms':>8}  Sélecteurs gagnants"]
+        for row in self.report():
+            winners = ', '.join(f"{selector} ({count})" for selector, count in row['hits']) or '-'
+            lines.append(
+                f"{row['page_type']:<10} {row['field']:<18} {row['calls']:>7} {row['misses']:>7} "
+                f"{row['total_ms']:>10.1f} {row['avg_ms']:>8.3f}  {winners}"
+            )
+        return '\n'.join(lines)
@@ -4,74 +4,234 @@ Module d'automatisation avec Selenium pour les candidatures automatiques
 
 import os
 import time
+from urllib.parse import urlparse
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from config import SELENIUM_WAIT_TIME, PAGE_LOAD_TIMEOUT, COLORS
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from driver_resolver import get_resolver
+from page_waits import PageWaiter, page_check, page_matches
+from form_templates import FormTemplates, get_form_templates
+from resource_policy import ResourcePolicy, PageLoadStats
+from session_bridge import get_session_bridge
+from instrumentation import span, count, log
+from config import (
+    SELENIUM_WAIT_TIME, PAGE_LOAD_TIMEOUT, PAGE_LOAD_STRATEGY, FORM_TEMPLATES_ENABLED, SESSION_BRIDGE_ENABLED,
+    JOB_PAGE_INDICATORS, SUCCESS_INDICATORS, SUCCESS_SELECTORS, SUCCESS_URL_PATTERNS
+)
+
+
+# Premier élément visible et actif parmi des règles XPath / CSS, dans l'ordre des règles
+_FIND_FIRST_CLICKABLE_JS = """
+var rules = arguments[0];
+function clickable(el) {
+    if (el.disabled) return false;
+    var rect = el.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+for (var i = 0; i < rules.length; i++) {
+    var kind = rules[i][0], selector = rules[i][1], nodes = [];
+    try {
+        if (kind === 'xpath') {
+            var found = document.evaluate(selector, document, null,
+                                          XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var j = 0; j < found.snapshotLength; j++) nodes.push(found.snapshotItem(j));
+        } else {
+            nodes = document.querySelectorAll(selector);
+        }
+    } catch (e) {
+        continue;
+    }
+    for (var k = 0; k < nodes.length; k++) {
+        if (clickable(nodes[k])) return [nodes[k], selector];
+    }
+}
+return null;
+"""
+
+
+# Description de tous les champs de saisie de la page, en un seul appel
+_FORM_SCHEMA_JS = """
+var nodes = document.querySelectorAll('input, textarea, select');
+var fields = [];
+for (var i = 0; i < nodes.length; i++) {
+    var el = nodes[i];
+    var type = (el.getAttribute('type') || '').toLowerCase();
+    if (['hidden', 'submit', 'button', 'reset', 'image'].indexOf(type) !== -1) continue;
+    var label = '';
+    if (el.labels && el.labels.length) label = el.labels[0].innerText;
+    else if (el.getAttribute('aria-label')) label = el.getAttribute('aria-label');
+    var rect = el.getBoundingClientRect();
+    fields.push({
+        element: el,
+        index: fields.length,
+        tag: el.tagName.toLowerCase(),
+        type: el.tagName.toLowerCase() === 'input' ? (type || 'text') : '',
+        id: el.id || '',
+        name: el.getAttribute('name') || '',
+        placeholder: el.getAttribute('placeholder') || '',
+        label: (label || '').trim(),
+        value: type === 'file' ? '' : (el.value || ''),
+        visible: rect.width > 0 && rect.height > 0
+    });
+}
+return fields;
+"""
+
+# Saisie groupée: valeur posée par le setter natif puis événements input/change
+_FILL_FIELDS_JS = """
+var pairs = arguments[0], filled = 0;
+for (var i = 0; i < pairs.length; i++) {
+    var el = pairs[i][0], value = pairs[i][1];
+    var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype
+              : el.tagName === 'SELECT' ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    filled++;
+}
+return filled;
+"""
 
 
 class SeleniumHandler:
     """Classe pour gérer l'automatisation des candidatures avec Selenium"""
     
-    def __init__(self, headless=False):
+    # Règles de vérification des pages (voir config.py)
+    JOB_PAGE_INDICATORS = JOB_PAGE_INDICATORS
+    SUCCESS_INDICATORS = SUCCESS_INDICATORS
+    SUCCESS_SELECTORS = SUCCESS_SELECTORS
+    SUCCESS_URL_PATTERNS = SUCCESS_URL_PATTERNS
+    
+    # Textes saisis dans les champs complémentaires, par type de champ
+    DEFAULT_FIELD_TEXTS = {
+        'message': "Je suis très intéressé(e) par ce poste et souhaite vous faire parvenir ma candidature.",
+        'experience': "Voir CV joint",
+    }
+    
+    # Sélecteurs possibles pour le bouton de candidature, par priorité
+    APPLY_BUTTON_RULES = [('xpath', selector) for selector in [
+        "//button[contains(text(), 'Postuler')]",
+        "//button[contains(text(), 'Candidater')]",
+        "//button[contains(text(), 'Apply')]",
+        "//a[contains(text(), 'Postuler')]",
+        "//a[contains(text(), 'Candidater')]",
+        "//input[@value='Postuler']",
+        "//input[@value='Candidater']",
+        "//button[contains(@class, 'postuler')]",
+        "//button[contains(@class, 'candidater')]",
+        "//button[contains(@class, 'apply')]",
+        "//a[contains(@class, 'postuler')]",
+        "//a[contains(@class, 'candidater')]"
+    ]] + [('css', selector) for selector in [
+        # Par ID ou classe CSS
+        "#postuler", "#candidater", "#apply",
+        ".postuler", ".candidater", ".apply",
+        "[data-testid='postuler']", "[data-testid='candidater']"
+    ]]
+    
+    def __init__(self, headless=False, form_templates=None, profile_dir=None, session_bridge=None):
         """
         Initialise le gestionnaire Selenium
         
         Args:
             headless (bool): Mode headless pour le navigateur
+            form_templates (FormTemplates): Modèles de formulaires appris
+                (par défaut, ceux partagés du processus si FORM_TEMPLATES_ENABLED)
+            profile_dir (str): Profil Chrome persistant (None: profil temporaire)
+            session_bridge (SessionBridge): Cookies partagés avec le scraper
+                (par défaut, ceux du processus si SESSION_BRIDGE_ENABLED)
         """
         self.driver = None
         self.wait = None
+        self.waits = None
         self.headless = headless
         self.cv_path = None
         self.cover_letter_path = None
+        self.startup_timings = {}
+        if form_templates is None and FORM_TEMPLATES_ENABLED:
+            form_templates = get_form_templates()
+        self.form_templates = form_templates
+        self._submit_selector = None
+        self._submit_search_ms = 0.0
+        self.check_timings = []
+        self.resource_policy = ResourcePolicy()
+        self.profile_dir = profile_dir
+        if session_bridge is None and SESSION_BRIDGE_ENABLED:
+            session_bridge = get_session_bridge()
+        self.session_bridge = session_bridge
+        self.load_stats = PageLoadStats()
         
     def setup_driver(self):
         """Configure et initialise le driver Chrome"""
         try:
-            print(f"{COLORS['INFO']}🚀 Configuration du navigateur Chrome...{COLORS['END']}")
-            
-            # Options Chrome
-            chrome_options = Options()
-            
-            if self.headless:
-                chrome_options.add_argument("--headless")
-            
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-            
-            # Désactiver les notifications et popups
-            prefs = {
-                "profile.default_content_setting_values.notifications": 2,
-                "profile.default_content_settings.popups": 0,
-                "profile.managed_default_content_settings.images": 2
-            }
-            chrome_options.add_experimental_option("prefs", prefs)
-            
-            # Installer automatiquement le driver Chrome
-            service = Service(ChromeDriverManager().install())
-            
-            # Créer le driver
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
-            
-            # Configurer l'attente implicite
-            self.wait = WebDriverWait(self.driver, SELENIUM_WAIT_TIME)
-            
-            print(f"{COLORS['SUCCESS']}✅ Navigateur Chrome configuré avec succès{COLORS['END']}")
-            return True
-            
+            with span('driver_setup', headless=self.headless) as setup_span:
+                log('INFO', "🚀 Configuration du navigateur Chrome...")
+                
+                # Options Chrome
+                chrome_options = Options()
+                
+                if self.headless:
+                    chrome_options.add_argument("--headless")
+                
+                chrome_options.add_argument("--no-sandbox")
+                chrome_options.add_argument("--disable-dev-shm-usage")
+                chrome_options.add_argument("--disable-gpu")
+                chrome_options.add_argument("--window-size=1920,1080")
+                if self.profile_dir:
+                    chrome_options.add_argument(f"--user-data-dir={os.path.abspath(self.profile_dir)}")
+                chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+                
+                # Désactiver les notifications et popups
+                prefs = {
+                    "profile.default_content_setting_values.notifications": 2,
+                    "profile.default_content_settings.popups": 0,
+                    "profile.managed_default_content_settings.images": 2
+                }
+                chrome_options.add_experimental_option("prefs", prefs)
+                chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY
+                
+                # Chromedriver local (configuration ou cache), téléchargé seulement en dernier recours
+                resolver = get_resolver()
+                driver_path = resolver.resolve()
+                
+                # Créer le driver
+                start = time.perf_counter()
+                try:
+                    self.driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+                except WebDriverException:
+                    if resolver.last_source not in ('cache', 'path'):
+                        raise
+                    # Chromedriver mémorisé devenu incompatible: le résoudre à nouveau
+                    resolver.forget()
+                    driver_path = resolver.resolve()
+                    self.driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+                self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+                self.startup_timings = {
+                    'resolve_ms': resolver.last_elapsed * 1000,
+                    'launch_ms': (time.perf_counter() - start) * 1000,
+                    'source': resolver.last_source,
+                }
+                setup_span.set(**self.startup_timings)
+                
+                # Configurer l'attente implicite
+                self.wait = WebDriverWait(self.driver, SELENIUM_WAIT_TIME)
+                self.waits = PageWaiter(self.driver)
+                if PAGE_LOAD_STRATEGY != 'normal':
+                    self.waits.ready_states = ('interactive', 'complete')
+                self.resource_policy.apply(self.driver)
+                
+                log('SUCCESS', f"✅ Navigateur Chrome configuré avec succès "
+                    f"(chromedriver: {self.startup_timings['source']}, {self.startup_timings['resolve_ms']:.0f} ms, "
+                    f"lancement: {self.startup_timings['launch_ms']:.0f} ms)")
+                return True
+                
         except Exception as e:
-            print(f"{COLORS['ERROR']}❌ Erreur lors de la configuration du navigateur: {str(e)}{COLORS['END']}")
+            log('ERROR', f"❌ Erreur lors de la configuration du navigateur: {str(e)}")
             return False
     
     def set_documents(self, cv_path, cover_letter_path):
@@ -84,15 +244,15 @@ class SeleniumHandler:
         """
         if os.path.exists(cv_path):
             self.cv_path = cv_path
-            print(f"{COLORS['SUCCESS']}✅ CV trouvé: {cv_path}{COLORS['END']}")
+            log('SUCCESS', f"✅ CV trouvé: {cv_path}")
         else:
-            print(f"{COLORS['ERROR']}❌ CV non trouvé: {cv_path}{COLORS['END']}")
+            log('ERROR', f"❌ CV non trouvé: {cv_path}")
             
         if os.path.exists(cover_letter_path):
             self.cover_letter_path = cover_letter_path
-            print(f"{COLORS['SUCCESS']}✅ Lettre de motivation trouvée: {cover_letter_path}{COLORS['END']}")
+            log('SUCCESS', f"✅ Lettre de motivation trouvée: {cover_letter_path}")
         else:
-            print(f"{COLORS['ERROR']}❌ Lettre de motivation non trouvée: {cover_letter_path}{COLORS['END']}")
+            log('ERROR', f"❌ Lettre de motivation non trouvée: {cover_letter_path}")
     
     def apply_to_job(self, job_url, personal_info=None):
         """
@@ -106,138 +266,302 @@ class SeleniumHandler:
             bool: True si la candidature a été envoyée avec succès
         """
         if not self.driver:
-            print(f"{COLORS['ERROR']}❌ Navigateur non initialisé{COLORS['END']}")
+            log('ERROR', "❌ Navigateur non initialisé")
             return False
         
         try:
-            print(f"{COLORS['INFO']}📝 Début de la candidature pour: {job_url}{COLORS['END']}")
-            
-            # Naviguer vers l'offre
-            self.driver.get(job_url)
-            time.sleep(3)
-            
-            # Vérifier si on est sur la bonne page
-            if not self._verify_job_page():
-                print(f"{COLORS['ERROR']}❌ Page d'offre non reconnue{COLORS['END']}")
-                return False
-            
-            # Chercher le bouton de candidature
-            apply_button = self._find_apply_button()
-            if not apply_button:
-                print(f"{COLORS['ERROR']}❌ Bouton de candidature non trouvé{COLORS['END']}")
-                return False
-            
-            # Cliquer sur le bouton de candidature
-            print(f"{COLORS['INFO']}🔘 Clic sur le bouton de candidature...{COLORS['END']}")
-            self.driver.execute_script("arguments[0].click();", apply_button)
-            time.sleep(3)
-            
-            # Remplir le formulaire de candidature
-            success = self._fill_application_form(personal_info)
-            
-            if success:
-                print(f"{COLORS['SUCCESS']}🎉 Candidature envoyée avec succès!{COLORS['END']}")
-            else:
-                print(f"{COLORS['ERROR']}❌ Échec de l'envoi de la candidature{COLORS['END']}")
-            
+            with span('apply', url=job_url) as apply_span:
+                success = self._apply_steps(job_url, personal_info)
+                if not success:
+                    apply_span.status = 'failed'
+            count('apply.success' if success else 'apply.failure')
             return success
             
         except Exception as e:
-            print(f"{COLORS['ERROR']}❌ Erreur lors de la candidature: {str(e)}{COLORS['END']}")
+            count('apply.failure')
+            log('ERROR', f"❌ Erreur lors de la candidature: {str(e)}")
             return False
+        
+        finally:
+            self._save_session(job_url)
     
-    def _verify_job_page(self):
-        """Vérifie si on est sur une page d'offre d'emploi valide"""
+    def _apply_steps(self, job_url, personal_info):
+        """Étapes de apply_to_job, chacune mesurée dans l'étape 'apply'"""
+        log('INFO', f"📝 Début de la candidature pour: {job_url}")
+        
+        self.waits.timings = []
+        self.check_timings = []
+        self._submit_selector = None
+        
+        # Arriver sur l'offre avec la session déjà établie (scraper, candidatures précédentes)
+        self._restore_session()
+        
+        # Naviguer vers l'offre (son origine n'est jamais bloquée)
+        with span('navigate'):
+            self._allow_origin(job_url)
+            self.driver.get(job_url)
+            self.waits.dom_ready("Chargement de l'offre")
+            self._measure_page_load('offre')
+        
+        # Vérifier si on est sur la bonne page
+        if not self._verify_job_page():
+            log('ERROR', "❌ Page d'offre non reconnue")
+            return False
+        
+        # Chercher le bouton de candidature
+        apply_button, _ = self._find_apply_button()
+        if not apply_button:
+            log('ERROR', "❌ Bouton de candidature non trouvé")
+            return False
+        
+        # Cliquer sur le bouton de candidature
+        log('INFO', "🔘 Clic sur le bouton de candidature...")
+        with span('open_form'):
+            old_url = self.driver.current_url
+            old_handles = self.driver.window_handles
+            fields_before = self.waits.visible_form_fields()
+            self._allow_origin(apply_button.get_attribute('href'))
+            self.driver.execute_script("arguments[0].click();", apply_button)
+            reaction = self.waits.page_change(old_url, old_handles, "Ouverture de la candidature",
+                                              fields_before=fields_before)
+            if reaction == 'window':
+                # Candidature ouverte dans un nouvel onglet: la suivre
+                new_handles = [handle for handle in self.driver.window_handles if handle not in old_handles]
+                self.driver.switch_to.window(new_handles[-1])
+            if reaction != 'form':
+                self.waits.dom_ready("Chargement de la candidature")
+                self._measure_page_load('formulaire')
+        
+        # Remplir le formulaire de candidature
+        success = self._fill_application_form(personal_info)
+        
+        if success:
+            log('SUCCESS', "🎉 Candidature envoyée avec succès!")
+        else:
+            log('ERROR', "❌ Échec de l'envoi de la candidature")
+        log('INFO', f"⏱️ Attentes cumulées: {self.waits.total_ms():.0f} ms")
+        
+        return success
+    
+    def _restore_session(self):
+        """Installe les cookies partagés dans le navigateur"""
+        if not self.session_bridge:
+            return
         try:
-            # Vérifier la présence d'éléments typiques d'une offre
-            indicators = [
-                "offre", "emploi", "job", "poste", "recrutement",
-                "candidature", "apply", "postuler"
-            ]
-            
-            page_text = self.driver.page_source.lower()
-            return any(indicator in page_text for indicator in indicators)
+            restored = self.session_bridge.store_to_driver(self.driver)
+            if restored:
+                log('INFO', f"🍪 Session reprise: {restored} cookie(s)")
+        except Exception as e:
+            log('WARNING', f"⚠️ Cookies non installés: {str(e)}")
+    
+    def _save_session(self, job_url):
+        """Partage les cookies de l'offre et du site avec le scraper et les prochaines exécutions"""
+        if not self.session_bridge or not self.driver:
+            return
+        try:
+            hosts = {urlparse(job_url).hostname, urlparse(self.driver.current_url).hostname}
+            self.session_bridge.driver_to_store(self.driver, hosts)
+        except Exception as e:
+            log('WARNING', f"⚠️ Cookies non enregistrés: {str(e)}")
+    
+    def _allow_origin(self, url):
+        """Retire l'origine d'une URL des blocages avant d'y naviguer"""
+        if url and self.resource_policy.allow(url):
+            self.resource_policy.apply(self.driver)
+    
+    def _measure_page_load(self, label):
+        """Affiche et consigne les octets transférés et les durées de chargement de la page"""
+        try:
+            metrics = self.load_stats.measure(self.driver, label, self.resource_policy.enabled)
+        except Exception:
+            return
+        count('browser.bytes', metrics['bytes'])
+        log('INFO', f"📦 Page {label}: {metrics['bytes'] / 1024:.0f} Ko, {metrics['resources']} ressources, "
+            f"DOM {metrics['dom_ms']:.0f} ms, chargement {metrics['load_ms']:.0f} ms"
+            f"{' (blocage actif)' if self.resource_policy.enabled else ''}")
+    
+    def _check_page(self, check, indicators, selectors=(), url_patterns=()):
+        """
+        Vérifie la page dans le navigateur et mesure la durée de la vérification
+        
+        Args:
+            check (str): Nom de la vérification (pour check_timings)
+            indicators (list): Textes recherchés
+            selectors (list): Sélecteurs CSS dont la présence suffit
+            url_patterns (list): Expressions régulières testées sur l'URL
             
+        Returns:
+            bool: True si une des règles correspond
+        """
+        start = time.perf_counter()
+        try:
+            matched, rule = page_check(self.driver, indicators, selectors, url_patterns)
         except Exception:
-            return False
+            matched, rule = False, None
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.check_timings.append({'check': check, 'ms': elapsed_ms, 'matched': matched, 'rule': rule})
+        log('INFO', f"🔍 {check}: {'oui' if matched else 'non'}"
+            f"{f' ({rule})' if rule else ''} en {elapsed_ms:.0f} ms")
+        return matched
+    
+    def _verify_job_page(self):
+        """Vérifie si on est sur une page d'offre d'emploi valide"""
+        return self._check_page("Page d'offre", self.JOB_PAGE_INDICATORS)
     
     def _find_apply_button(self):
-        """Trouve le bouton de candidature sur la page"""
-        # Sélecteurs possibles pour le bouton de candidature
-        button_selectors = [
-            "//button[contains(text(), 'Postuler')]",
-            "//button[contains(text(), 'Candidater')]",
-            "//button[contains(text(), 'Apply')]",
-            "//a[contains(text(), 'Postuler')]",
-            "//a[contains(text(), 'Candidater')]",
-            "//input[@value='Postuler']",
-            "//input[@value='Candidater']",
-            "//button[contains(@class, 'postuler')]",
-            "//button[contains(@class, 'candidater')]",
-            "//button[contains(@class, 'apply')]",
-            "//a[contains(@class, 'postuler')]",
-            "//a[contains(@class, 'candidater')]"
-        ]
-        
-        for selector in button_selectors:
-            try:
-                button = self.wait.until(
-                    EC.element_to_be_clickable((By.XPATH, selector))
-                )
-                if button and button.is_displayed():
-                    return button
-            except TimeoutException:
-                continue
-        
-        # Essayer de trouver par ID ou classe CSS
-        css_selectors = [
-            "#postuler", "#candidater", "#apply",
-            ".postuler", ".candidater", ".apply",
-            "[data-testid='postuler']", "[data-testid='candidater']"
-        ]
+        """
+        Trouve le bouton de candidature sur la page
         
-        for selector in css_selectors:
-            try:
-                button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                if button and button.is_displayed():
-                    return button
-            except NoSuchElementException:
-                continue
+        Toutes les règles sont évaluées ensemble dans le navigateur, en un seul
+        appel par vérification, sous un délai global unique.
         
-        return None
+        Returns:
+            tuple: (bouton, règle qui l'a trouvé), ou (None, None)
+        """
+        with span('find_button') as button_span:
+            found = self.waits.until(
+                "Bouton de candidature",
+                lambda d: d.execute_script(_FIND_FIRST_CLICKABLE_JS, self.APPLY_BUTTON_RULES)
+            )
+            if not found:
+                button_span.status = 'not_found'
+                return None, None
+            
+            button, rule = found
+            button_span.set(rule=rule)
+        log('INFO', f"🔎 Bouton trouvé par la règle: {rule}")
+        return button, rule
     
     def _fill_application_form(self, personal_info):
         """Remplit le formulaire de candidature"""
         try:
-            print(f"{COLORS['INFO']}📋 Remplissage du formulaire de candidature...{COLORS['END']}")
-            
-            # Attendre que le formulaire soit chargé
-            time.sleep(3)
-            
-            # Remplir les informations personnelles si fournies
-            if personal_info:
-                self._fill_personal_info(personal_info)
+            log('INFO', "📋 Remplissage du formulaire de candidature...")
+            
+            with span('fill') as fill_span:
+                # Attendre que le formulaire soit chargé
+                self.waits.form_present("Formulaire de candidature")
+                
+                # Lire tous les champs du formulaire en un seul appel
+                fields = self._read_form_schema()
+                domain = urlparse(self.driver.current_url).netloc
+                fingerprint = FormTemplates.fingerprint(fields)
+                
+                # Rejouer le modèle appris pour ce portail, sinon découvrir le formulaire
+                start = time.perf_counter()
+                template = self.form_templates.get(domain, fingerprint) if self.form_templates else None
+                plan = self.form_templates.replay(template, fields) if template else None
+                if template and plan is None:
+                    log('WARNING', f"⚠️ Modèle de formulaire obsolète pour {domain}, nouvelle découverte")
+                    self.form_templates.forget(domain, fingerprint)
+                    template = None
+                if plan is None:
+                    plan = self._discover_form(fields)
+                plan_ms = (time.perf_counter() - start) * 1000
+                fill_span.set(domain=domain, fields=len(fields), template=bool(template))
+                
+                # Remplir les informations personnelles et les champs complémentaires
+                values = {}
+                for field_type, field in plan['personal'].items():
+                    if personal_info and field_type in personal_info:
+                        values[field['index']] = personal_info[field_type]
+                for key, field in plan['extras'].items():
+                    if not field['value']:
+                        values[field['index']] = self.DEFAULT_FIELD_TEXTS[key.split('-')[0]]
+                self._apply_form_values(fields, values)
             
             # Uploader le CV
             if self.cv_path:
-                self._upload_cv()
+                self._upload_cv(plan['files'].get('cv'))
             
             # Uploader la lettre de motivation
             if self.cover_letter_path:
-                self._upload_cover_letter()
-            
-            # Remplir d'autres champs si nécessaire
-            self._fill_additional_fields()
+                self._upload_cover_letter(plan['files'].get('cover_letter'))
             
             # Soumettre le formulaire
-            return self._submit_form()
+            success = self._submit_form(template['submit'] if template else None)
             
         except Exception as e:
-            print(f"{COLORS['ERROR']}❌ Erreur lors du remplissage du formulaire: {str(e)}{COLORS['END']}")
+            log('ERROR', f"❌ Erreur lors du remplissage du formulaire: {str(e)}")
             return False
+        
+        if self.form_templates and success:
+            self._remember_form(domain, fingerprint, template, plan, plan_ms + self._submit_search_ms)
+        return success
+    
+    def _remember_form(self, domain, fingerprint, template, plan, elapsed_ms):
+        """
+        Mémorise le modèle d'un formulaire soumis avec succès
+        
+        La candidature est déjà envoyée: une erreur d'enregistrement du modèle
+        est signalée sans la faire passer pour un échec.
+        """
+        try:
+            if template and self._submit_selector == template['submit']:
+                self.form_templates.record_hit(domain, fingerprint, elapsed_ms)
+            else:
+                locators = self._plan_locators(plan)
+                if locators:
+                    self.form_templates.learn(domain, fingerprint, locators, self._submit_selector, elapsed_ms)
+            log('INFO', f"📐 {self.form_templates.format_report()}")
+        except Exception as e:
+            log('WARNING', f"⚠️ Modèle de formulaire non enregistré: {str(e)}")
+    
+    def _read_form_schema(self):
+        """
+        Décrit tous les champs de la page en un seul appel au navigateur
+        
+        Returns:
+            list: Un dict par champ (element, index, tag, type, id, name,
+                placeholder, label, value, visible), dans l'ordre du document
+        """
+        start = time.perf_counter()
+        fields = self.driver.execute_script(_FORM_SCHEMA_JS) or []
+        log('INFO', f"🧾 {len(fields)} champs lus en {(time.perf_counter() - start) * 1000:.0f} ms")
+        return fields
     
-    def _fill_personal_info(self, personal_info):
-        """Remplit les informations personnelles"""
+    def _discover_form(self, fields):
+        """
+        Repère les champs utiles du formulaire
+        
+        Returns:
+            dict: Champs par groupe: 'personal' (type d'information -> champ),
+                'extras' (type de texte par défaut -> champ), 'files' ('cv', 'cover_letter')
+        """
+        personal = self._match_personal_info(fields)
+        taken = {field['index'] for field in personal.values()}
+        files = {}
+        for key, keywords in (('cv', ['cv', 'resume', 'curriculum']),
+                              ('cover_letter', ['lettre', 'motivation', 'cover'])):
+            field = self._find_file_field(fields, keywords)
+            if field is not None:
+                files[key] = field
+        return {'personal': personal, 'extras': self._match_additional_fields(fields, taken), 'files': files}
+    
+    @staticmethod
+    def _plan_locators(plan):
+        """
+        Localisateurs [attribut, valeur] des champs d'un plan, pour un modèle
+        
+        Returns:
+            dict: Plan sous forme de localisateurs, ou None si un champ n'a ni ID, ni name, ni placeholder
+        """
+        locators = {}
+        for group, entries in plan.items():
+            locators[group] = {}
+            for key, field in entries.items():
+                attribute = next((a for a in ('id', 'name', 'placeholder') if field[a]), None)
+                if attribute is None:
+                    return None
+                locators[group][key] = [attribute, field[attribute]]
+        return locators
+    
+    def _match_personal_info(self, fields):
+        """
+        Associe chaque type d'information personnelle à un champ du formulaire
+        
+        Returns:
+            dict: Type d'information -> champ
+        """
         field_mappings = {
             'nom': ['nom', 'name', 'lastname', 'nom_famille'],
             'prenom': ['prenom', 'firstname', 'prenom'],
@@ -248,206 +572,270 @@ class SeleniumHandler:
             'code_postal': ['code_postal', 'postal_code', 'cp', 'zip']
         }
         
+        matches = {}
         for field_type, possible_names in field_mappings.items():
-            if field_type in personal_info:
-                value = personal_info[field_type]
-                self._fill_field_by_name(possible_names, value)
+            field = self._find_field_by_name(fields, possible_names)
+            if field is not None:
+                matches[field_type] = field
+        return matches
     
-    def _fill_field_by_name(self, field_names, value):
-        """Remplit un champ par son nom"""
+    def _find_field_by_name(self, fields, field_names):
+        """
+        Trouve le champ correspondant à un des noms (par ID, puis name, puis placeholder)
+        
+        Returns:
+            dict: Champ trouvé, ou None
+        """
         for name in field_names:
-            try:
-                # Essayer par ID
-                field = self.driver.find_element(By.ID, name)
-                field.clear()
-                field.send_keys(value)
-                return
-            except NoSuchElementException:
-                pass
-            
-            try:
-                # Essayer par name
-                field = self.driver.find_element(By.NAME, name)
-                field.clear()
-                field.send_keys(value)
-                return
-            except NoSuchElementException:
-                pass
-            
-            try:
-                # Essayer par placeholder
-                field = self.driver.find_element(By.XPATH, f"//input[@placeholder='{name}']")
-                field.clear()
-                field.send_keys(value)
-                return
-            except NoSuchElementException:
-                pass
-    
-    def _upload_cv(self):
-        """Upload le CV"""
+            for field in fields:
+                if field['id'] == name:
+                    return field
+            for field in fields:
+                if field['name'] == name:
+                    return field
+            for field in fields:
+                if field['tag'] == 'input' and field['placeholder'] == name:
+                    return field
+        return None
+    
+    def _find_file_field(self, fields, keywords):
+        """
+        Premier champ fichier dont le name ou l'ID contient un des mots-clés
+        
+        Returns:
+            dict: Champ trouvé, ou None
+        """
+        for attribute in ('name', 'id'):
+            for keyword in keywords:
+                for field in fields:
+                    if field['type'] == 'file' and keyword in field[attribute].lower():
+                        return field
+        return None
+    
+    def _upload_cv(self, field):
+        """Upload le CV dans le champ fichier repéré (None s'il n'y en a pas)"""
         try:
-            print(f"{COLORS['INFO']}📄 Upload du CV...{COLORS['END']}")
-            
-            # Sélecteurs pour les champs de fichier CV
-            cv_selectors = [
-                "input[type='file'][name*='cv']",
-                "input[type='file'][name*='resume']",
-                "input[type='file'][name*='curriculum']",
-                "input[type='file'][id*='cv']",
-                "input[type='file'][id*='resume']",
-                "//input[@type='file' and contains(@name, 'cv')]",
-                "//input[@type='file' and contains(@name, 'resume')]"
-            ]
-            
-            for selector in cv_selectors:
-                try:
-                    if selector.startswith("//"):
-                        file_input = self.driver.find_element(By.XPATH, selector)
-                    else:
-                        file_input = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    
-                    if file_input:
-                        file_input.send_keys(os.path.abspath(self.cv_path))
-                        print(f"{COLORS['SUCCESS']}✅ CV uploadé avec succès{COLORS['END']}")
-                        return True
-                except NoSuchElementException:
-                    continue
-            
-            print(f"{COLORS['WARNING']}⚠️ Champ d'upload CV non trouvé{COLORS['END']}")
-            return False
-            
+            with span('upload', document='cv') as upload_span:
+                log('INFO', "📄 Upload du CV...")
+                
+                if field is not None:
+                    field['element'].send_keys(os.path.abspath(self.cv_path))
+                    log('SUCCESS', "✅ CV uploadé avec succès")
+                    return True
+                
+                upload_span.status = 'not_found'
+                log('WARNING', "⚠️ Champ d'upload CV non trouvé")
+                return False
+                
         except Exception as e:
-            print(f"{COLORS['ERROR']}❌ Erreur lors de l'upload du CV: {str(e)}{COLORS['END']}")
+            log('ERROR', f"❌ Erreur lors de l'upload du CV: {str(e)}")
             return False
     
-    def _upload_cover_letter(self):
-        """Upload la lettre de motivation"""
+    def _upload_cover_letter(self, field):
+        """Upload la lettre de motivation dans le champ fichier repéré (None s'il n'y en a pas)"""
         try:
-            print(f"{COLORS['INFO']}📝 Upload de la lettre de motivation...{COLORS['END']}")
-            
-            # Sélecteurs pour les champs de fichier lettre de motivation
-            letter_selectors = [
-                "input[type='file'][name*='lettre']",
-                "input[type='file'][name*='motivation']",
-                "input[type='file'][name*='cover']",
-                "input[type='file'][id*='lettre']",
-                "input[type='file'][id*='motivation']",
-                "//input[@type='file' and contains(@name, 'lettre')]",
-                "//input[@type='file' and contains(@name, 'motivation')]"
-            ]
-            
-            for selector in letter_selectors:
-                try:
-                    if selector.startswith("//"):
-                        file_input = self.driver.find_element(By.XPATH, selector)
-                    else:
-                        file_input = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    
-                    if file_input:
-                        file_input.send_keys(os.path.abspath(self.cover_letter_path))
-                        print(f"{COLORS['SUCCESS']}✅ Lettre de motivation uploadée avec succès{COLORS['END']}")
-                        return True
-                except NoSuchElementException:
-                    continue
-            
-            print(f"{COLORS['WARNING']}⚠️ Champ d'upload lettre de motivation non trouvé{COLORS['END']}")
-            return False
-            
+            with span('upload', document='cover_letter') as upload_span:
+                log('INFO', "📝 Upload de la lettre de motivation...")
+                
+                if field is not None:
+                    field['element'].send_keys(os.path.abspath(self.cover_letter_path))
+                    log('SUCCESS', "✅ Lettre de motivation uploadée avec succès")
+                    return True
+                
+                upload_span.status = 'not_found'
+                log('WARNING', "⚠️ Champ d'upload lettre de motivation non trouvé")
+                return False
+                
         except Exception as e:
-            print(f"{COLORS['ERROR']}❌ Erreur lors de l'upload de la lettre de motivation: {str(e)}{COLORS['END']}")
+            log('ERROR', f"❌ Erreur lors de l'upload de la lettre de motivation: {str(e)}")
             return False
     
-    def _fill_additional_fields(self):
-        """Remplit d'autres champs du formulaire si nécessaire"""
-        try:
-            # Chercher des champs texte vides et essayer de les remplir
-            text_fields = self.driver.find_elements(By.CSS_SELECTOR, "input[type='text'], textarea")
+    def _match_additional_fields(self, fields, taken):
+        """
+        Repère les champs texte auxquels donner une valeur par défaut
+        
+        Args:
+            fields (list): Champs du formulaire
+            taken (set): Index des champs déjà associés aux informations personnelles
             
-            for field in text_fields:
-                try:
-                    if not field.get_attribute('value') and field.is_displayed():
-                        # Essayer de deviner le type de champ par son nom/id/placeholder
-                        field_id = field.get_attribute('id', '').lower()
-                        field_name = field.get_attribute('name', '').lower()
-                        placeholder = field.get_attribute('placeholder', '').lower()
-                        
-                        # Valeurs par défaut selon le type de champ
-                        if any(keyword in field_id + field_name + placeholder for keyword in ['message', 'comment', 'motivation']):
-                            field.send_keys("Je suis très intéressé(e) par ce poste et souhaite vous faire parvenir ma candidature.")
-                        elif any(keyword in field_id + field_name + placeholder for keyword in ['experience', 'competence']):
-                            field.send_keys("Voir CV joint")
-                except Exception:
-                    continue
-                    
-        except Exception as e:
-            print(f"{COLORS['WARNING']}⚠️ Erreur lors du remplissage des champs supplémentaires: {str(e)}{COLORS['END']}")
-    
-    def _submit_form(self):
-        """Soumet le formulaire de candidature"""
-        try:
-            print(f"{COLORS['INFO']}🚀 Soumission du formulaire...{COLORS['END']}")
+        Returns:
+            dict: Clé 'type-n' (voir DEFAULT_FIELD_TEXTS) -> champ
+        """
+        extras = {}
+        for field in fields:
+            if field['index'] in taken or field['value'] or not field['visible']:
+                continue
+            if not (field['tag'] == 'textarea' or field['type'] == 'text'):
+                continue
             
-            # Sélecteurs pour le bouton de soumission
-            submit_selectors = [
-                "//button[contains(text(), 'Envoyer')]",
-                "//button[contains(text(), 'Soumettre')]",
-                "//button[contains(text(), 'Submit')]",
-                "//button[contains(text(), 'Postuler')]",
-                "//input[@type='submit']",
-                "//button[@type='submit']",
-                "button[type='submit']",
-                "input[type='submit']",
-                ".submit", ".envoyer", ".postuler"
-            ]
+            # Deviner le type de champ par son ID, son nom, son placeholder ou son label
+            hint = ' '.join([field['id'], field['name'], field['placeholder'], field['label']]).lower()
             
-            for selector in submit_selectors:
-                try:
-                    if selector.startswith("//"):
-                        submit_button = self.driver.find_element(By.XPATH, selector)
-                    else:
-                        submit_button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    
-                    if submit_button and submit_button.is_displayed():
-                        self.driver.execute_script("arguments[0].click();", submit_button)
-                        time.sleep(5)  # Attendre la soumission
-                        
-                        # Vérifier si la soumission a réussi
-                        if self._verify_submission_success():
-                            return True
+            if any(keyword in hint for keyword in ['message', 'comment', 'motivation']):
+                extras[f"message-{len(extras)}"] = field
+            elif any(keyword in hint for keyword in ['experience', 'competence']):
+                extras[f"experience-{len(extras)}"] = field
+        return extras
+    
+    def _apply_form_values(self, fields, values):
+        """Saisit toutes les valeurs en un seul appel au navigateur"""
+        if not values:
+            return
+        by_index = {field['index']: field for field in fields}
+        filled = self.driver.execute_script(
+            _FILL_FIELDS_JS, [[by_index[index]['element'], str(value)] for index, value in values.items()]
+        )
+        log('INFO', f"✏️ {filled} champ(s) rempli(s)")
+    
+    def _submit_form(self, preferred_selector=None):
+        """
+        Soumet le formulaire de candidature
+        
+        Args:
+            preferred_selector (str): Sélecteur à essayer en premier (modèle appris)
+        
+        Le sélecteur qui a abouti et le temps passé à chercher le bouton sont
+        conservés dans _submit_selector et _submit_search_ms.
+        """
+        self._submit_selector = None
+        self._submit_search_ms = 0.0
+        try:
+            with span('submit') as submit_span:
+                log('INFO', "🚀 Soumission du formulaire...")
+                
+                # Sélecteurs pour le bouton de soumission
+                submit_selectors = [
+                    "//button[contains(text(), 'Envoyer')]",
+                    "//button[contains(text(), 'Soumettre')]",
+                    "//button[contains(text(), 'Submit')]",
+                    "//button[contains(text(), 'Postuler')]",
+                    "//input[@type='submit']",
+                    "//button[@type='submit']",
+                    "button[type='submit']",
+                    "input[type='submit']",
+                    ".submit", ".envoyer", ".postuler"
+                ]
+                if preferred_selector:
+                    submit_selectors = [preferred_selector] + [s for s in submit_selectors if s != preferred_selector]
+                
+                for selector in submit_selectors:
+                    start = time.perf_counter()
+                    try:
+                        if selector.startswith("//"):
+                            submit_button = self.driver.find_element(By.XPATH, selector)
+                        else:
+                            submit_button = self.driver.find_element(By.CSS_SELECTOR, selector)
                         
-                except NoSuchElementException:
-                    continue
-            
-            print(f"{COLORS['WARNING']}⚠️ Bouton de soumission non trouvé{COLORS['END']}")
-            return False
-            
+                        displayed = submit_button and submit_button.is_displayed()
+                        self._submit_search_ms += (time.perf_counter() - start) * 1000
+                        if displayed:
+                            self._submit_selector = selector
+                            old_url = self.driver.current_url
+                            # Signes de succès déjà présents avant l'envoi: ils ne prouvent rien
+                            baseline = page_matches(self.driver, self.SUCCESS_INDICATORS,
+                                                    self.SUCCESS_SELECTORS, self.SUCCESS_URL_PATTERNS)
+                            self.waits.watch_network()
+                            self.driver.execute_script("arguments[0].click();", submit_button)
+                            
+                            # Attendre la confirmation, puis toujours la fin des requêtes de
+                            # soumission: la page ne doit pas être quittée avant l'envoi complet
+                            reaction = self.waits.submission(
+                                old_url, self.SUCCESS_INDICATORS, self.SUCCESS_SELECTORS, self.SUCCESS_URL_PATTERNS,
+                                baseline=baseline
+                            )
+                            self.waits.network_idle("Fin de la soumission")
+                            submit_span.set(selector=selector, reaction=reaction)
+                            
+                            # Nouvelle page: vérifier qu'elle confirme l'envoi
+                            if reaction == 'text' or (reaction == 'url' and self._verify_submission_success()):
+                                return True
+                            
+                            # Bouton cliqué sans confirmation: ne pas cliquer d'autres boutons
+                            submit_span.status = 'unconfirmed'
+                            log('WARNING', f"⚠️ Soumission sans confirmation ({selector})")
+                            return False
+                            
+                    except NoSuchElementException:
+                        self._submit_search_ms += (time.perf_counter() - start) * 1000
+                        continue
+                
+                submit_span.status = 'not_found'
+                log('WARNING', "⚠️ Bouton de soumission non trouvé")
+                return False
+                
         except Exception as e:
-            print(f"{COLORS['ERROR']}❌ Erreur lors de la soumission: {str(e)}{COLORS['END']}")
+            log('ERROR', f"❌ Erreur lors de la soumission: {str(e)}")
             return False
     
     def _verify_submission_success(self):
         """Vérifie si la soumission a réussi"""
+        return self._check_page(
+            "Confirmation d'envoi", self.SUCCESS_INDICATORS, self.SUCCESS_SELECTORS, self.SUCCESS_URL_PATTERNS
+        )
+    
+    @property
+    def submitted(self):
+        """True si le formulaire de la dernière candidature a été soumis (clic sur l'envoi)"""
+        return self._submit_selector is not None
+    
+    def is_alive(self):
+        """
+        Vérifie que le navigateur répond encore
+
+        Returns:
+            bool: True si le driver est utilisable
+        """
+        if not self.driver:
+            return False
         try:
-            # Chercher des indicateurs de succès
-            success_indicators = [
-                "candidature envoyée", "merci", "confirmation",
-                "success", "envoyé", "réussi"
-            ]
-            
-            page_text = self.driver.page_source.lower()
-            return any(indicator in page_text for indicator in success_indicators)
-            
+            self.driver.window_handles
+            return True
         except Exception:
             return False
-    
+
+    def reset_session(self):
+        """
+        Prépare le navigateur pour une nouvelle candidature
+
+        Ferme les onglets supplémentaires, efface le stockage de session (état
+        propre à l'offre en cours) et revient sur une page vide. Les cookies et
+        le stockage local (connexion, consentement) sont conservés: ils font
+        l'intérêt du profil persistant et du magasin de cookies partagé.
+
+        Returns:
+            bool: True si le navigateur est prêt à être réutilisé
+        """
+        try:
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+
+            # Le stockage est propre à l'origine: le vider avant de quitter la page
+            try:
+                self.driver.execute_script("window.sessionStorage.clear();")
+            except WebDriverException:
+                pass  # about:blank ou page sans stockage accessible
+
+            self.driver.get('about:blank')
+            self.resource_policy.reset()
+            self.resource_policy.apply(self.driver)
+            self.cv_path = None
+            self.cover_letter_path = None
+            return True
+        except Exception as e:
+            log('WARNING', f"⚠️ Réinitialisation du navigateur impossible: {str(e)}")
+            return False
+
     def close(self):
         """Ferme le navigateur"""
         if self.driver:
             try:
                 self.driver.quit()
-                print(f"{COLORS['SUCCESS']}✅ Navigateur fermé{COLORS['END']}")
+                log('SUCCESS', "✅ Navigateur fermé")
             except Exception as e:
-                print(f"{COLORS['WARNING']}⚠️ Erreur lors de la fermeture du navigateur: {str(e)}{COLORS['END']}")
+                log('WARNING', f"⚠️ Erreur lors de la fermeture du navigateur: {str(e)}")
     
     def __enter__(self):
         """Context manager entry"""
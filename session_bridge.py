@@ -0,0 +1,246 @@
+"""
+Pont de session entre le client HTTP du scraper et le navigateur Selenium
+
+Les cookies sont échangés dans les deux sens (requests.Session <-> Chrome) et
+conservés dans un magasin JSON entre les exécutions: le navigateur arrive sur
+l'offre avec la session et le consentement déjà établis, et les étapes HTTP
+peuvent réutiliser la session du navigateur.
+
+Seuls les cookies du site (COOKIE_DOMAINS) et des offres visitées sont repris
+du navigateur, jamais ceux des domaines tiers (mesure d'audience, publicité).
+Les cookies de session (sans date d'expiration) restent en mémoire: seuls les
+cookies persistants sont écrits sur disque.
+"""
+
+import os
+import threading
+import time
+
+from config import COOKIE_STORE_FILE, COOKIE_DOMAINS
+from file_store import file_lock, read_json, write_json
+
+
+def _cookie_key(cookie):
+    return (cookie['domain'], cookie['path'], cookie['name'])
+
+
+def _domain_matches(cookie_domain, domains):
+    """Cookie d'un des domaines (ou de leurs sous-domaines, ou d'un domaine parent d'un hôte visité)"""
+    cookie_domain = cookie_domain.lstrip('.').lower()
+    for domain in domains:
+        domain = domain.lower()
+        if cookie_domain == domain or cookie_domain.endswith('.' + domain) or domain.endswith('.' + cookie_domain):
+            return True
+    return False
+
+
+class SessionBridge:
+    """Magasin de cookies partagé entre requests et Selenium"""
+
+    def __init__(self, path=COOKIE_STORE_FILE, domains=COOKIE_DOMAINS):
+        """
+        Initialise le pont
+
+        Args:
+            path (str): Fichier JSON du magasin de cookies (None pour rester en mémoire)
+            domains (list): Domaines dont les cookies du navigateur sont repris
+        """
+        self.path = path
+        self.domains = list(domains)
+        self._lock = threading.Lock()
+        self._cookies = {}
+        # Cookies modifiés depuis le dernier enregistrement
+        self._changed = set()
+        self.load()
+
+    def _read_file(self):
+        """Cookies valides du fichier (aucun s'il est absent ou illisible)"""
+        data = read_json(self.path, {})
+        cookies = data.get('cookies') if isinstance(data, dict) else None
+        return {_cookie_key(c): c for c in cookies or [] if not self._expired(c)}
+
+    def load(self):
+        """Charge les cookies enregistrés, sans ceux qui ont expiré"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        cookies = self._read_file()
+        with self._lock:
+            self._cookies = cookies
+
+    def save(self):
+        """
+        Enregistre les cookies sur disque
+
+        Le fichier est relu sous verrou et seuls les cookies modifiés par ce
+        processus y sont reportés: ceux enregistrés entre-temps par les autres
+        processus sont conservés (et repris en mémoire).
+        """
+        if not self.path:
+            return
+        with file_lock(self.path):
+            cookies = self._read_file()
+            with self._lock:
+                for key in self._changed:
+                    if key in self._cookies:
+                        cookies[key] = self._cookies[key]
+                # Les cookies de session ne survivent pas à l'exécution: gardés en mémoire seulement
+                write_json(self.path, {'version': 1, 'cookies': [c for c in cookies.values() if c.get('expires')]})
+                for key, cookie in self._cookies.items():
+                    if not cookie.get('expires'):
+                        cookies.setdefault(key, cookie)
+                self._cookies = cookies
+                self._changed.clear()
+
+    @staticmethod
+    def _expired(cookie):
+        expires = cookie.get('expires')
+        return expires is not None and 0 < expires < time.time()
+
+    def cookies(self):
+        """Cookies valides du magasin (format commun, proche de Chrome DevTools)"""
+        with self._lock:
+            return [c for c in self._cookies.values() if not self._expired(c)]
+
+    def merge(self, cookies):
+        """
+        Ajoute ou remplace des cookies dans le magasin, puis l'enregistre
+
+        Args:
+            cookies (list): Cookies au format commun
+        """
+        with self._lock:
+            for cookie in cookies:
+                self._cookies[_cookie_key(cookie)] = cookie
+                self._changed.add(_cookie_key(cookie))
+        self.save()
+
+    # --- requests.Session -------------------------------------------------
+
+    @staticmethod
+    def export_session(session):
+        """
+        Cookies d'une session requests au format commun
+
+        Args:
+            session (requests.Session): Session du scraper
+
+        Returns:
+            list: Cookies (name, value, domain, path, secure, httpOnly, expires)
+        """
+        cookies = []
+        for cookie in session.cookies:
+            cookies.append({
+                'name': cookie.name,
+                'value': cookie.value,
+                'domain': cookie.domain,
+                'path': cookie.path or '/',
+                'secure': bool(cookie.secure),
+                'httpOnly': cookie.has_nonstandard_attr('HttpOnly'),
+                'expires': cookie.expires,
+            })
+        return cookies
+
+    @staticmethod
+    def import_session(session, cookies):
+        """
+        Installe des cookies au format commun dans une session requests
+
+        Returns:
+            int: Nombre de cookies installés
+        """
+        for cookie in cookies:
+            expires = cookie.get('expires')
+            session.cookies.set(
+                cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie.get('path', '/'),
+                secure=cookie.get('secure', False),
+                expires=int(expires) if expires and expires > 0 else None,
+                rest={'HttpOnly': None} if cookie.get('httpOnly') else {},
+            )
+        return len(cookies)
+
+    # --- Selenium (Chrome DevTools) ---------------------------------------
+
+    @staticmethod
+    def export_driver(driver, domains=None):
+        """
+        Cookies du navigateur au format commun
+
+        Args:
+            driver (WebDriver): Navigateur Chrome
+            domains (list): Domaines retenus (None: tous les domaines)
+
+        Returns:
+            list: Cookies au format commun
+        """
+        cookies = []
+        for cookie in driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', []):
+            if domains is not None and not _domain_matches(cookie['domain'], domains):
+                continue
+            cookies.append({
+                'name': cookie['name'],
+                'value': cookie['value'],
+                'domain': cookie['domain'],
+                'path': cookie.get('path', '/'),
+                'secure': cookie.get('secure', False),
+                'httpOnly': cookie.get('httpOnly', False),
+                # -1 (ou session=True) pour un cookie de session
+                'expires': None if cookie.get('session') or cookie.get('expires', -1) < 0 else cookie['expires'],
+            })
+        return cookies
+
+    @staticmethod
+    def import_driver(driver, cookies):
+        """
+        Installe des cookies dans le navigateur en un seul appel, sans visiter leurs domaines
+
+        Returns:
+            int: Nombre de cookies installés
+        """
+        params = []
+        for cookie in cookies:
+            param = {key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly')
+                     if cookie.get(key) is not None}
+            if cookie.get('expires'):
+                param['expires'] = cookie['expires']
+            params.append(param)
+        if params:
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': params})
+        return len(params)
+
+    # --- Transferts -------------------------------------------------------
+
+    def session_to_store(self, session):
+        """Enregistre les cookies de la session requests dans le magasin"""
+        self.merge(self.export_session(session))
+
+    def store_to_session(self, session):
+        """Installe les cookies du magasin dans la session requests"""
+        return self.import_session(session, self.cookies())
+
+    def driver_to_store(self, driver, hosts=()):
+        """
+        Enregistre dans le magasin les cookies du navigateur propres au site
+
+        Args:
+            driver (WebDriver): Navigateur Chrome
+            hosts (iterable): Hôtes visités (offre, portail de candidature) dont
+                les cookies sont aussi repris
+        """
+        self.merge(self.export_driver(driver, self.domains + [host for host in hosts if host]))
+
+    def store_to_driver(self, driver):
+        """Installe les cookies du magasin dans le navigateur"""
+        return self.import_driver(driver, self.cookies())
+
+
+_default_bridge = None
+_default_lock = threading.Lock()
+
+
+def get_session_bridge():
+    """Magasin de cookies partagé par le scraper et les navigateurs du processus"""
+    global _default_bridge
+    with _default_lock:
+        if _default_bridge is None:
+            _default_bridge = SessionBridge()
+        return _default_bridge
@@ -0,0 +1,47 @@
+"""
+Configuration commune des tests: modules du projet et des benchmarks importables,
+aucune écriture dans data/
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import instrumentation  # noqa: E402
+from pole_emploi_scraper import PoleEmploiScraper  # noqa: E402
+from rate_limiter import RateLimiter  # noqa: E402
+from selector_stats import SelectorStats  # noqa: E402
+from standin_server import StandInServer  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def no_telemetry_files(monkeypatch):
+    """Instrumentation en mémoire: ni journal JSONL ni résumé sur disque"""
+    monkeypatch.setattr(instrumentation, 'TELEMETRY_JSONL_FILE', None)
+    monkeypatch.setattr(instrumentation, 'TELEMETRY_SUMMARY_FILE', None)
+    instrumentation._default = None
+    yield
+    instrumentation._default = None
+
+
+def offline_scraper(server=None, rate_limiter=None, selector_stats=None):
+    """Scraper sans cache, cookies ni statistiques persistés, pointé sur le serveur local"""
+    scraper = PoleEmploiScraper(rate_limiter=rate_limiter or RateLimiter(0),
+                                selector_stats=selector_stats or SelectorStats(None),
+                                http_cache=False, session_bridge=False)
+    if server is not None:
+        scraper.base_url = server.url
+        scraper.search_url = server.search_url
+    return scraper
+
+
+@pytest.fixture
+def standin():
+    """Serveur local de remplacement (120 offres, 20 par page, sans latence ni erreur)"""
+    with StandInServer() as server:
+        yield server
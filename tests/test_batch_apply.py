@@ -0,0 +1,139 @@
+"""
+Candidatures groupées contre le serveur local: une seule soumission par offre, reprise sur le journal
+
+Le navigateur est remplacé par un envoi HTTP direct du formulaire du serveur
+local; le pool, les processus, la pré-vérification et le journal sont réels.
+"""
+
+import multiprocessing
+import os
+from urllib.parse import urlparse
+
+import pytest
+import requests
+
+import driver_pool
+from batch_apply import ApplicationJournal, run_batch
+from conftest import offline_scraper
+from preflight import OfferPreflight, EXTERNAL
+from standin_server import StandInServer
+
+
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                                reason="les remplacements doivent être hérités par les processus")
+
+PERSONAL_INFO = {'nom': 'Test', 'prenom': 'Lot', 'email': 'lot@example.com'}
+
+
+class FakeDriver:
+    window_handles = ['main']
+
+    def quit(self):
+        pass
+
+    def save_screenshot(self, path):
+        with open(path, 'wb') as f:
+            f.write(b'png')
+        return True
+
+
+def _setup_driver(self):
+    self.driver = FakeDriver()
+    return True
+
+
+def _apply_to_job(self, job_url, personal_info=None):
+    """Envoie le formulaire de l'offre comme le ferait le navigateur (échec imposé pour les offres FAILING)"""
+    self._submit_selector = None
+    requests.get(job_url, timeout=10)  # Page de départ, comme le navigateur
+    offer_id = job_url.rstrip('/').rsplit('/', 1)[-1]
+    if offer_id in os.environ.get('FAILING_OFFERS', '').split(','):
+        return False
+    base_url = '{0.scheme}://{0.netloc}'.format(urlparse(job_url))
+    with open(self.cv_path, 'rb') as cv:
+        response = requests.post(f"{base_url}/candidature/envoi/{offer_id}", data=personal_info,
+                                 files={'cv': ('cv.pdf', cv)}, timeout=10)
+    self._submit_selector = 'button[type="submit"]'
+    return response.ok
+
+
+@pytest.fixture
+def batch(monkeypatch, tmp_path):
+    monkeypatch.setattr(driver_pool.SeleniumHandler, 'setup_driver', _setup_driver)
+    monkeypatch.setattr(driver_pool.SeleniumHandler, 'apply_to_job', _apply_to_job)
+    monkeypatch.setattr(driver_pool.SeleniumHandler, 'reset_session', lambda self: True)
+    monkeypatch.setattr(driver_pool.SeleniumHandler, 'is_alive', lambda self: True)
+    cv_path = tmp_path / 'cv.pdf'
+    cv_path.write_bytes(b'%PDF-1.4')
+
+    with StandInServer(offers=10, expired_rate=0.3, seed=7) as server:
+        live = [offer for offer in server.offers if not offer['expired']]
+        monkeypatch.setenv('FAILING_OFFERS', live[0]['id'])
+        jobs = [{'url': server.offer_url(offer['id']), 'offer_id': offer['id']} for offer in server.offers]
+
+        def run(**options):
+            options.setdefault('preflight', OfferPreflight(scraper=offline_scraper(server)))
+            return run_batch(jobs, PERSONAL_INFO, str(cv_path), str(cv_path), workers=2,
+                             journal_path=str(tmp_path / 'journal.jsonl'),
+                             screenshot_dir=str(tmp_path / 'captures'), **options)
+
+        yield server, jobs, run, tmp_path
+
+
+def test_batch_submits_each_live_offer_once(batch):
+    server, jobs, run, tmp_path = batch
+    expired = sum(1 for offer in server.offers if offer['expired'])
+    assert 0 < expired < len(jobs) - 1
+
+    summary = run()
+
+    assert summary['expired'] == expired
+    assert summary['failed'] == 1
+    assert summary['success'] == len(jobs) - expired - 1
+    submissions = server.stats()['submissions']
+    expected = [offer['id'] for offer in server.offers
+                if not offer['expired'] and offer['id'] != os.environ['FAILING_OFFERS']]
+    assert sorted(s['offer_id'] for s in submissions) == sorted(expected)
+    assert all(s['files'] == 1 for s in submissions)
+    # Capture d'écran pour l'échec seulement
+    assert len(os.listdir(tmp_path / 'captures')) == 1
+
+
+def test_rerun_resumes_from_the_journal_without_resubmitting(batch):
+    server, jobs, run, tmp_path = batch
+    first = run()
+    submitted = len(server.stats()['submissions'])
+
+    second = run()
+    assert second['skipped'] == len(jobs)
+    assert second['success'] == 0
+
+    # Relance des échecs: l'offre en échec est retentée, les expirées revérifiées, les envoyées ignorées
+    third = run(retry_failed=True)
+    assert third['skipped'] == first['success']
+    assert third['failed'] == 1
+    assert third['expired'] == first['expired']
+
+    assert len(server.stats()['submissions']) == submitted
+    latest = ApplicationJournal(str(tmp_path / 'journal.jsonl')).load()
+    assert sorted(entry['status'] for entry in latest.values()).count('success') == first['success']
+
+
+def test_external_offers_start_from_their_apply_target(batch):
+    server, jobs, run, tmp_path = batch
+    live = [offer for offer in server.offers if not offer['expired']]
+    external = live[1]
+    apply_url = f"{server.url}/candidature/page/{external['id']}"
+
+    class ExternalPreflight(OfferPreflight):
+        def check_all(self, jobs, workers=1):
+            results = super().check_all(jobs, workers)
+            results[server.offer_url(external['id'])].update(status=EXTERNAL, apply_url=apply_url)
+            return results
+
+    summary = run(preflight=ExternalPreflight(scraper=offline_scraper(server)))
+
+    assert summary['external'] == 1
+    assert summary['success'] == len(live) - 1
+    assert server.stats()['form']['requests'] == 1
+    assert external['id'] in [s['offer_id'] for s in server.stats()['submissions']]
@@ -0,0 +1,65 @@
+"""
+Recherches groupées: fusion sans doublons et code de sortie fidèle aux échecs
+"""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+import batch_search
+from conftest import offline_scraper
+
+
+@pytest.fixture
+def queries_file(tmp_path):
+    path = tmp_path / 'recherches.json'
+    path.write_text(json.dumps({'keywords': ['dev', 'data'], 'locations': ['Paris', 'Lyon'],
+                                'contract_types': ['cdi']}), encoding='utf-8')
+    return str(path)
+
+
+def run_cli(monkeypatch, queries_file, output, search_url=None, server=None):
+    def make_scraper(rate_limiter=None):
+        scraper = offline_scraper(server, rate_limiter)
+        if search_url:
+            scraper.search_url = search_url
+        return scraper
+
+    monkeypatch.setattr(batch_search, 'PoleEmploiScraper', make_scraper)
+    return CliRunner().invoke(batch_search.main, [queries_file, '-o', str(output), '--no-store',
+                                                  '--rps', '0', '--max-results', '30'])
+
+
+def test_load_queries_expands_and_validates(tmp_path, queries_file):
+    queries = batch_search.load_queries(queries_file)
+    assert [(q['keywords'], q['location'], q['contract_type']) for q in queries] == [
+        ('dev', 'Paris', 'CDI'), ('dev', 'Lyon', 'CDI'), ('data', 'Paris', 'CDI'), ('data', 'Lyon', 'CDI')
+    ]
+
+    bad = tmp_path / 'bad.json'
+    bad.write_text('{"contract_types": ["XX"]}', encoding='utf-8')
+    with pytest.raises(ValueError, match="XX"):
+        batch_search.load_queries(str(bad))
+
+
+def test_offers_are_merged_across_queries(monkeypatch, standin, queries_file, tmp_path):
+    output = tmp_path / 'out.json'
+    result = run_cli(monkeypatch, queries_file, output, server=standin)
+
+    assert result.exit_code == 0, result.output
+    data = json.loads(output.read_text(encoding='utf-8'))
+    # Le serveur local renvoie les mêmes offres à toutes les recherches
+    assert len(data['jobs']) == 30
+    assert data['jobs'][0]['queries'] == [0, 1, 2, 3]
+    assert [q['unique'] for q in data['queries']] == [30, 0, 0, 0]
+
+
+def test_unreachable_search_fails_the_run(monkeypatch, queries_file, tmp_path):
+    output = tmp_path / 'out.json'
+    result = run_cli(monkeypatch, queries_file, output, search_url='http://127.0.0.1:9/recherche')
+
+    assert result.exit_code == 1
+    reports = json.loads(output.read_text(encoding='utf-8'))['queries']
+    assert all(report['error'] for report in reports)
+    assert all(report['found'] == 0 for report in reports)
@@ -0,0 +1,61 @@
+"""
+Recherche concurrente: mêmes offres que la recherche séquentielle, préchargements annulés à l'arrêt
+"""
+
+import threading
+import time
+
+from conftest import offline_scraper
+from rate_limiter import RateLimiter
+from standin_server import StandInServer
+
+
+def test_early_stop_cancels_prefetched_pages(standin):
+    # Une requête toutes les 0,3 s: les pages 2 à 4 attendent encore leur créneau
+    scraper = offline_scraper(standin, RateLimiter(1 / 0.3))
+    start = time.perf_counter()
+    jobs = scraper.search_jobs('dev', max_results=5, concurrent=True)
+    elapsed = time.perf_counter() - start
+    requests_at_return = standin.stats()['search']['requests']
+    time.sleep(1.0)
+
+    assert len(jobs) == 5
+    # Les pages en attente abandonnent aussitôt, sans attendre leur créneau (jusqu'à 0,9 s)
+    assert elapsed < 0.5
+    assert requests_at_return == 1
+    assert standin.stats()['search']['requests'] == requests_at_return
+
+
+def test_cancelled_wait_returns_immediately():
+    limiter = RateLimiter(1 / 5.0)
+    cancelled = threading.Event()
+    limiter.acquire(cancelled)  # Premier créneau immédiat, le suivant dans 5 s
+
+    threading.Timer(0.1, cancelled.set).start()
+    start = time.perf_counter()
+    limiter.acquire(cancelled)
+
+    assert time.perf_counter() - start < 1.0
+
+
+def test_concurrent_search_matches_sequential(standin):
+    scraper = offline_scraper(standin)
+    sequential = scraper.search_jobs('dev', max_results=100, concurrent=False)
+    concurrent = scraper.search_jobs('dev', max_results=100, concurrent=True)
+
+    assert len(sequential) == 100
+    assert [job['offer_id'] for job in concurrent] == [job['offer_id'] for job in sequential]
+
+
+def test_concurrent_search_overlaps_page_latency():
+    # Budget illimité: seule la latence des pages (150 ms) limite le débit
+    with StandInServer(latency_ms=150) as server:
+        scraper = offline_scraper(server)
+        start = time.perf_counter()
+        scraper.search_jobs('dev', max_results=100, concurrent=False)
+        sequential = time.perf_counter() - start
+        start = time.perf_counter()
+        scraper.search_jobs('dev', max_results=100, concurrent=True)
+        concurrent = time.perf_counter() - start
+
+    assert concurrent < sequential * 0.7
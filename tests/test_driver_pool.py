@@ -0,0 +1,76 @@
+"""
+Pool de navigateurs: un lancement en échec ne doit jamais bloquer l'emprunt
+"""
+
+import pytest
+
+import driver_pool
+from driver_pool import DriverPool
+
+
+class FakeDriver:
+    def quit(self):
+        pass
+
+
+def test_acquire_raises_when_launch_fails_and_pool_is_empty(monkeypatch):
+    monkeypatch.setattr(driver_pool.SeleniumHandler, 'setup_driver', lambda self: False)
+    pool = DriverPool(size=1, headless=True, profile_dir=None)
+
+    with pytest.raises(RuntimeError, match="initialiser"):
+        pool.acquire()
+    assert pool.stats['launched'] == 0
+
+
+def test_acquire_waits_for_a_busy_driver_with_a_finite_timeout(monkeypatch):
+    launches = []
+
+    def setup_driver(self):
+        # Premier lancement réussi, les suivants en échec
+        launches.append(self)
+        if len(launches) > 1:
+            return False
+        self.driver = FakeDriver()
+        return True
+
+    monkeypatch.setattr(driver_pool.SeleniumHandler, 'setup_driver', setup_driver)
+    pool = DriverPool(size=2, headless=True, profile_dir=None)
+
+    busy = pool.acquire()
+    with pytest.raises(RuntimeError, match="obtenir"):
+        pool.acquire(timeout=0.1)
+    assert busy.driver is not None
+
+
+class RecordingDriver(FakeDriver):
+    window_handles = ['main']
+
+    def __init__(self):
+        self.calls = []
+        self.switch_to = self
+
+    def window(self, handle):
+        pass
+
+    def execute_script(self, script, *args):
+        self.calls.append(script)
+
+    def execute_cdp_cmd(self, command, params):
+        self.calls.append(command)
+        return {}
+
+    def delete_all_cookies(self):
+        self.calls.append('delete_all_cookies')
+
+    def get(self, url):
+        self.calls.append(url)
+
+
+def test_reset_between_offers_keeps_the_session_cookies():
+    handler = driver_pool.SeleniumHandler(headless=True, form_templates=False, session_bridge=False)
+    handler.driver = RecordingDriver()
+
+    assert handler.reset_session()
+    calls = ' '.join(handler.driver.calls)
+    assert 'sessionStorage.clear' in calls and 'about:blank' in calls
+    assert 'Cookies' not in calls and 'delete_all_cookies' not in calls and 'localStorage' not in calls
@@ -0,0 +1,32 @@
+"""
+Cache du chromedriver: enregistrements concurrents sans perte
+"""
+
+import os
+
+from driver_resolver import DriverResolver
+
+
+def test_processes_keep_each_others_drivers(tmp_path):
+    path = str(tmp_path / 'chromedriver.json')
+    first, second = DriverResolver(path, None), DriverResolver(path, None)
+
+    first._cache['drivers']['120'] = '/opt/chromedriver-120'
+    first._save_cache()
+    second._cache['drivers']['121'] = '/opt/chromedriver-121'
+    second._save_cache()
+
+    assert DriverResolver(path, None)._cache['drivers'] == {'120': '/opt/chromedriver-120',
+                                                             '121': '/opt/chromedriver-121'}
+    assert sorted(os.listdir(tmp_path)) == ['chromedriver.json', 'chromedriver.json.lock']
+
+
+def test_forget_clears_the_shared_cache(tmp_path):
+    path = str(tmp_path / 'chromedriver.json')
+    first, second = DriverResolver(path, None), DriverResolver(path, None)
+    first._cache['drivers']['120'] = '/opt/chromedriver-120'
+    first._save_cache()
+
+    second.forget()
+
+    assert DriverResolver(path, None)._cache['drivers'] == {}
@@ -0,0 +1,51 @@
+"""
+Modèles de formulaires: enregistrements concurrents et persistance sans risque
+"""
+
+import os
+import threading
+
+from form_templates import FormTemplates
+from selenium_handler import SeleniumHandler
+
+
+PLAN = {'personal': {'email': {'name': 'email'}}, 'extras': {}, 'files': {}}
+
+
+def test_concurrent_writers_keep_each_others_templates(tmp_path):
+    path = str(tmp_path / 'templates.json')
+    writers = [FormTemplates(path) for _ in range(8)]
+
+    threads = [threading.Thread(target=writer.learn, args=(f'portail{index}.fr', 'abc', PLAN, 'button', 10.0))
+               for index, writer in enumerate(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(FormTemplates(path)._templates) == 8
+    assert sorted(os.listdir(tmp_path)) == ['templates.json', 'templates.json.lock']
+
+
+def test_forget_is_merged_into_the_file(tmp_path):
+    path = str(tmp_path / 'templates.json')
+    first, second = FormTemplates(path), FormTemplates(path)
+    first.learn('a.fr', 'abc', PLAN, 'button', 10.0)
+    second.learn('b.fr', 'abc', PLAN, 'button', 10.0)
+
+    first.forget('a.fr', 'abc')
+
+    assert FormTemplates(path).get('b.fr', 'abc') is not None
+    assert FormTemplates(path).get('a.fr', 'abc') is None
+
+
+def test_template_save_error_does_not_fail_a_submitted_application():
+    class BrokenTemplates(FormTemplates):
+        def save(self):
+            raise OSError("disque plein")
+
+    handler = SeleniumHandler.__new__(SeleniumHandler)
+    handler.form_templates = BrokenTemplates(None)
+    handler._submit_selector = 'button'
+
+    handler._remember_form('a.fr', 'abc', None, {'personal': {}, 'extras': {}, 'files': {}}, 10.0)
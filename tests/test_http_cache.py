@@ -0,0 +1,86 @@
+"""
+Cache HTTP: réponses fraîches servies sans requête, réponses expirées revalidées par un 304
+"""
+
+import requests
+
+import http_cache
+from conftest import offline_scraper
+from http_cache import HttpCache
+
+
+def _response(url, size):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = b'x' * size
+    return response
+
+
+def _cached_scraper(server, tmp_path):
+    scraper = offline_scraper(server)
+    scraper.http_cache = HttpCache(str(tmp_path / 'cache.sqlite'), ttl=3600)
+    return scraper
+
+
+def test_fresh_response_is_served_without_request(standin, tmp_path):
+    scraper = _cached_scraper(standin, tmp_path)
+    url = standin.offer_url(standin.offers[0]['id'])
+
+    first = scraper._make_request(url, cache_ttl=3600)
+    second = scraper._make_request(url, cache_ttl=3600)
+
+    assert second.text == first.text
+    assert standin.stats()['detail']['requests'] == 1
+    assert scraper.http_cache.stats['hits'] == 1
+
+
+def test_expired_response_is_revalidated_with_304(standin, tmp_path):
+    scraper = _cached_scraper(standin, tmp_path)
+    url = standin.offer_url(standin.offers[0]['id'])
+
+    first = scraper._make_request(url, cache_ttl=0)
+    second = scraper._make_request(url, cache_ttl=0)
+
+    assert second.status_code == 200
+    assert second.text == first.text
+    assert standin.stats()['detail']['status'] == {'200': 1, '304': 1}
+    assert scraper.http_cache.stats['revalidated'] == 1
+    assert scraper.http_cache.stats['bytes_downloaded'] == len(first.content)
+
+
+def test_search_pages_come_from_cache_on_repeat(standin, tmp_path):
+    scraper = _cached_scraper(standin, tmp_path)
+
+    first = scraper.search_jobs('dev', max_results=40)
+    second = scraper.search_jobs('dev', max_results=40)
+
+    assert [job['offer_id'] for job in second] == [job['offer_id'] for job in first]
+    assert standin.stats()['search']['requests'] == 2
+
+
+def test_eviction_keeps_the_response_just_stored(tmp_path, monkeypatch):
+    cache = HttpCache(str(tmp_path / 'cache.sqlite'), max_bytes=100)
+    # Horloge qui recule (réglage NTP): la nouvelle réponse paraît la plus ancienne
+    clock = iter([2000.0, 1000.0])
+    monkeypatch.setattr(http_cache.time, 'time', lambda: next(clock, 1000.0))
+
+    cache.store('a', _response('http://offres.test/a', 60))
+    cache.store('b', _response('http://offres.test/b', 60))
+
+    assert cache.get('a', ttl=float('inf'))[0] is None
+    assert cache.get('b', ttl=float('inf'))[0].content == b'x' * 60
+    assert cache.stats['evictions'] == 1
+
+
+def test_response_larger_than_the_cache_is_not_stored(tmp_path):
+    cache = HttpCache(str(tmp_path / 'cache.sqlite'), max_bytes=100)
+    cache.store('a', _response('http://offres.test/a', 60))
+    cache.store('b', _response('http://offres.test/b', 20))
+    cache.store('b', _response('http://offres.test/b', 150))
+
+    # Ni stockée, ni cause d'éviction ; l'ancienne version de b est oubliée
+    assert cache.get('b')[0] is None
+    assert cache.get('a')[0].content == b'x' * 60
+    assert cache.stats['evictions'] == 0
+    assert cache.stats['misses'] == 3
@@ -0,0 +1,47 @@
+"""
+Recherche incrémentale: seules les nouvelles offres sont renvoyées, les pages en cache sont revalidées
+"""
+
+import pytest
+
+from conftest import offline_scraper
+from http_cache import HttpCache
+from job_store import JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    job_store = JobStore(str(tmp_path / 'jobs.sqlite'))
+    yield job_store
+    job_store.close()
+
+
+def _publish(server, offer_ids):
+    """Ajoute des offres en tête des résultats, comme une publication récente"""
+    for offer_id in reversed(offer_ids):
+        offer = dict(server.offers[0], id=offer_id)
+        server.offers.insert(0, offer)
+        server.by_id[offer_id] = offer
+
+
+def test_second_run_returns_only_new_offers(standin, store, tmp_path):
+    scraper = offline_scraper(standin)
+    scraper.http_cache = HttpCache(str(tmp_path / 'cache.sqlite'), ttl=3600)
+
+    first = list(scraper.iter_jobs('dev', max_results=500, store=store, incremental=True))
+    assert len(first) == 120
+    assert store.count() == 120
+
+    _publish(standin, ['901ZZZZ', '902ZZZZ', '903ZZZZ'])
+    standin.reset_stats()
+
+    # Page 1 déjà en cache: revalidée, elle apporte les nouvelles offres ; page 2 déjà vue: arrêt
+    second = list(scraper.iter_jobs('dev', max_results=500, store=store, incremental=True))
+    assert [job['offer_id'] for job in second] == ['901ZZZZ', '902ZZZZ', '903ZZZZ']
+    assert standin.stats()['search']['requests'] == 2
+    assert store.count() == 123
+
+    # Rien de nouveau: la page 1 est confirmée par un 304 et la recherche s'arrête
+    standin.reset_stats()
+    assert list(scraper.iter_jobs('dev', max_results=500, store=store, incremental=True)) == []
+    assert standin.stats()['search']['status'] == {'304': 1}
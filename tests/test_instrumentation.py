@@ -0,0 +1,37 @@
+"""
+Instrumentation: journal JSONL borné et étapes agrégées par page
+"""
+
+import os
+
+import config
+import instrumentation
+from conftest import offline_scraper
+from instrumentation import Instrumentation, JsonlSink
+
+
+def test_jsonl_journal_is_off_by_default():
+    assert config.TELEMETRY_JSONL_FILE is None
+
+
+def test_jsonl_journal_is_rotated(tmp_path):
+    path = str(tmp_path / 'telemetry.jsonl')
+    sink = JsonlSink(path, max_bytes=1000, backups=2)
+    telemetry = Instrumentation([sink])
+
+    for index in range(200):
+        telemetry.log('INFO', f"message {index}")
+    telemetry.close()
+
+    assert sorted(os.listdir(tmp_path)) == ['telemetry.jsonl', 'telemetry.jsonl.1', 'telemetry.jsonl.2']
+    for name in os.listdir(tmp_path):
+        assert os.path.getsize(tmp_path / name) < 1000 + 200
+
+
+def test_card_extraction_is_one_span_per_page(standin):
+    scraper = offline_scraper(standin)
+    jobs = scraper.search_jobs('dev', max_results=40, concurrent=False)
+
+    rows = {row['path'].rsplit('/', 1)[-1]: row for row in instrumentation.get_instrumentation().summary()}
+    assert len(jobs) == 40
+    assert rows['extract']['calls'] == 2
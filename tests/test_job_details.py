@@ -0,0 +1,76 @@
+"""
+Détails des offres: une page en erreur n'interrompt pas le lot, percentiles de latence du lot
+"""
+
+import pytest
+
+from conftest import offline_scraper
+from job_store import JobStore
+from pole_emploi_scraper import PoleEmploiScraper
+from standin_server import StandInServer
+
+
+def test_expired_offers_do_not_abort_the_batch(tmp_path):
+    with StandInServer(offers=30, expired_rate=0.3, seed=3) as server:
+        scraper = offline_scraper(server)
+        jobs = scraper.search_jobs('dev', max_results=30)
+        expired = {offer['id'] for offer in server.offers if offer['expired']}
+        assert jobs and expired
+
+        store = JobStore(str(tmp_path / 'jobs.sqlite'))
+        try:
+            stats = scraper.enrich_jobs(jobs, workers=4, store=store)
+            # Offres expirées (410): signalées en erreur, les autres sont enrichies
+            assert stats['count'] == len(jobs)
+            assert stats['errors'] == len(expired)
+            assert server.stats()['detail']['status'] == {'200': len(jobs) - len(expired), '410': len(expired)}
+            for job in jobs:
+                assert ('details' in job) == (job['offer_id'] not in expired)
+            assert all(job['details']['full_description'] for job in jobs if 'details' in job)
+            assert store.count() == len(jobs) - len(expired)
+        finally:
+            store.close()
+
+
+def test_iter_job_details_reports_each_error(standin):
+    scraper = offline_scraper(standin)
+    jobs = scraper.search_jobs('dev', max_results=5) + [{'title': 'Sans lien', 'url': ''}]
+
+    stats = {}
+    results = list(scraper.iter_job_details(jobs, workers=3, stats=stats))
+
+    errors = [error for job, details, error in results if error]
+    assert len(results) == len(jobs)
+    assert errors == ['offre sans URL']
+    assert stats['count'] == len(jobs) and stats['errors'] == 1
+    assert stats['p50_ms'] <= stats['p90_ms'] <= stats['p99_ms']
+
+
+def test_batch_stats_report_the_measured_latencies(monkeypatch):
+    scraper = offline_scraper()
+    jobs = [{'url': f'http://offres.test/{i}', 'latency': i / 1000} for i in range(1, 21)]
+    monkeypatch.setattr(scraper, '_timed_job_details', lambda job: ({}, None, job['latency']))
+
+    stats = {}
+    list(scraper.iter_job_details(jobs, workers=4, stats=stats))
+
+    assert stats['count'] == 20 and stats['errors'] == 0
+    assert (stats['p50_ms'], stats['p90_ms'], stats['p99_ms']) == pytest.approx((10.0, 18.0, 20.0))
+
+
+def test_latency_percentiles_use_nearest_rank():
+    latencies = [i / 1000 for i in range(100, 0, -1)]  # 1 à 100 ms, dans le désordre
+
+    summary = PoleEmploiScraper._latency_summary(latencies, errors=2, seconds=4.0)
+
+    assert summary['count'] == 100 and summary['errors'] == 2
+    assert summary['per_second'] == pytest.approx(25.0)
+    assert summary['p50_ms'] == pytest.approx(50.0)
+    assert summary['p90_ms'] == pytest.approx(90.0)
+    assert summary['p99_ms'] == pytest.approx(99.0)
+
+    # Série courte: le rang le plus proche retombe sur une mesure réelle
+    short = PoleEmploiScraper._latency_summary([0.010, 0.030, 0.020], errors=0, seconds=0.0)
+    assert (short['p50_ms'], short['p90_ms'], short['p99_ms']) == pytest.approx((20.0, 30.0, 30.0))
+    assert short['per_second'] == 0.0
+    assert PoleEmploiScraper._latency_summary([], 0, 1.0)['p99_ms'] == 0.0
@@ -0,0 +1,49 @@
+"""
+Index des offres: reconstruit dès que la liste ou le contenu des offres change
+"""
+
+from conftest import offline_scraper
+
+
+def _jobs():
+    return [
+        {'title': 'Développeur Python', 'description': '', 'company': 'A', 'contract_type': 'CDI', 'location': 'Paris'},
+        {'title': 'Comptable', 'description': '', 'company': 'B', 'contract_type': 'CDD', 'location': 'Lyon'},
+    ]
+
+
+def test_index_follows_in_place_changes():
+    scraper = offline_scraper()
+    jobs = _jobs()
+    assert scraper.filter_jobs(jobs, {'keywords': 'python'}) == [jobs[0]]
+
+    # Détails ajoutés après coup (enrich_jobs), sans changer la taille de la liste
+    jobs[1]['description'] = 'Tenue de la comptabilité, scripts Python appréciés'
+
+    assert scraper.filter_jobs(jobs, {'keywords': 'python'}) == jobs
+
+
+def test_index_follows_replaced_offers():
+    scraper = offline_scraper()
+    jobs = _jobs()
+    assert scraper.filter_jobs(jobs, {'location': 'lyon'}) == [jobs[1]]
+
+    # Offre remplacée par une autre version (même taille de liste)
+    jobs[1] = dict(jobs[1], location='Paris')
+    assert scraper.filter_jobs(jobs, {'location': 'lyon'}) == []
+
+    # Puis une autre offre modifiée sur place
+    jobs[0]['location'] = 'Lyon'
+    result = scraper.filter_jobs(jobs, {'location': 'lyon'})
+    assert len(result) == 1 and result[0] is jobs[0]
+
+
+def test_index_is_reused_while_unchanged():
+    scraper = offline_scraper()
+    jobs = _jobs()
+    scraper.filter_jobs(jobs, {'keywords': 'python'})
+    index = scraper._job_index
+
+    scraper.filter_jobs(jobs, {'contract_type': 'CDD'})
+
+    assert scraper._job_index is index
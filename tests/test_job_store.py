@@ -0,0 +1,66 @@
+"""
+Base des offres: dédoublonnage par identifiant, recherche sans accents, offres vues par recherche
+"""
+
+import pytest
+
+from job_store import JobStore
+
+
+def _job(offer_id, title='Développeur Python', location='69 - Lyon', contract_type='CDI', **fields):
+    job = {'offer_id': offer_id, 'title': title, 'company': 'Société Test', 'location': location,
+           'contract_type': contract_type, 'date': '', 'description': '', 'url': f'http://offres.test/{offer_id}',
+           'source': 'test'}
+    job.update(fields)
+    return job
+
+
+@pytest.fixture
+def store(tmp_path):
+    job_store = JobStore(str(tmp_path / 'jobs.sqlite'))
+    yield job_store
+    job_store.close()
+
+
+def test_upsert_deduplicates_on_offer_id(store):
+    assert store.upsert_jobs([_job('A'), _job('B'), _job('A', title='Doublon dans le lot')]) == {'A', 'B'}
+    assert store.count() == 2
+
+    # Offre déjà connue: mise à jour, absente des nouveaux identifiants
+    assert store.upsert_jobs([_job('B', title='Développeur Go'), _job('C')]) == {'C'}
+    assert store.count() == 3
+    assert [job['title'] for job in store.query({'keywords': 'go'})] == ['Développeur Go']
+
+
+def test_upsert_keeps_details_when_update_has_none(store):
+    store.upsert_jobs([_job('A', details={'salary': '40k'})])
+    store.upsert_jobs([_job('A')])
+
+    assert store.query()[0]['details'] == {'salary': '40k'}
+
+
+def test_query_ignores_accents_and_case(store):
+    store.upsert_jobs([
+        _job('A', title='DÉVELOPPEUR Python', location='75 - Paris'),
+        _job('B', title='Comptable', location='69 - Lyon', contract_type='CDD', description='Éditeur de logiciels'),
+        _job('C', title='Développeuse Java', location='69 - Lyon'),
+    ])
+
+    assert sorted(job['offer_id'] for job in store.query({'keywords': 'developpeu'})) == ['A', 'C']
+    assert [job['offer_id'] for job in store.query({'keywords': 'EDITEUR'})] == ['B']
+    assert sorted(job['offer_id'] for job in store.query({'location': 'lyon'})) == ['B', 'C']
+    assert [job['offer_id'] for job in store.query({'contract_type': 'cdd'})] == ['B']
+    assert len(store.query({'contract_type': 'TOUS'})) == 3
+    assert [job['offer_id'] for job in store.query({'keywords': 'développeur', 'location': 'LYON'})] == []
+    assert len(store.query(limit=2)) == 2
+
+
+def test_seen_for_query_is_isolated_per_query(store):
+    python_paris = JobStore.query_key('Python', 'Paris', 'CDI')
+    python_lyon = JobStore.query_key('Python', 'Lyon', 'CDI')
+    store.mark_seen(python_paris, ['A', 'B'])
+
+    assert store.seen_for_query(python_paris, ['A', 'B', 'C']) == {'A', 'B'}
+    assert store.seen_for_query(python_lyon, ['A', 'B', 'C']) == set()
+    # Même recherche à la casse, aux accents et aux espaces près
+    assert JobStore.query_key('  python ', 'PARIS', 'cdi') == python_paris
@@ -0,0 +1,61 @@
+"""
+Attentes du parcours de candidature: seuls les changements provoqués par l'action comptent
+"""
+
+import page_waits
+from page_waits import PageWaiter
+
+
+class FakeDriver:
+    """Navigateur simulé: champs visibles, règles de succès présentes, onglets et URL"""
+
+    def __init__(self):
+        self.current_url = 'http://offres.test/offre/1'
+        self.window_handles = ['main']
+        self.visible_fields = 0
+        self.rules = []
+
+    def execute_script(self, script, *args):
+        if script == page_waits._FORM_PRESENT_JS:
+            return self.visible_fields
+        if script == page_waits._PAGE_CHECK_JS:
+            return list(self.rules) if args[3] else self.rules[:1]
+        if script == page_waits._NETWORK_STATE_JS:
+            return [0, 0, 'complete']
+        raise AssertionError("script inattendu")
+
+
+def waiter(driver):
+    return PageWaiter(driver, timeout=0.2, poll=0.02, verbose=False)
+
+
+def test_form_already_on_the_offer_page_is_not_a_reaction():
+    driver = FakeDriver()
+    driver.visible_fields = 1  # Champ de recherche du site
+    waits = waiter(driver)
+    before = waits.visible_form_fields()
+
+    assert waits.page_change(driver.current_url, list(driver.window_handles), fields_before=before) is None
+
+    driver.visible_fields = 4  # Formulaire de candidature ouvert sur place
+    assert waits.page_change(driver.current_url, list(driver.window_handles), fields_before=before) == 'form'
+
+
+def test_new_tab_is_reported_as_window():
+    driver = FakeDriver()
+    old_handles = list(driver.window_handles)
+    driver.window_handles = ['main', 'candidature']
+
+    assert waiter(driver).page_change(driver.current_url, old_handles) == 'window'
+
+
+def test_success_text_present_before_submit_is_ignored():
+    driver = FakeDriver()
+    driver.rules = ['texte:merci']
+    waits = waiter(driver)
+    baseline = page_waits.page_matches(driver, ['merci', 'confirmation'])
+
+    assert waits.submission(driver.current_url, ['merci', 'confirmation'], baseline=baseline) is None
+
+    driver.rules = ['texte:merci', 'texte:confirmation']
+    assert waits.submission(driver.current_url, ['merci', 'confirmation'], baseline=baseline) == 'text'
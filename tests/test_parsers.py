@@ -0,0 +1,26 @@
+"""
+Modes d'analyse HTML: sorties identiques au corpus de référence
+
+La comparaison des durées des modes est faite par benchmarks/bench_parsers.py run.
+"""
+
+import json
+
+import pytest
+
+import pole_emploi_scraper
+from bench_parsers import PARSER_MODES, load_corpus, golden_path, parse_with_rules
+
+
+CORPUS = load_corpus()
+
+
+@pytest.mark.parametrize('mode', PARSER_MODES)
+@pytest.mark.parametrize('page_type, name, html_content', CORPUS, ids=[f"{t}/{n}" for t, n, _ in CORPUS])
+def test_output_matches_golden(monkeypatch, mode, page_type, name, html_content):
+    monkeypatch.setattr(pole_emploi_scraper, 'HTML_PARSER_MODE', mode)
+    with open(golden_path(page_type, name), 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+
+    assert json.loads(json.dumps(parse_with_rules(page_type, html_content))) == expected
+
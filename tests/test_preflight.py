@@ -0,0 +1,76 @@
+"""
+Pré-vérification: seul le contenu visible compte, et ses verdicts restent révisables
+"""
+
+from batch_apply import ApplicationJournal
+from conftest import offline_scraper
+from preflight import OfferPreflight, LIVE, EXPIRED, EXTERNAL
+
+
+class FakeResponse:
+    def __init__(self, text, url='http://offres.test/offre/1', status_code=200):
+        self.text = text
+        self.url = url
+        self.status_code = status_code
+
+
+def classify(html, **response):
+    checker = OfferPreflight(scraper=offline_scraper())
+    return checker._classify('http://offres.test/offre/1', FakeResponse(html, **response))
+
+
+def test_marker_in_scripts_does_not_expire_a_live_offer():
+    html = """<html><head><script>var i18n = {gone: "Cette offre n'existe plus"};</script></head>
+    <body><main><h1>Développeur</h1><a class="btn" href="/postuler/1">Postuler</a></main></body></html>"""
+
+    assert classify(html)['status'] == LIVE
+
+
+def test_visible_marker_without_apply_link_expires():
+    html = "<html><body><main><p>Cette offre n'existe plus.</p></main></body></html>"
+
+    result = classify(html)
+    assert result['status'] == EXPIRED
+    assert result['reason'] == "cette offre n'existe plus"
+
+
+def test_external_apply_link_is_reported():
+    html = '<html><body><main><a href="https://ats.exemple.com/job/1">Postuler</a></main></body></html>'
+
+    result = classify(html)
+    assert result['status'] == EXTERNAL
+    assert result['apply_url'] == 'https://ats.exemple.com/job/1'
+
+
+def test_standin_offers_are_classified(standin):
+    checker = OfferPreflight(scraper=offline_scraper(standin))
+    jobs = [{'url': standin.offer_url(offer['id'])} for offer in standin.offers[:20]]
+    results = checker.check_all(jobs)
+
+    expected = {standin.offer_url(offer['id']): EXPIRED if offer['expired'] else LIVE for offer in standin.offers[:20]}
+    assert {url: result['status'] for url, result in results.items()} == expected
+
+
+def test_expired_verdict_is_rechecked_on_retry(tmp_path):
+    journal = ApplicationJournal(str(tmp_path / 'journal.jsonl'))
+    journal.record('http://offres.test/1', 'expired', error="cette offre n'existe plus")
+    journal.record('http://offres.test/2', 'external', apply_url='https://ats.exemple.com/job/2')
+    jobs = [{'url': 'http://offres.test/1'}, {'url': 'http://offres.test/2'}]
+
+    # Les offres externes ne sont plus écartées: seule l'expirée attend une relance
+    to_run, skipped = journal.pending(jobs)
+    assert to_run == jobs[1:] and [job for job, _ in skipped] == jobs[:1]
+
+    to_run, skipped = journal.pending(jobs, retry_failed=True)
+    assert to_run == jobs and not skipped
+
+
+def test_redirect_between_site_aliases_stays_live():
+    checker = OfferPreflight(scraper=offline_scraper())
+    html = '<html><body><main><a class="btn" href="/offres/postuler/1">Postuler</a></main></body></html>'
+    response = FakeResponse(html, url='https://candidat.francetravail.fr/offres/recherche/detail/1')
+
+    result = checker._classify('https://candidat.pole-emploi.fr/offres/recherche/detail/1', response)
+
+    assert result['status'] == LIVE
+    assert result['apply_url'] == 'https://candidat.francetravail.fr/offres/postuler/1'
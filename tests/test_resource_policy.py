@@ -0,0 +1,59 @@
+"""
+Politique de ressources: les origines autorisées ne sont jamais bloquées, mesures de chargement bornées
+"""
+
+import fnmatch
+
+from resource_policy import PageLoadStats, ResourcePolicy
+
+
+PATTERNS = ['*google-analytics.com*', '*pole-emploi.fr*', '*recrutement.exemple.fr*', '*cdn.exemple.fr/*']
+
+
+def _blocks(policy, url):
+    return any(fnmatch.fnmatch(url, pattern) for pattern in policy.blocked_urls())
+
+
+def test_allowed_origins_are_never_blocked():
+    policy = ResourcePolicy(enabled=True, blocked_types=['image', 'font'], blocked_patterns=PATTERNS,
+                            allowed_origins=['https://candidat.pole-emploi.fr/offres/recherche'])
+    assert policy.allow('https://recrutement.exemple.fr/candidature/123?source=pe')
+
+    for url in ('https://candidat.pole-emploi.fr/offres/recherche/detail/123ABCD',
+                'https://recrutement.exemple.fr/candidature/123',
+                'https://recrutement.exemple.fr/static/app.js'):
+        assert not _blocks(policy, url), url
+
+    # Les autres hôtes et les ressources lourdes restent bloqués
+    assert _blocks(policy, 'https://www.google-analytics.com/analytics.js')
+    assert _blocks(policy, 'https://cdn.exemple.fr/logo.js')
+    assert _blocks(policy, 'https://recrutement.exemple.fr/logo.png')
+
+    # Après reset, seule l'origine configurée reste autorisée
+    policy.reset()
+    assert _blocks(policy, 'https://recrutement.exemple.fr/candidature/123')
+    assert not _blocks(policy, 'https://candidat.pole-emploi.fr/offres/recherche/detail/123ABCD')
+
+
+def test_disabled_policy_blocks_nothing():
+    policy = ResourcePolicy(enabled=False, blocked_types=['image'], blocked_patterns=PATTERNS, allowed_origins=[])
+    assert policy.blocked_urls() == []
+
+
+class _Driver:
+    def execute_script(self, script):
+        return {'url': 'https://offres.test/1', 'bytes': 1000, 'resources': 3, 'dom_ms': 10, 'load_ms': 20}
+
+
+def test_page_load_stats_are_bounded(tmp_path):
+    assert PageLoadStats().path is None
+
+    path = str(tmp_path / 'page_loads.jsonl')
+    stats = PageLoadStats(path, max_entries=5, max_bytes=400, backups=1)
+    for _ in range(20):
+        stats.measure(_Driver(), 'offre', True)
+
+    assert len(stats.entries) == 5
+    assert (tmp_path / 'page_loads.jsonl.1').exists()
+    assert not (tmp_path / 'page_loads.jsonl.2').exists()
+    assert (tmp_path / 'page_loads.jsonl').stat().st_size < 400 + 200
@@ -0,0 +1,23 @@
+"""
+Les statistiques de sélecteurs servent au rapport: elles ne changent jamais le texte extrait
+"""
+
+from conftest import offline_scraper
+from selector_stats import SelectorStats
+
+DETAIL_PAGE = """<html><body>
+<div class="description">Court résumé</div>
+<div class="descriptionOffre">Description complète du poste</div>
+</body></html>"""
+
+
+def test_detail_fields_keep_declared_priority_whatever_the_stats():
+    stats = SelectorStats(None)
+    for _ in range(50):
+        stats.record('detail', 'full_description', '.description')
+    scraper = offline_scraper(selector_stats=stats)
+
+    details = scraper._parse_job_details(DETAIL_PAGE)
+
+    assert details['full_description'] == "Description complète du poste"
+    assert dict(stats.report()[0]['hits'])['.descriptionOffre'] == 1
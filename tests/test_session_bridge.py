@@ -0,0 +1,73 @@
+"""
+Magasin de cookies: enregistrements concurrents sans perte, ni cookies tiers ni cookies de session sur disque
+"""
+
+import os
+import threading
+import time
+
+from session_bridge import SessionBridge
+
+
+def _cookie(name, value='1', domain='.offres.test', expires=None):
+    return {'name': name, 'value': value, 'domain': domain, 'path': '/',
+            'secure': True, 'httpOnly': True, 'expires': expires or time.time() + 3600}
+
+
+def test_concurrent_writers_keep_each_others_cookies(tmp_path):
+    path = str(tmp_path / 'cookies.json')
+    bridges = [SessionBridge(path) for _ in range(8)]
+
+    threads = [threading.Thread(target=bridge.merge, args=([_cookie(f'session{index}')],))
+               for index, bridge in enumerate(bridges)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(c['name'] for c in SessionBridge(path).cookies()) == [f'session{i}' for i in range(8)]
+    assert sorted(os.listdir(tmp_path)) == ['cookies.json', 'cookies.json.lock']
+
+
+def test_latest_value_of_a_cookie_wins(tmp_path):
+    path = str(tmp_path / 'cookies.json')
+    first, second = SessionBridge(path), SessionBridge(path)
+    first.merge([_cookie('session', 'ancien')])
+    second.merge([_cookie('session', 'nouveau')])
+
+    first.merge([_cookie('consent')])
+
+    cookies = {c['name']: c['value'] for c in SessionBridge(path).cookies()}
+    assert cookies == {'session': 'nouveau', 'consent': '1'}
+
+
+class FakeDriver:
+    current_url = 'https://candidat.francetravail.fr/offres/recherche/detail/1'
+
+    def __init__(self, cookies):
+        self.cookies = cookies
+
+    def execute_cdp_cmd(self, command, params):
+        assert command == 'Network.getAllCookies'
+        return {'cookies': self.cookies}
+
+
+def test_only_first_party_persistent_cookies_are_saved(tmp_path):
+    path = str(tmp_path / 'cookies.json')
+    bridge = SessionBridge(path, domains=['francetravail.fr'])
+    later = time.time() + 3600
+    driver = FakeDriver([
+        {'name': 'auth', 'value': '1', 'domain': '.francetravail.fr', 'path': '/', 'expires': later},
+        {'name': 'portail', 'value': '1', 'domain': 'ats.exemple.com', 'path': '/', 'expires': later},
+        {'name': 'pub', 'value': '1', 'domain': '.tracker.test', 'path': '/', 'expires': later},
+        {'name': 'jsessionid', 'value': '1', 'domain': 'candidat.francetravail.fr', 'path': '/',
+         'expires': -1, 'session': True},
+    ])
+
+    bridge.driver_to_store(driver, hosts=['ats.exemple.com'])
+    bridge.merge([_cookie('consent', domain='.francetravail.fr')])
+
+    # La session reste utilisable dans l'exécution en cours...
+    assert sorted(c['name'] for c in bridge.cookies()) == ['auth', 'consent', 'jsessionid', 'portail']
+    # ...mais seuls les cookies persistants du site et des offres visitées sont écrits
+    assert sorted(c['name'] for c in SessionBridge(path).cookies()) == ['auth', 'consent', 'portail']